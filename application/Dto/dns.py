@@ -1,10 +1,14 @@
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 
 from typing import (
+    Any,
+    Dict,
     Optional,
     TypeVar,
     Generic,
-    Tuple
+    Tuple,
+    Sequence,
+    Union
 )
 
 
@@ -98,14 +102,23 @@ class HistoryTable:
     txt: Tuple[RecordRow, ...]
 
 
+@dataclass
+class SubdomainSummary:
+    """SubdomainSummary"""
+
+    hostname: str
+    present: PresentTable
+
+
 @dataclass
 class DomainSummary:
-    """DomainSummary"""
+    """DomainSummary, `deep` holds the subdomains a deep analysis fanned out to."""
 
     hostname: str
     present: PresentTable
     history: HistoryTable
     subdomains: Tuple[str, ...]
+    deep: Tuple[SubdomainSummary, ...] = tuple()
 
 
 class ResultCode:
@@ -113,13 +126,34 @@ class ResultCode:
 
     FETCHED = 'fetched'
     INVALID_DOMAIN = 'invalid_domain'
+    INVALID_PROJECTION = 'invalid_projection'
+    PARTIAL = 'partial'
+    INVALID_BATCH = 'invalid_batch'
+    FAILED = 'failed'
 
 
 @dataclass(frozen=True)
 class DomainAnalysisInputDTO:
-    """DomainAnalysisInputDTO"""
+    """
+    DomainAnalysisInputDTO, `sections` and `records` project the summary, everything when omitted.
+    `deep` requests the subdomain fan-out, `true` or its options, see `DeepAnalysis.parse`.
+    `deadline` is in event loop time, sections not finished by then are reported missing.
+    """
 
     domain: str
+    sections: Optional[Sequence[str]] = None
+    records: Optional[Sequence[str]] = None
+    deep: Any = None
+    deadline: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class CachedSummary:
+    """A cached summary, `age` in seconds, `should_refresh` once it is stale or expires early."""
+
+    summary: DomainSummary
+    age: float
+    should_refresh: bool
 
 
 @dataclass(frozen=True)
@@ -128,6 +162,100 @@ class DomainAnalysisOutputDTO:
 
     code: ResultCode
     summary: Optional[DomainSummary] = None
+    cached: bool = False
+    age: Optional[float] = None
+    missing: Optional[Tuple[str, ...]] = None
+
+    def to_dict(self):
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class DomainAnalysisReplyDTO:
+    """
+    A result of the fast path, its `summary` is already in the `asdict` form, `to_dict` gives what
+    the one of a `DomainAnalysisOutputDTO` with the same summary would.
+    """
+
+    code: ResultCode
+    summary: Optional[Dict[str, Any]] = None
+    cached: bool = False
+    age: Optional[float] = None
+    missing: Optional[Tuple[str, ...]] = None
+
+    def to_dict(self):
+        return {
+            'code': self.code,
+            'summary': self.summary,
+            'cached': self.cached,
+            'age': self.age,
+            'missing': self.missing
+        }
+
+
+TAnalysisResult = Union[DomainAnalysisOutputDTO, DomainAnalysisReplyDTO]
+
+
+class StreamSection:
+    """StreamSection"""
+
+    HOSTNAME = 'hostname'
+    PRESENT = 'present'
+    SUBDOMAINS = 'subdomains'
+    HISTORY = 'history'
+    DEEP = 'deep'
+    FINAL = 'final'
+
+
+@dataclass(frozen=True)
+class DomainAnalysisPartDTO:
+    """A finished section of a streamed analysis, `record` names the history record type."""
+
+    section: str
+    data: Any
+    record: Optional[str] = None
+
+    def to_dict(self):
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class BatchAnalysisInputDTO:
+    """
+    BatchAnalysisInputDTO, every domain is analyzed with the same projection and deadline,
+    see `DomainAnalysisInputDTO`. `concurrency` may only lower the configured limit.
+    """
+
+    domains: Any
+    sections: Optional[Sequence[str]] = None
+    records: Optional[Sequence[str]] = None
+    deep: Any = None
+    deadline: Optional[float] = None
+    concurrency: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class BatchAnalysisItemDTO:
+    """The result of a domain of a batch, `domain` as it was requested."""
+
+    domain: Any
+    result: TAnalysisResult
+
+    def to_dict(self):
+        return {'domain': self.domain, 'result': self.result.to_dict()}
+
+
+@dataclass(frozen=True)
+class BatchAnalysisSummaryDTO:
+    """The last reply of a batch, `codes` counts the results of the unique domains by their code."""
+
+    code: ResultCode
+    requested: int = 0
+    unique: int = 0
+    duplicates: int = 0
+    concurrency: int = 0
+    codes: Dict[str, int] = field(default_factory=dict)
+    elapsed: float = 0.0
 
     def to_dict(self):
         return asdict(self)
\ No newline at end of file
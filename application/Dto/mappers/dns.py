@@ -1,3 +1,5 @@
+from typing import Any, Dict, Optional, Tuple
+
 from application.Dto.dns import (
     ARecord,
     AAAARecord,
@@ -10,15 +12,21 @@ from application.Dto.dns import (
     HistoryTable,
     ResultCode,
     DomainSummary,
-    DomainAnalysisOutputDTO
+    SubdomainSummary,
+    DomainAnalysisOutputDTO,
+    DomainAnalysisPartDTO,
+    StreamSection
 )
 
+from domain.ValueObjects.app import Projection
+
 from domain.Entities.dns import (
     CurrentDnsRow,
     HistoryDnsRow,
     CurrentDnsTable,
     HistoryDnsTable,
-    DomainSummary as AppDomainSummary
+    DomainSummary as AppDomainSummary,
+    SubdomainSummary as AppSubdomainSummary
 )
 from domain.ValueObjects.records import (
     ARecord as AppARecord,
@@ -102,15 +110,25 @@ def map_data_to_dns_output_dto(data: AppDomainSummary) -> DomainAnalysisOutputDT
     """map_data_to_dns_output_dto"""
 
     return DomainAnalysisOutputDTO(
-        code=ResultCode.FETCHED,
+        code=data.missing and ResultCode.PARTIAL or ResultCode.FETCHED,
+        missing=data.missing or None,
         summary=DomainSummary(
             hostname=data.hostname.raw(),
             present=_map_current_dns_table(data.current),
             history=_map_history_dns_table(data.history),
-            subdomains=[subdomain.raw() for subdomain in data.subdomains]
+            subdomains=[subdomain.raw() for subdomain in data.subdomains],
+            deep=_map_deep(data.deep)
         )
     )
 
+def _map_deep(summaries: Tuple[AppSubdomainSummary, ...]) -> Tuple[SubdomainSummary, ...]:
+    """_map_deep"""
+
+    return tuple((
+        SubdomainSummary(hostname=summary.hostname.raw(), present=_map_current_dns_table(summary.current))
+        for summary in summaries
+    ))
+
 def _map_current_dns_table(table: CurrentDnsTable) -> PresentTable:
     """_map_current_dns_table"""
 
@@ -146,4 +164,122 @@ def _map_row(row: CurrentDnsRow | HistoryDnsRow, record_type: str) -> RecordRow:
         last_seen=is_history and row.last_seen.raw() or None,
         organizations=is_history and tuple((organization.raw() for organization in row.organizations)) or None,
         values=tuple((RECORD_MAPPER[record_type](record) for record in row.values))
-    )
\ No newline at end of file
+    )
+
+
+DTO_RECORDS = {
+    'a': ARecord,
+    'aaaa': AAAARecord,
+    'mx': MXRecord,
+    'ns': NSRecord,
+    'soa': SOARecord,
+    'txt': TXTRecord
+}
+
+def _dict_to_row(data: dict | None, record_type: str) -> RecordRow:
+    """_dict_to_row"""
+
+    if data is None: return None
+
+    record = DTO_RECORDS[record_type]
+    organizations = data.get('organizations')
+    return RecordRow(
+        first_seen=data['first_seen'],
+        last_seen=data.get('last_seen'),
+        organizations=organizations is not None and tuple(organizations) or None,
+        values=tuple((record(**value) for value in data['values']))
+    )
+
+def _dict_to_present(present: dict) -> PresentTable:
+    """_dict_to_present"""
+
+    return PresentTable(**{
+        record_type: _dict_to_row(present[record_type], record_type)
+        for record_type in DTO_RECORDS
+    })
+
+def map_dict_to_summary(data: dict) -> DomainSummary:
+    """Rebuild a summary from its `asdict` form, e.g. read back from a cache."""
+
+    history = data['history']
+    return DomainSummary(
+        hostname=data['hostname'],
+        present=_dict_to_present(data['present']),
+        history=HistoryTable(**{
+            record_type: tuple((_dict_to_row(row, record_type) for row in history[record_type]))
+            for record_type in DTO_RECORDS
+        }),
+        subdomains=list(data['subdomains']),
+        deep=tuple((
+            SubdomainSummary(hostname=summary['hostname'], present=_dict_to_present(summary['present']))
+            for summary in data.get('deep', ())
+        ))
+    )
+
+def project_summary(summary: DomainSummary, projection: Projection) -> DomainSummary:
+    """Empty the sections left out of the projection, e.g. of a cached full summary."""
+
+    if projection.is_full: return summary
+
+    return DomainSummary(
+        hostname=summary.hostname,
+        present=projection.present and summary.present or PresentTable(),
+        history=HistoryTable(**{
+            record_type: record_type in projection.history and getattr(summary.history, record_type) or tuple()
+            for record_type in DTO_RECORDS
+        }),
+        subdomains=projection.subdomains and summary.subdomains or []
+    )
+
+def map_part_to_dto(section: str, record: Optional[str], value: Any) -> DomainAnalysisPartDTO:
+    """Map a section the analysis service finished, see `IDnsAnalyzeService.analyze`."""
+
+    match section:
+        case StreamSection.PRESENT:
+            data = _map_current_dns_table(value)
+        case StreamSection.SUBDOMAINS:
+            data = [subdomain.raw() for subdomain in value]
+        case StreamSection.DEEP:
+            data = _map_deep(value)
+        case _:
+            data = tuple((_map_row(row, record) for row in value))
+    return DomainAnalysisPartDTO(section=section, data=data, record=record)
+
+def map_summary_to_parts(summary: DomainSummary) -> Tuple[DomainAnalysisPartDTO, ...]:
+    """Split a summary into the parts of a streamed analysis, e.g. a cached one."""
+
+    return (
+        DomainAnalysisPartDTO(section=StreamSection.PRESENT, data=summary.present),
+        DomainAnalysisPartDTO(section=StreamSection.SUBDOMAINS, data=summary.subdomains),
+        *(
+            DomainAnalysisPartDTO(section=StreamSection.HISTORY, data=getattr(summary.history, record_type),
+                                  record=record_type)
+            for record_type in DTO_RECORDS
+        )
+    )
+
+def map_parts_to_summary(hostname: str, parts: Dict[Tuple[str, Optional[str]], DomainAnalysisPartDTO]) -> DomainSummary:
+    """Assemble the summary of a streamed analysis, sections never streamed are empty."""
+
+    def data(section: str, record: Optional[str], default: Any) -> Any:
+        part = parts.get((section, record))
+        return part is not None and part.data or default
+
+    return DomainSummary(
+        hostname=hostname,
+        present=data(StreamSection.PRESENT, None, PresentTable()),
+        history=HistoryTable(**{
+            record_type: data(StreamSection.HISTORY, record_type, tuple())
+            for record_type in DTO_RECORDS
+        }),
+        subdomains=data(StreamSection.SUBDOMAINS, None, []),
+        deep=data(StreamSection.DEEP, None, tuple())
+    )
+
+def is_empty_summary(summary: DomainSummary) -> bool:
+    """An empty summary means the upstream calls failed, it is not worth caching."""
+
+    present = summary.present
+    return not summary.subdomains and not any((
+        present.a, present.aaaa, present.mx, present.ns, present.soa, present.txt
+    ))
\ No newline at end of file
@@ -0,0 +1,44 @@
+from json import dumps
+
+from typing import Any, Dict, Union
+
+from application.Dto.dns import (
+    DomainAnalysisOutputDTO,
+    DomainAnalysisReplyDTO,
+    DomainAnalysisPartDTO,
+    BatchAnalysisItemDTO,
+    BatchAnalysisSummaryDTO
+)
+from application.Dto.mappers.dns import DTO_RECORDS
+
+
+TReply = Union[
+    DomainAnalysisOutputDTO,
+    DomainAnalysisReplyDTO,
+    DomainAnalysisPartDTO,
+    BatchAnalysisItemDTO,
+    BatchAnalysisSummaryDTO
+]
+
+
+def reply_size(reply: TReply) -> int:
+    """Rows a reply carries, history rows, subdomains and subdomain summaries, its encoding time grows with them."""
+
+    if isinstance(reply, BatchAnalysisItemDTO):
+        reply = reply.result
+    if isinstance(reply, DomainAnalysisPartDTO):
+        return isinstance(reply.data, (tuple, list)) and len(reply.data) or 0
+
+    summary = getattr(reply, 'summary', None)
+    if summary is None: return 0
+
+    if isinstance(summary, dict):
+        history = summary['history'].values()
+        return sum(map(len, history)) + len(summary['subdomains']) + len(summary['deep'])
+    history = (getattr(summary.history, record_type) for record_type in DTO_RECORDS)
+    return sum(map(len, history)) + len(summary.subdomains) + len(summary.deep)
+
+def encode_reply(reply: TReply, extra: Dict[str, Any]) -> bytes:
+    """The JSON body of a reply, after the `extra` fields, e.g. the `seq` of a stream. May run in a process pool."""
+
+    return dumps({**extra, **reply.to_dict()}).encode()
\ No newline at end of file
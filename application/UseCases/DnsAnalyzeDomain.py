@@ -1,28 +1,126 @@
+from time import perf_counter
+
+from typing import Optional
+
+from utils.normalize_domain import normalize_domain
+
 from application.adapters.Interactor import Interactor
 from application.adapters.IDnsAnalyzeService import IDnsAnalyzeService
+from application.adapters.IDomainSummaryCache import IDomainSummaryCache
+from application.adapters.IAnalysisCoalescer import IAnalysisCoalescer
+from application.adapters.IAnalysisRegistry import IAnalysisRegistry
 
 from application.Dto.dns import (
     ResultCode,
+    DomainSummary,
     DomainAnalysisInputDTO,
-    DomainAnalysisOutputDTO
+    DomainAnalysisOutputDTO,
+    DomainAnalysisReplyDTO,
+    TAnalysisResult
 )
-from application.Dto.mappers.dns import map_data_to_dns_output_dto
+from application.Dto.mappers.dns import (
+    map_data_to_dns_output_dto,
+    map_dict_to_summary,
+    project_summary,
+    is_empty_summary
+)
+
+from domain.ValueObjects.app import Domain, Projection, FULL_PROJECTION
 
-from domain.ValueObjects.app import Domain
 
+def _key(domain: Domain, projection: Projection) -> str:
+    """Full analyses are keyed by the domain alone, projections by the domain and the projection."""
 
-class DnsAnalyzeDomain(Interactor[DomainAnalysisInputDTO, DomainAnalysisOutputDTO]):
-    """DnsAnalyzeDomain"""
+    return projection.is_full and domain.raw() or f'{domain.raw()}#{projection.key()}'
 
-    def __init__(self, service: IDnsAnalyzeService):
+
+class DnsAnalyzeDomain(Interactor[DomainAnalysisInputDTO, TAnalysisResult]):
+    """
+    DnsAnalyzeDomain, with a coalescer concurrent calls for the same normalized domain and projection
+    await a single analysis, with a registry so do the calls of other replicas. Only full summaries
+    are cached, a projection is served from a cached summary or analyzes just its sections.
+    With `fast_reply` analyses without a deadline nor a registry, which shares summaries as DTOs,
+    take the fast path of the service and result in a `DomainAnalysisReplyDTO`.
+    """
+
+    def __init__(self,
+        service: IDnsAnalyzeService,
+        cache: Optional[IDomainSummaryCache]=None,
+        coalescer: Optional[IAnalysisCoalescer]=None,
+        registry: Optional[IAnalysisRegistry]=None,
+        fast_reply: bool=False
+    ):
         self.__service = service
+        self.__cache = cache
+        self.__coalescer = coalescer
+        self.__registry = registry
+        self.__fast_reply = fast_reply and registry is None
 
-    async def __call__(self, data: DomainAnalysisInputDTO) -> DomainAnalysisOutputDTO:
+    async def __call__(self, data: DomainAnalysisInputDTO) -> TAnalysisResult:
         try:
-            domain = Domain(data.domain)
+            domain = Domain(normalize_domain(data.domain))
         except ValueError:
             return DomainAnalysisOutputDTO(code=ResultCode.INVALID_DOMAIN)
 
-        result = await self.__service.analyze(domain)
-        mapped = map_data_to_dns_output_dto(result)
-        return mapped
\ No newline at end of file
+        try:
+            projection = Projection.parse(data.sections, data.records, data.deep)
+        except ValueError:
+            return DomainAnalysisOutputDTO(code=ResultCode.INVALID_PROJECTION)
+
+        # A result cut short by a deadline belongs to its caller, such analyses are neither shared nor registered.
+        if self.__coalescer is None or data.deadline is not None:
+            return await self.__resolve(domain, projection, data.deadline)
+        return await self.__coalescer.do(_key(domain, projection), lambda: self.__resolve(domain, projection))
+
+    async def __resolve(
+        self,
+        domain: Domain,
+        projection: Projection,
+        deadline: Optional[float]=None
+    ) -> TAnalysisResult:
+        # Cached summaries are full ones, they never hold a subdomain fan-out.
+        if self.__cache is not None and projection.deep is None:
+            cached = await self.__cache.get(domain.raw())
+            if cached is not None:
+                if cached.should_refresh:
+                    self.__cache.refresh(domain.raw(), lambda: self.__analyze(domain))
+                return DomainAnalysisOutputDTO(
+                    code=ResultCode.FETCHED,
+                    summary=project_summary(cached.summary, projection),
+                    cached=True,
+                    age=round(cached.age, 3)
+                )
+
+        started = perf_counter()
+        if self.__fast_reply and deadline is None:
+            return await self.__reply(domain, projection, started)
+        if deadline is None:
+            result = DomainAnalysisOutputDTO(code=ResultCode.FETCHED, summary=await self.__summarize(domain, projection))
+        else:
+            result = map_data_to_dns_output_dto(await self.__service.analyze(domain, projection, deadline=deadline))
+
+        is_complete = projection.is_full and result.code == ResultCode.FETCHED
+        if self.__cache is not None and is_complete and not is_empty_summary(result.summary):
+            await self.__cache.set(domain.raw(), result.summary, perf_counter() - started)
+        return result
+
+    async def __reply(self, domain: Domain, projection: Projection, started: float) -> DomainAnalysisReplyDTO:
+        summary = await self.__service.analyze_reply(domain, projection)
+        # The cache keeps DTOs, only a miss of a full analysis pays for mapping the reply back.
+        if self.__cache is not None and projection.is_full:
+            cached = map_dict_to_summary(summary)
+            if not is_empty_summary(cached):
+                await self.__cache.set(domain.raw(), cached, perf_counter() - started)
+        return DomainAnalysisReplyDTO(code=ResultCode.FETCHED, summary=summary)
+
+    async def __summarize(self, domain: Domain, projection: Projection=FULL_PROJECTION) -> DomainSummary:
+        if self.__registry is None:
+            return await self.__map(domain, projection)
+        return await self.__registry.run(_key(domain, projection), lambda: self.__map(domain, projection))
+
+    async def __map(self, domain: Domain, projection: Projection) -> DomainSummary:
+        return map_data_to_dns_output_dto(await self.__service.analyze(domain, projection)).summary
+
+    async def __analyze(self, domain: Domain) -> Optional[DomainSummary]:
+        summary = await self.__summarize(domain)
+        return not is_empty_summary(summary) and summary or None
\ No newline at end of file
@@ -0,0 +1,148 @@
+import logging
+
+import asyncio as aio
+
+from collections import Counter
+from time import perf_counter
+
+from typing import Any, AsyncIterator, Dict, Optional, Union
+
+from utils.cancel_tasks import cancel_all
+from utils.normalize_domain import normalize_domain
+
+from application.adapters.Interactor import Interactor
+from application.adapters.securitytrails.ISecurityTrailsAccountProvider import ISecurityTrailsAccountProvider
+from application.UseCases.DnsAnalyzeDomain import DnsAnalyzeDomain
+
+from application.Dto.dns import (
+    ResultCode,
+    DomainAnalysisInputDTO,
+    DomainAnalysisOutputDTO,
+    BatchAnalysisInputDTO,
+    BatchAnalysisItemDTO,
+    BatchAnalysisSummaryDTO
+)
+
+from domain.ValueObjects.app import Domain, Projection
+
+
+logger = logging.getLogger('DnsAnalyzeDomains')
+
+
+TBatchReply = Union[BatchAnalysisItemDTO, BatchAnalysisSummaryDTO]
+
+
+def _is_valid(domain: Any) -> bool:
+    """_is_valid"""
+
+    if not isinstance(domain, str): return False
+    try:
+        Domain(domain)
+    except ValueError:
+        return False
+    return True
+
+
+class DnsAnalyzeDomains(Interactor[BatchAnalysisInputDTO, AsyncIterator[TBatchReply]]):
+    """
+    Analyzes a batch of domains, normalized and de-duplicated, yields an item per unique domain as soon as
+    it is done and a summary last. At most `concurrency` domains are analyzed at once, fewer when the
+    requests the provider has left do not cover that many analyses of the projection. Every domain goes
+    through `analyze`, so the batch shares its cache, coalescing and registry with single requests.
+    """
+
+    def __init__(self, *,
+        analyze: DnsAnalyzeDomain,
+        provider: ISecurityTrailsAccountProvider,
+        concurrency: int,
+        max_domains: int
+    ):
+        self.__analyze = analyze
+        self.__provider = provider
+        self.__concurrency = concurrency
+        self.__max_domains = max_domains
+
+    async def __call__(self, data: BatchAnalysisInputDTO) -> AsyncIterator[TBatchReply]:
+        started = perf_counter()
+        domains = data.domains
+        if not isinstance(domains, list) or not 0 < len(domains) <= self.__max_domains:
+            yield BatchAnalysisSummaryDTO(code=ResultCode.INVALID_BATCH)
+            return
+
+        try:
+            projection = Projection.parse(data.sections, data.records, data.deep)
+        except ValueError:
+            yield BatchAnalysisSummaryDTO(code=ResultCode.INVALID_PROJECTION, requested=len(domains))
+            return
+
+        # The first entry of every normalized domain is analyzed, invalid entries are answered right away.
+        unique: Dict[str, Any] = {}
+        codes: Counter = Counter()
+        for requested in domains:
+            normalized = normalize_domain(requested)
+            if isinstance(normalized, str) and normalized in unique: continue
+            if not _is_valid(normalized):
+                if isinstance(normalized, str): unique[normalized] = None
+                codes[ResultCode.INVALID_DOMAIN] += 1
+                yield BatchAnalysisItemDTO(
+                    domain=requested,
+                    result=DomainAnalysisOutputDTO(code=ResultCode.INVALID_DOMAIN)
+                )
+                continue
+            unique[normalized] = requested
+
+        pending: aio.Queue = aio.Queue()
+        for normalized, requested in unique.items():
+            if requested is not None:
+                pending.put_nowait((normalized, requested))
+
+        total = pending.qsize()
+        concurrency = self.__limit(projection, data.concurrency)
+        done: aio.Queue = aio.Queue()
+        workers = [
+            aio.create_task(self.__work(pending, done, data))
+            for _ in range(min(concurrency, total))
+        ]
+
+        try:
+            for _ in range(total):
+                item: BatchAnalysisItemDTO = await done.get()
+                codes[item.result.code] += 1
+                yield item
+        finally:
+            await cancel_all(set(workers))
+
+        yield BatchAnalysisSummaryDTO(
+            code=ResultCode.FETCHED,
+            requested=len(domains),
+            unique=sum(codes.values()),
+            duplicates=len(domains) - sum(codes.values()),
+            concurrency=concurrency,
+            codes=dict(codes),
+            elapsed=round(perf_counter() - started, 3)
+        )
+
+    def __limit(self, projection: Projection, requested: Optional[int]) -> int:
+        """The configured concurrency, lowered by the caller and by what the provider can still serve."""
+
+        limit = self.__concurrency
+        if isinstance(requested, int) and not isinstance(requested, bool) and requested > 0:
+            limit = min(limit, requested)
+        return max(1, min(limit, self.__provider.available_requests // projection.credits))
+
+    async def __work(self, pending: aio.Queue, done: aio.Queue, data: BatchAnalysisInputDTO) -> None:
+        while not pending.empty():
+            normalized, requested = pending.get_nowait()
+            try:
+                result = await self.__analyze(DomainAnalysisInputDTO(
+                    domain=normalized,
+                    sections=data.sections,
+                    records=data.records,
+                    deep=data.deep,
+                    deadline=data.deadline
+                ))
+            except Exception as exp:
+                # A failed domain must not stall the batch, it still gets its item.
+                logger.exception(f'Failed to analyze batch domain: {normalized}.')
+                result = DomainAnalysisOutputDTO(code=ResultCode.FAILED)
+            done.put_nowait(BatchAnalysisItemDTO(domain=requested, result=result))
@@ -0,0 +1,123 @@
+import logging
+
+import asyncio as aio
+
+from time import perf_counter
+
+from typing import Optional, AsyncIterator, Dict, Tuple
+
+from utils.cancel_tasks import cancel_task
+from utils.normalize_domain import normalize_domain
+
+from application.adapters.Interactor import Interactor
+from application.adapters.IDnsAnalyzeService import IDnsAnalyzeService
+from application.adapters.IDomainSummaryCache import IDomainSummaryCache
+
+from application.Dto.dns import (
+    ResultCode,
+    StreamSection,
+    DomainSummary,
+    DomainAnalysisInputDTO,
+    DomainAnalysisOutputDTO,
+    DomainAnalysisPartDTO
+)
+from application.Dto.mappers.dns import (
+    map_data_to_dns_output_dto,
+    map_part_to_dto,
+    map_parts_to_summary,
+    map_summary_to_parts,
+    project_summary,
+    is_empty_summary
+)
+
+from domain.ValueObjects.app import Domain, Projection
+
+
+logger = logging.getLogger('DnsStreamDomainAnalysis')
+
+
+def _final(result: DomainAnalysisOutputDTO) -> DomainAnalysisPartDTO:
+    """The last part of a stream, its data is the result without the summary that was streamed."""
+
+    return DomainAnalysisPartDTO(section=StreamSection.FINAL, data=DomainAnalysisOutputDTO(
+        code=result.code,
+        cached=result.cached,
+        age=result.age,
+        missing=result.missing
+    ))
+
+
+class DnsStreamDomainAnalysis(Interactor[DomainAnalysisInputDTO, AsyncIterator[DomainAnalysisPartDTO]]):
+    """
+    Streams a domain analysis: the hostname, the present table once the domain is fetched, then the subdomains
+    and every history record type as they complete, the final part carries the result code. Sections that were
+    not streamed, left out by the projection or failed upstream, are empty in the summary the parts assemble into.
+    Streams are not coalesced, every caller needs the parts as they come.
+    """
+
+    def __init__(self, service: IDnsAnalyzeService, cache: Optional[IDomainSummaryCache]=None):
+        self.__service = service
+        self.__cache = cache
+
+    async def __call__(self, data: DomainAnalysisInputDTO) -> AsyncIterator[DomainAnalysisPartDTO]:
+        try:
+            domain = Domain(normalize_domain(data.domain))
+        except ValueError:
+            yield _final(DomainAnalysisOutputDTO(code=ResultCode.INVALID_DOMAIN))
+            return
+
+        try:
+            projection = Projection.parse(data.sections, data.records, data.deep)
+        except ValueError:
+            yield _final(DomainAnalysisOutputDTO(code=ResultCode.INVALID_PROJECTION))
+            return
+
+        yield DomainAnalysisPartDTO(section=StreamSection.HOSTNAME, data=domain.raw())
+
+        # Cached summaries are full ones, they never hold a subdomain fan-out.
+        is_cacheable = self.__cache is not None and projection.deep is None
+        cached = is_cacheable and await self.__cache.get(domain.raw()) or None
+        if cached is not None:
+            if cached.should_refresh:
+                self.__cache.refresh(domain.raw(), lambda: self.__analyze(domain))
+            for part in map_summary_to_parts(project_summary(cached.summary, projection)):
+                yield part
+            yield _final(DomainAnalysisOutputDTO(code=ResultCode.FETCHED, cached=True, age=round(cached.age, 3)))
+            return
+
+        parts: aio.Queue = aio.Queue()
+        started = perf_counter()
+        task = aio.create_task(self.__service.analyze(
+            domain, projection, lambda *part: parts.put_nowait(part), data.deadline
+        ))
+        task.add_done_callback(lambda _: parts.put_nowait(None))
+
+        streamed: Dict[Tuple[str, Optional[str]], DomainAnalysisPartDTO] = {}
+        try:
+            while (part := await parts.get()) is not None:
+                mapped = map_part_to_dto(*part)
+                streamed[(mapped.section, mapped.record)] = mapped
+                yield mapped
+
+            try:
+                missing = task.result().missing
+            except Exception as exp:
+                # The final part ends every stream, callers reassembling it wait for one.
+                logger.exception(f'Failed to analyze domain: {domain.raw()}.')
+                yield _final(DomainAnalysisOutputDTO(code=ResultCode.FAILED))
+                return
+        finally:
+            if not task.done():
+                await cancel_task(task)
+
+        summary = map_parts_to_summary(domain.raw(), streamed)
+        if self.__cache is not None and projection.is_full and not missing and not is_empty_summary(summary):
+            await self.__cache.set(domain.raw(), summary, perf_counter() - started)
+        yield _final(DomainAnalysisOutputDTO(
+            code=missing and ResultCode.PARTIAL or ResultCode.FETCHED,
+            missing=missing or None
+        ))
+
+    async def __analyze(self, domain: Domain) -> Optional[DomainSummary]:
+        summary = map_data_to_dns_output_dto(await self.__service.analyze(domain)).summary
+        return not is_empty_summary(summary) and summary or None
@@ -0,0 +1,14 @@
+from typing import Protocol, Callable, Awaitable
+
+from application.Dto.dns import TAnalysisResult
+
+
+class IAnalysisCoalescer(Protocol):
+    """IAnalysisCoalescer"""
+
+    async def do(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[TAnalysisResult]]
+    ) -> TAnalysisResult:
+        pass
@@ -0,0 +1,10 @@
+from typing import Protocol, Callable, Awaitable
+
+from application.Dto.dns import DomainSummary
+
+
+class IAnalysisRegistry(Protocol):
+    """IAnalysisRegistry"""
+
+    async def run(self, domain: str, loader: Callable[[], Awaitable[DomainSummary]]) -> DomainSummary:
+        pass
@@ -1,8 +1,23 @@
-from typing import Protocol
+from typing import Protocol, AsyncIterator, Tuple, Callable, Optional, Any, Dict
+
+from domain.Entities.dns import DomainSummary
+from domain.ValueObjects.app import Domain, Projection, FULL_PROJECTION
+from domain.ValueObjects.dns import SubDomain
 
 
 class IDnsAnalyzeService(Protocol):
     """IDnsAnalyzeService"""
 
-    async def analyze(self) -> None:
+    async def analyze(self,
+        domain: Domain,
+        projection: Projection=FULL_PROJECTION,
+        on_part: Optional[Callable[[str, Optional[str], Any], None]]=None,
+        deadline: Optional[float]=None
+    ) -> DomainSummary:
+        pass
+
+    async def analyze_reply(self, domain: Domain, projection: Projection=FULL_PROJECTION) -> Dict[str, Any]:
+        pass
+
+    def iter_subdomains(self, domain: Domain) -> AsyncIterator[Tuple[SubDomain, ...]]:
         pass
\ No newline at end of file
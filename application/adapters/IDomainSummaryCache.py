@@ -0,0 +1,16 @@
+from typing import Protocol, Optional, Callable, Awaitable
+
+from application.Dto.dns import DomainSummary, CachedSummary
+
+
+class IDomainSummaryCache(Protocol):
+    """IDomainSummaryCache"""
+
+    async def get(self, domain: str) -> Optional[CachedSummary]:
+        pass
+
+    async def set(self, domain: str, summary: DomainSummary, elapsed: float) -> None:
+        pass
+
+    def refresh(self, domain: str, loader: Callable[[], Awaitable[Optional[DomainSummary]]]) -> None:
+        pass
@@ -19,5 +19,8 @@ class IStrBytesExpiryStorage(Protocol[T]):
     async def remove_expired(self) -> List[T]:
         pass
 
+    async def alive(self) -> List[T]:
+        pass
+
     async def all_alive(self) -> int:
         pass
\ No newline at end of file
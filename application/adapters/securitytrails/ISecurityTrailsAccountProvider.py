@@ -24,4 +24,8 @@ class ISecurityTrailsAccountProvider(Protocol):
         pass
 
     async def shutdown(self) -> None:
+        pass
+
+    @property
+    def available_requests(self) -> int:
         pass
\ No newline at end of file
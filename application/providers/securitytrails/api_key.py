@@ -167,6 +167,12 @@ class SecurityTrailsAccountProvider:
         await cancel_all(self.__aio_tasks)
         self.__aio_tasks.clear()
 
+    @property
+    def available_requests(self) -> int:
+        """Requests the queued accounts have left, the capacity callers may plan against."""
+
+        return self.__available_requests
+
     async def __fetch_and_fill_minimal(self):
         await self.__inner_queue.flush()
 
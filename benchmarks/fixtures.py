@@ -0,0 +1,118 @@
+from json import load
+
+from typing import Any, Dict, List, Optional
+
+
+SUMMARY_PATH = '.archive/summary.json'
+
+# Reply field -> upstream field, per record type.
+UPSTREAM_FIELDS = {
+    'a': { 'ip': 'ip', 'count': 'ip_count', 'organization': 'ip_organization' },
+    'aaaa': { 'ipv6': 'ipv6', 'count': 'ipv6_count', 'organization': 'ipv6_organization' },
+    'mx': { 'priority': 'priority', 'host': 'host', 'count': 'host_count', 'organization': 'hostname_organization' },
+    'ns': { 'nameserver': 'nameserver', 'count': 'nameserver_count', 'organization': 'nameserver_organization' },
+    'soa': { 'ttl': 'ttl', 'email': 'email', 'count': 'email_count' },
+    'txt': { 'value': 'value' }
+}
+RECORD_TYPES = tuple(UPSTREAM_FIELDS)
+
+
+def _upstream_value(record_type: str, value: Dict[str, Any]) -> Dict[str, Any]:
+    """_upstream_value"""
+
+    return {
+        upstream: value.get(field)
+        for field, upstream in UPSTREAM_FIELDS[record_type].items()
+    }
+
+def _upstream_present(record_type: str, row: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """_upstream_present"""
+
+    if row is None: return {}
+
+    return {
+        'first_seen': row['first_seen'],
+        'values': [_upstream_value(record_type, value) for value in row['values']]
+    }
+
+def _upstream_history(record_type: str, row: Dict[str, Any]) -> Dict[str, Any]:
+    """_upstream_history"""
+
+    return {
+        'first_seen': row['first_seen'],
+        'last_seen': row['last_seen'],
+        'organizations': row['organizations'] or [],
+        'values': [_upstream_value(record_type, value) for value in row['values']]
+    }
+
+def load_summary(path: str=SUMMARY_PATH) -> Dict[str, Any]:
+    """load_summary"""
+
+    with open(path) as file:
+        return load(file)['summary']
+
+def usage_payload(usage: int=12, allowed: int=50) -> Dict[str, Any]:
+    """usage_payload"""
+
+    return {
+        'current_monthly_usage': usage,
+        'allowed_monthly_usage': allowed
+    }
+
+def domain_payload(summary: Dict[str, Any]) -> Dict[str, Any]:
+    """domain_payload"""
+
+    return {
+        'hostname': summary['hostname'],
+        'alexa_rank': None,
+        'current_dns': {
+            record_type: _upstream_present(record_type, summary['present'][record_type])
+            for record_type in RECORD_TYPES
+        }
+    }
+
+def subdomains_payload(summary: Dict[str, Any], multiplier: int=1) -> Dict[str, Any]:
+    """subdomains_payload"""
+
+    subdomains = list(summary['subdomains'])
+    subdomains += [
+        f'{subdomain}{index}'
+        for index in range(1, multiplier)
+        for subdomain in summary['subdomains']
+    ]
+    return {
+        'subdomain_count': len(subdomains),
+        'subdomains': subdomains
+    }
+
+def search_records(summary: Dict[str, Any], multiplier: int=1) -> List[Dict[str, Any]]:
+    """Domains a search by IP or nameserver would return, one per (inflated) subdomain."""
+
+    organization = next((
+        value['organization']
+        for value in (summary['present']['a'] or { 'values': [] })['values']
+        if value.get('organization')
+    ), None)
+    return [
+        {
+            'hostname': f'{subdomain}.{summary["hostname"]}',
+            'alexa_rank': None,
+            'host_provider': organization and [organization] or [],
+            'mail_provider': [],
+            'computed': { 'company_name': None }
+        }
+        for subdomain in subdomains_payload(summary, multiplier)['subdomains']
+    ]
+
+def history_payload(summary: Dict[str, Any], record_type: str, multiplier: int=1) -> Dict[str, Any]:
+    """history_payload"""
+
+    records: List[Dict[str, Any]] = [
+        _upstream_history(record_type, row)
+        for row in summary['history'][record_type]
+    ] * multiplier
+    return {
+        'type': record_type,
+        'pages': 1,
+        'records': records
+    }
@@ -0,0 +1,84 @@
+"""
+Compares the two decode paths of the SecurityTrails mappers on raw response bodies built
+from `.archive/summary.json`: `json` (stdlib decoding, records built by keyword) and `fast`
+(orjson when installed, slotted records built positionally). Every run first checks that
+both paths map each body to identical values.
+
+    python -m benchmarks.securitytrails_decode --multiplier 200 --rounds 20
+"""
+
+from argparse import ArgumentParser
+from functools import partial
+from json import dumps, loads
+from time import perf_counter
+
+from libs.securitytrails.decoders import DECODERS, JSON_DECODER, fast_loads, orjson_loads
+from libs.securitytrails.mappers import domain_mapper, history_dns_mapper
+from libs.securitytrails.types.records import RecordType
+
+from benchmarks import fixtures
+
+
+LOADS = {
+    JSON_DECODER: loads,
+    'fast': fast_loads
+}
+
+
+def _bodies(multiplier: int):
+    """Raw bodies paired with the mapper each one goes through."""
+
+    summary = fixtures.load_summary()
+    bodies = [(dumps(fixtures.domain_payload(summary)).encode(), domain_mapper)]
+    bodies += [
+        (
+            dumps(fixtures.history_payload(summary, record.value, multiplier)).encode(),
+            partial(history_dns_mapper, type=record)
+        )
+        for record in RecordType
+    ]
+    return bodies
+
+def _decode(decoder: str, bodies):
+    """_decode"""
+
+    return [
+        mapper(LOADS[decoder](body), decoder=decoder)
+        for body, mapper in bodies
+    ]
+
+def _measure(decoder: str, bodies, rounds: int) -> float:
+    """_measure"""
+
+    started = perf_counter()
+    for _ in range(rounds):
+        _decode(decoder, bodies)
+    return perf_counter() - started
+
+def main(multiplier: int, rounds: int):
+    bodies = _bodies(multiplier)
+    size = sum((len(body) for body, _ in bodies))
+
+    expected = _decode(JSON_DECODER, bodies)
+    for decoder in DECODERS:
+        assert _decode(decoder, bodies) == expected, f'{decoder} decoder mapped different values.'
+
+    print(f'bodies: {len(bodies)}; size: {size / 1024:.1f} KiB; orjson: {orjson_loads is not None}.')
+    baseline = None
+    for decoder in DECODERS:
+        elapsed = _measure(decoder, bodies, rounds)
+        baseline = baseline or elapsed
+        print((
+            f'{decoder:<6} {elapsed / rounds * 1000:.2f} ms/round; '
+            f'{size * rounds / elapsed / 1024 / 1024:.1f} MiB/s; '
+            f'speedup: {baseline / elapsed:.2f}x.'
+        ))
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--multiplier', type=int, default=200)
+    parser.add_argument('--rounds', type=int, default=20)
+    arguments = parser.parse_args()
+
+    main(arguments.multiplier, arguments.rounds)
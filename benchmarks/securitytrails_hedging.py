@@ -0,0 +1,68 @@
+"""
+Measures the tail latency of `get_history_dns` with and without a `HedgePolicy` against the
+local stand-in, whose history endpoint answers slowly for a small share of requests.
+
+    python -m benchmarks.securitytrails_hedging --calls 1000 --slow 1.0 --probability 0.02
+"""
+
+import asyncio as aio
+
+from argparse import ArgumentParser
+from time import perf_counter
+
+from libs.securitytrails.client import SecurityTrailsClient, RecordType
+from libs.securitytrails.hedging import HedgePolicy
+
+from benchmarks.standin import running_standin, StandInConfig, Latency
+
+
+API_KEYS = ('benchmark-1', 'benchmark-2')
+DOMAIN = 'atilova.com'
+
+
+def _percentile(latencies, percentile: float) -> float:
+    """_percentile"""
+
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percentile))]
+
+async def _measure(name: str, base_url: str, calls: int, hedge):
+    """_measure"""
+
+    async def hedge_key():
+        return API_KEYS[1]
+
+    latencies = []
+    async with SecurityTrailsClient(base_url=base_url, hedge=hedge) as client:
+        for _ in range(calls):
+            started = perf_counter()
+            await client.get_history_dns(DOMAIN, RecordType.A, api_key=API_KEYS[0], hedge_key=hedge_key)
+            latencies.append(perf_counter() - started)
+
+        print((
+            f'{name:<8} p50: {_percentile(latencies, 0.5) * 1000:.1f} ms; '
+            f'p99: {_percentile(latencies, 0.99) * 1000:.1f} ms; '
+            f'max: {max(latencies) * 1000:.1f} ms; '
+            f'hedging: {client.hedge_stats}.'
+        ))
+
+async def main(calls: int, slow: float, probability: float, max_extra_credits: int):
+    config = StandInConfig(
+        latency={ 'history_dns': Latency(kind='tail', args=(0.01, slow, probability)) },
+        seed=7
+    )
+    async with running_standin(config) as (base_url, stats):
+        await _measure('plain', base_url, calls, None)
+        await _measure('hedged', base_url, calls, HedgePolicy(max_extra_credits=max_extra_credits))
+        print(f'billed credits per key: {dict(stats.billed)}.')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--calls', type=int, default=1000)
+    parser.add_argument('--slow', type=float, default=1.0)
+    parser.add_argument('--probability', type=float, default=0.02)
+    parser.add_argument('--max-extra-credits', type=int, default=20)
+    arguments = parser.parse_args()
+
+    aio.run(main(arguments.calls, arguments.slow, arguments.probability, arguments.max_extra_credits))
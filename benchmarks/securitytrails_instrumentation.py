@@ -0,0 +1,71 @@
+"""
+Measures the overhead of `ClientInstrumentation` against the local stand-in and prints
+the phase timings and latency histograms it collected.
+
+    python -m benchmarks.securitytrails_instrumentation --analyses 300
+"""
+
+import asyncio as aio
+
+from argparse import ArgumentParser
+from time import perf_counter
+
+from libs.securitytrails.client import SecurityTrailsClient, RecordType
+from libs.securitytrails.instrumentation import ClientInstrumentation
+
+from benchmarks.standin import running_standin
+
+
+API_KEY = 'benchmark'
+DOMAIN = 'atilova.com'
+
+
+async def _analysis(client: SecurityTrailsClient):
+    """_analysis"""
+
+    await client.get_domain(DOMAIN, api_key=API_KEY)
+    await aio.gather(
+        client.get_subdomains(DOMAIN, api_key=API_KEY),
+        *(client.get_history_dns(DOMAIN, record, api_key=API_KEY) for record in RecordType)
+    )
+
+async def _measure(base_url: str, analyses: int, instrumentation) -> float:
+    """_measure"""
+
+    async with SecurityTrailsClient(base_url=base_url, instrumentation=instrumentation) as client:
+        await _analysis(client)
+
+        started = perf_counter()
+        for _ in range(analyses):
+            await _analysis(client)
+        return (perf_counter() - started) / analyses
+
+async def main(analyses: int, rounds: int):
+    instrumentation = ClientInstrumentation()
+    async with running_standin() as (base_url, _):
+        plain, traced = [], []
+        for _ in range(rounds):
+            plain.append(await _measure(base_url, analyses, None))
+            traced.append(await _measure(base_url, analyses, instrumentation))
+
+    plain, traced = min(plain), min(traced)
+    print((
+        f'plain: {plain * 1000:.3f} ms/analysis; instrumented: {traced * 1000:.3f} ms/analysis; '
+        f'overhead: {(traced - plain) / plain * 100:+.1f}%.'
+    ))
+
+    metrics = instrumentation.metrics
+    for (endpoint, phase), histogram in sorted(metrics.phases.items()):
+        print(f'{endpoint:<15} {phase:<8} count: {histogram.count:>6}; mean: {histogram.total / histogram.count * 1000:.3f} ms.')
+    for (endpoint, code), histogram in sorted(metrics.latency.items()):
+        print(f'{endpoint:<15} {code:<8} count: {histogram.count:>6}; p99 <= {histogram.quantile(0.99)} s.')
+    print(f'bytes: {dict(metrics.bytes)}.')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--analyses', type=int, default=300)
+    parser.add_argument('--rounds', type=int, default=3)
+    arguments = parser.parse_args()
+
+    aio.run(main(arguments.analyses, arguments.rounds))
@@ -0,0 +1,110 @@
+"""
+Compares the two ways an analysis becomes the reply of the `analyze_domain` event, starting from
+the client data mapped from `.archive/summary.json`: `entities` (domain entities, application DTOs
+and `asdict`) and `fast` (a single pass to the reply dict, `SERVICE_GATEWAY_FAST_REPLY`). Every run
+first checks that both paths build identical replies.
+
+    python -m benchmarks.securitytrails_reply --multiplier 200 --rounds 20
+"""
+
+from argparse import ArgumentParser
+from time import perf_counter
+
+from libs.securitytrails.mappers import domain_mapper, subdomains_mapper, history_dns_mapper
+from libs.securitytrails.types.records import RecordType
+
+from application.Dto.dns import ResultCode, DomainAnalysisReplyDTO
+from application.Dto.mappers.dns import map_data_to_dns_output_dto
+
+from domain.Services.dns import DomainDnsService
+from domain.ValueObjects.dns import Hostname
+
+from infrastructure.services.dns.mappers import map_to_current_dns, map_to_history_rows, map_to_subdomains_list
+from infrastructure.services.dns.reply import map_to_present_reply, map_to_history_reply, map_to_summary_reply
+
+from benchmarks import fixtures
+
+
+def _data(multiplier: int):
+    """The client data of a full analysis, histories and subdomains inflated by `multiplier`."""
+
+    summary = fixtures.load_summary()
+    return (
+        summary['hostname'],
+        domain_mapper(fixtures.domain_payload(summary)),
+        subdomains_mapper(fixtures.subdomains_payload(summary, multiplier)),
+        {
+            record.value: history_dns_mapper(
+                fixtures.history_payload(summary, record.value, multiplier), type=record
+            )
+            for record in RecordType
+        }
+    )
+
+def _entities(hostname, domain, subdomains, history):
+    """_entities"""
+
+    service = DomainDnsService()
+    return map_data_to_dns_output_dto(service.new_summary(
+        hostname=Hostname(hostname),
+        current=map_to_current_dns(domain, service),
+        history=service.new_history_dns_table(**{
+            record_type: map_to_history_rows(record_type, data, service)
+            for record_type, data in history.items()
+        }),
+        subdomains=map_to_subdomains_list(subdomains)
+    )).to_dict()
+
+def _fast(hostname, domain, subdomains, history):
+    """_fast"""
+
+    return DomainAnalysisReplyDTO(code=ResultCode.FETCHED, summary=map_to_summary_reply(
+        hostname,
+        present=map_to_present_reply(domain),
+        history={
+            record_type: map_to_history_reply(record_type, data)
+            for record_type, data in history.items()
+        },
+        subdomains=subdomains.subdomains
+    )).to_dict()
+
+PATHS = {
+    'entities': _entities,
+    'fast': _fast
+}
+
+def _measure(path, data, rounds: int) -> float:
+    """_measure"""
+
+    started = perf_counter()
+    for _ in range(rounds):
+        path(*data)
+    return perf_counter() - started
+
+def main(multiplier: int, rounds: int):
+    data = _data(multiplier)
+    rows = sum((len(history.records) for history in data[3].values()))
+
+    expected = _entities(*data)
+    for name, path in PATHS.items():
+        assert path(*data) == expected, f'{name} path built a different reply.'
+
+    print(f'history rows: {rows}; subdomains: {data[2].count}.')
+    baseline = None
+    for name, path in PATHS.items():
+        elapsed = _measure(path, data, rounds)
+        baseline = baseline or elapsed
+        print((
+            f'{name:<8} {elapsed / rounds * 1000:.2f} ms/round; '
+            f'{rows * rounds / elapsed / 1000:.1f}k rows/s; '
+            f'speedup: {baseline / elapsed:.2f}x.'
+        ))
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--multiplier', type=int, default=200)
+    parser.add_argument('--rounds', type=int, default=20)
+    arguments = parser.parse_args()
+
+    main(arguments.multiplier, arguments.rounds)
@@ -0,0 +1,145 @@
+"""
+Checks the fast reply path (`SERVICE_GATEWAY_FAST_REPLY`) against the entities path on the replies
+`benchmarks.securitytrails_reply` leaves out: result codes without a summary, the empty summary of a domain
+without data or rejected upstream, projections, deep analyses, truncated or failed histories and analyses cut
+short by a deadline. Both use cases run against a stub client serving `.archive/summary.json` with the
+statuses of the case, their replies are encoded with `encode_reply` and have to be byte for byte identical.
+
+    python -m benchmarks.securitytrails_reply_check
+"""
+
+import asyncio as aio
+import sys
+
+from argparse import ArgumentParser
+from types import SimpleNamespace
+
+from typing import Any, Dict, Optional
+
+from libs.securitytrails.client import BaseResponse, BaseStatus, RecordType
+from libs.securitytrails.mappers import domain_mapper, subdomains_mapper, history_dns_mapper
+
+from application.Dto.dns import DomainAnalysisInputDTO
+from application.Dto.mappers.reply import encode_reply
+from application.UseCases.DnsAnalyzeDomain import DnsAnalyzeDomain
+
+from domain.Services.dns import DomainDnsService
+
+from infrastructure.services.dns import DnsAnalyzeService
+
+from benchmarks import fixtures
+
+
+ACCOUNT = SimpleNamespace(api_key=SimpleNamespace(raw=lambda: 'benchmark'))
+# Statuses whose response keeps the data read, every other one comes without data.
+DATA_STATUSES = (BaseStatus.FETCHED, BaseStatus.PARTIAL)
+
+# Case name -> stub client options and analysis input, `timeout` becomes the deadline of the analysis.
+CASES: Dict[str, Dict[str, Any]] = {
+    'full': {},
+    'invalid domain': { 'input': { 'domain': 'not a domain' } },
+    'invalid projection': { 'input': { 'sections': ['unknown'] } },
+    'no info': { 'statuses': { 'base_domain': BaseStatus.NO_INFO } },
+    'invalid domain upstream': { 'statuses': { 'base_domain': BaseStatus.INVALID_DOMAIN } },
+    'rate limited domain': { 'statuses': { 'base_domain': BaseStatus.RATE_LIMITED } },
+    'no subdomains': { 'statuses': { 'subdomain_list': BaseStatus.NO_INFO } },
+    'partial history': { 'statuses': { 'history_dns': BaseStatus.PARTIAL } },
+    'failed history': { 'statuses': { 'history_dns': BaseStatus.UNDEFINED } },
+    'present': { 'input': { 'sections': ['present'] } },
+    'history records': { 'input': { 'sections': ['history'], 'records': ['a', 'txt'] } },
+    'history without domain data': {
+        'statuses': { 'base_domain': BaseStatus.NO_INFO },
+        'input': { 'sections': ['history', 'subdomains'] }
+    },
+    'subdomains': { 'input': { 'sections': ['subdomains'] } },
+    'deep': { 'input': { 'deep': { 'subdomains': 3, 'budget': 2 } } },
+    'deep without subdomain data': {
+        'statuses': { 'subdomain_base_domain': BaseStatus.NO_INFO },
+        'input': { 'deep': { 'subdomains': 3 } }
+    },
+    'missing history': { 'delays': { 'history_dns': 1.0 }, 'timeout': 0.2 },
+    'missing deep': { 'delays': { 'subdomain_base_domain': 1.0 }, 'input': { 'deep': True }, 'timeout': 0.2 }
+}
+
+
+class StubProvider:
+    """Hands out the same account, the stub client never checks it."""
+
+    async def get(self):
+        return ACCOUNT
+
+    async def expire_account(self, account) -> None:
+        pass
+
+
+class StubClient:
+    """
+    Serves the summary fixture in place of `SecurityTrailsClient`, with a status and a delay per endpoint.
+    Calls for subdomains of the analyzed domain go by `subdomain_base_domain`.
+    """
+
+    def __init__(self, summary: Dict[str, Any], *,
+        statuses: Optional[Dict[str, BaseStatus]]=None,
+        delays: Optional[Dict[str, float]]=None
+    ):
+        self.__summary = summary
+        self.__statuses = statuses or {}
+        self.__delays = delays or {}
+
+    async def get_domain(self, domain: str, **kwargs) -> BaseResponse:
+        endpoint = domain == self.__summary['hostname'] and 'base_domain' or 'subdomain_base_domain'
+        return await self.__respond(endpoint, lambda: domain_mapper(fixtures.domain_payload(self.__summary)))
+
+    async def get_subdomains(self, domain: str, **kwargs) -> BaseResponse:
+        return await self.__respond('subdomain_list', lambda: subdomains_mapper(fixtures.subdomains_payload(self.__summary)))
+
+    async def get_history_dns(self, domain: str, record_type: RecordType, **kwargs) -> BaseResponse:
+        return await self.__respond('history_dns', lambda: history_dns_mapper(
+            fixtures.history_payload(self.__summary, record_type.value), type=record_type
+        ))
+
+    async def __respond(self, endpoint: str, data) -> BaseResponse:
+        await aio.sleep(self.__delays.get(endpoint, 0))
+
+        status = self.__statuses.get(endpoint, BaseStatus.FETCHED)
+        return BaseResponse(status=status, response=status in DATA_STATUSES and data() or None)
+
+async def _reply(client: StubClient, fast_reply: bool, case: Dict[str, Any], hostname: str) -> bytes:
+    """_reply"""
+
+    service = DnsAnalyzeService(provider=StubProvider(), service=DomainDnsService(), client=client)
+    use_case = DnsAnalyzeDomain(service=service, fast_reply=fast_reply)
+
+    timeout = case.get('timeout')
+    deadline = timeout is not None and aio.get_running_loop().time() + timeout or None
+    data = DomainAnalysisInputDTO(**{ 'domain': hostname, 'deadline': deadline, **case.get('input', {}) })
+    return encode_reply(await use_case(data), {})
+
+async def main(verbose: bool) -> int:
+    summary = fixtures.load_summary()
+
+    failures = 0
+    for name, case in CASES.items():
+        client = StubClient(summary, statuses=case.get('statuses'), delays=case.get('delays'))
+        entities, fast = await aio.gather(
+            _reply(client, False, case, summary['hostname']),
+            _reply(client, True, case, summary['hostname'])
+        )
+        is_equal = entities == fast
+        failures += not is_equal and 1 or 0
+
+        print(f'{name:<28} {is_equal and "ok" or "DIFFERENT"}; {len(entities)} bytes.')
+        if verbose or not is_equal:
+            print(f'    entities: {entities[:400]}')
+            print(f'    fast:     {fast[:400]}')
+
+    print(f'{len(CASES) - failures} of {len(CASES)} cases build identical replies.')
+    return failures
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--verbose', action='store_true')
+    arguments = parser.parse_args()
+
+    sys.exit(aio.run(main(arguments.verbose)) and 1 or 0)
@@ -0,0 +1,97 @@
+"""
+Compares a per-call `ClientSession` (the previous `_fetch` behaviour) with the pooled
+`SecurityTrailsClient` session against the local stand-in (`benchmarks.standin`). Every analysis
+issues the same eight calls `DnsAnalyzeService.analyze` does; the stand-in counts accepted
+connections, each of which is one TCP (and, with --tls, TLS) handshake.
+
+    python -m benchmarks.securitytrails_session --analyses 50 --tls
+"""
+
+import asyncio as aio
+import ssl
+import subprocess
+
+from argparse import ArgumentParser
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from os import path
+
+from aiohttp import ClientSession, TCPConnector
+
+from libs.securitytrails.client import SecurityTrailsClient, RecordType
+
+from benchmarks.standin import running_standin
+
+
+API_KEY = 'benchmark'
+DOMAIN = 'atilova.com'
+
+
+def _self_signed(directory: str) -> ssl.SSLContext:
+    """_self_signed"""
+
+    cert, key = path.join(directory, 'cert.pem'), path.join(directory, 'key.pem')
+    subprocess.run(
+        ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+         '-subj', '/CN=127.0.0.1', '-keyout', key, '-out', cert],
+        check=True, capture_output=True
+    )
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert, key)
+    return context
+
+async def _analysis(client: SecurityTrailsClient):
+    """_analysis"""
+
+    await client.get_domain(DOMAIN, api_key=API_KEY)
+    await aio.gather(
+        client.get_subdomains(DOMAIN, api_key=API_KEY),
+        *(client.get_history_dns(DOMAIN, record, api_key=API_KEY) for record in RecordType)
+    )
+
+async def _per_call_analysis(base_url: str):
+    """Previous behaviour: a brand-new session for every upstream call."""
+
+    async def fetch(url: str):
+        async with ClientSession(connector=TCPConnector(ssl=False)) as session:
+            async with session.get(url, headers={ 'APIKEY': API_KEY }) as response:
+                await response.json()
+
+    await fetch(f'{base_url}/domain/{DOMAIN}/')
+    await aio.gather(
+        fetch(f'{base_url}/domain/{DOMAIN}/subdomains/'),
+        *(fetch(f'{base_url}/history/{DOMAIN}/dns/{record.value}/') for record in RecordType)
+    )
+
+async def _measure(name: str, analyses: int, connections: set, run):
+    """_measure"""
+
+    connections.clear()
+    started = perf_counter()
+    for _ in range(analyses):
+        await run()
+    elapsed = perf_counter() - started
+
+    print((
+        f'{name:<10} analyses: {analyses}; '
+        f'handshakes: {len(connections)} ({len(connections) / analyses:.2f}/analysis); '
+        f'latency: {elapsed / analyses * 1000:.2f} ms/analysis.'
+    ))
+
+async def main(analyses: int, tls: bool):
+    with TemporaryDirectory() as directory:
+        ssl_context = tls and _self_signed(directory) or None
+
+        async with running_standin(ssl_context=ssl_context) as (base_url, stats):
+            await _measure('per-call', analyses, stats.connections, lambda: _per_call_analysis(base_url))
+
+            async with SecurityTrailsClient(base_url=base_url, ssl=False) as client:
+                await _measure('pooled', analyses, stats.connections, lambda: _analysis(client))
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--analyses', type=int, default=50)
+    parser.add_argument('--tls', action='store_true')
+    arguments = parser.parse_args()
+
+    aio.run(main(arguments.analyses, arguments.tls))
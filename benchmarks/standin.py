@@ -0,0 +1,291 @@
+"""
+Local stand-in for the SecurityTrails API, serving `/account/usage`, `/domain/{d}`, `/domain/{d}/subdomains`,
+`/history/{d}/dns/{type}`, `/domains/list` and `/scroll/{id}` from `.archive/summary.json`.
+Every domain gets the fixture data, every search the domains built from its subdomains.
+
+Latency is drawn per endpoint from a distribution, given as `endpoint=spec` or just `spec` for all of them:
+    fixed:<seconds>                     always the same delay
+    uniform:<low>:<high>                uniformly distributed delay
+    lognormal:<median>:<sigma>          long-tailed delay
+    tail:<base>:<slow>:<probability>    `slow` with the given probability, `base` otherwise
+
+Failures are injected at the given rates (429 throttling with Retry-After, 401, 404), keys run out
+of credits after `--quota` billed calls (429 quota exhaustion) and `--multiplier` inflates subdomains
+and history records for huge payloads. Domains without a dot answer 400 (invalid domain).
+
+    python -m benchmarks.standin --port 8099 --latency history_dns=tail:0.02:1.5:0.02 --quota 50
+    SECURITYTRAILS_BASE_URL=http://127.0.0.1:8099 python gateway.py
+"""
+
+import asyncio as aio
+import random
+
+from argparse import ArgumentParser
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from json import dumps
+from ssl import SSLContext
+
+from typing import Any, AsyncIterator, Dict, List, Optional, FrozenSet, Tuple
+
+from aiohttp import web
+
+from benchmarks import fixtures
+
+
+INVALID_DOMAIN = { 'message': 'The requested domain is invalid' }
+QUOTA_EXCEEDED = { 'message': "You've exceeded the usage limits for your account." }
+THROTTLED = { 'message': 'Too many requests, slow down.' }
+UNAUTHORIZED = { 'message': 'Invalid authentication credentials' }
+NOT_FOUND = { 'message': 'Not found' }
+SEARCH_PAGE_SIZE = 100
+
+
+@dataclass(frozen=True)
+class Latency:
+    """Latency distribution, see the module docstring for the specs."""
+
+    kind: str = 'fixed'
+    args: Tuple[float, ...] = (0.0,)
+
+    @classmethod
+    def parse(cls, spec: str) -> 'Latency':
+        kind, *args = spec.split(':')
+        arity = { 'fixed': 1, 'uniform': 2, 'lognormal': 2, 'tail': 3 }
+        if arity.get(kind) != len(args):
+            raise ValueError(f'Unknown latency distribution: {spec}.')
+        return cls(kind=kind, args=tuple(map(float, args)))
+
+    def sample(self, rng: random.Random) -> float:
+        match self.kind:
+            case 'uniform':
+                return rng.uniform(*self.args)
+            case 'lognormal':
+                median, sigma = self.args
+                return median * rng.lognormvariate(0, sigma)
+            case 'tail':
+                base, slow, probability = self.args
+                return rng.random() < probability and slow or base
+        return self.args[0]
+
+
+@dataclass
+class StandInConfig:
+    """StandInConfig"""
+
+    latency: Dict[str, Latency] = field(default_factory=dict)
+    throttle_rate: float = 0.0
+    unauthorized_rate: float = 0.0
+    not_found_rate: float = 0.0
+    retry_after: float = 1.0
+    quota: Optional[int] = None
+    keys: Optional[FrozenSet[str]] = None
+    multiplier: int = 1
+    page_size: Optional[int] = None
+    seed: Optional[int] = None
+
+
+@dataclass
+class StandInStats:
+    """StandInStats"""
+
+    responses: Counter = field(default_factory=Counter)
+    billed: Counter = field(default_factory=Counter)
+    bytes_sent: int = 0
+    connections: set = field(default_factory=set)
+
+    @property
+    def handshakes(self) -> int:
+        return len(self.connections)
+
+
+def _json(data: Any) -> bytes:
+    """_json"""
+
+    return dumps(data, separators=(',', ':')).encode()
+
+def _history_pages(summary: Dict[str, Any], config: StandInConfig) -> Dict[str, List[bytes]]:
+    """Serialize every history page upfront, huge payloads are not rebuilt per request."""
+
+    pages = {}
+    for record_type in fixtures.RECORD_TYPES:
+        payload = fixtures.history_payload(summary, record_type, config.multiplier)
+        records, size = payload['records'], config.page_size or max(1, len(payload['records']))
+        chunks = [records[start:start + size] for start in range(0, len(records), size)] or [[]]
+        pages[record_type] = [
+            _json({ **payload, 'pages': len(chunks), 'records': chunk })
+            for chunk in chunks
+        ]
+    return pages
+
+def create_app(config: StandInConfig, summary: Optional[Dict[str, Any]]=None) -> web.Application:
+    """Build the stand-in application, its counters are available as `app['stats']`."""
+
+    summary = summary or fixtures.load_summary()
+    rng = random.Random(config.seed)
+    stats = StandInStats()
+    usage: Counter = Counter()
+
+    subdomains = _json(fixtures.subdomains_payload(summary, config.multiplier))
+    history = _history_pages(summary, config)
+    search = fixtures.search_records(summary, config.multiplier)
+    search_pages = max(1, -(-len(search) // SEARCH_PAGE_SIZE))
+
+    def search_page(number: int, scroll: bool=False) -> bytes:
+        start = (number - 1) * SEARCH_PAGE_SIZE
+        records = search[start:start + SEARCH_PAGE_SIZE]
+        meta = { 'page': number, 'total_pages': search_pages, 'max_page': search_pages, 'limit_reached': False }
+        if scroll: meta['scroll_id'] = str(number + 1)
+        return _json({ 'record_count': len(search), 'records': records, 'meta': meta })
+
+    def reply(endpoint: str, status: int, body: bytes, headers: Optional[Dict[str, str]]=None) -> web.Response:
+        stats.responses[(endpoint, status)] += 1
+        stats.bytes_sent += len(body)
+        return web.Response(status=status, body=body, content_type='application/json', headers=headers)
+
+    def rejection(endpoint: str, key: Optional[str], billed: bool) -> Optional[web.Response]:
+        if key is None or (config.keys is not None and key not in config.keys) or rng.random() < config.unauthorized_rate:
+            return reply(endpoint, 401, _json(UNAUTHORIZED))
+
+        if billed and config.quota is not None and usage[key] >= config.quota:
+            return reply(endpoint, 429, _json(QUOTA_EXCEEDED), {
+                'X-RateLimit-Limit-Month': str(config.quota),
+                'X-RateLimit-Remaining-Month': '0'
+            })
+
+        if rng.random() < config.throttle_rate:
+            return reply(endpoint, 429, _json(THROTTLED), {
+                'Retry-After': str(config.retry_after),
+                'X-RateLimit-Remaining-Second': '0'
+            })
+        return None
+
+    def handler(endpoint: str, billed: bool=True):
+        def decorator(serve):
+            async def handle(request: web.Request) -> web.Response:
+                stats.connections.add(request.transport)
+                latency = config.latency.get(endpoint) or config.latency.get('default')
+                if latency is not None:
+                    await aio.sleep(latency.sample(rng))
+
+                key = request.headers.get('APIKEY')
+                rejected = rejection(endpoint, key, billed)
+                if rejected is not None: return rejected
+
+                domain = request.match_info.get('domain')
+                if domain is not None and '.' not in domain:
+                    return reply(endpoint, 400, _json(INVALID_DOMAIN))
+                if domain is not None and rng.random() < config.not_found_rate:
+                    return reply(endpoint, 404, _json(NOT_FOUND))
+
+                if billed:
+                    usage[key] += 1
+                    stats.billed[key] += 1
+                return reply(endpoint, 200, serve(request))
+            return handle
+        return decorator
+
+    @handler('usage', billed=False)
+    def account_usage(request: web.Request) -> bytes:
+        key = request.headers['APIKEY']
+        return _json(fixtures.usage_payload(usage[key], config.quota or 50))
+
+    @handler('base_domain')
+    def domain(request: web.Request) -> bytes:
+        return _json({ **fixtures.domain_payload(summary), 'hostname': request.match_info['domain'] })
+
+    @handler('subdomain_list')
+    def subdomain_list(request: web.Request) -> bytes:
+        return subdomains
+
+    @handler('history_dns')
+    def history_dns(request: web.Request) -> bytes:
+        pages = history.get(request.match_info['type'].lower()) or history['a']
+        page = min(max(1, int(request.query.get('page', 1))), len(pages))
+        return pages[page - 1]
+
+    @handler('domains_search')
+    def domains_search(request: web.Request) -> bytes:
+        if request.query.get('scroll') == 'true':
+            return search_page(1, scroll=True)
+        return search_page(max(1, int(request.query.get('page', 1))))
+
+    @handler('scroll')
+    def scroll(request: web.Request) -> bytes:
+        return search_page(max(1, int(request.match_info['scroll_id'])), scroll=True)
+
+    app = web.Application()
+    app.router.add_post('/domains/list', domains_search)
+    app.router.add_get('/scroll/{scroll_id}', scroll)
+    for path, handle in (
+        ('/account/usage', account_usage),
+        ('/domain/{domain}', domain),
+        ('/domain/{domain}/subdomains', subdomain_list),
+        ('/history/{domain}/dns/{type}', history_dns)
+    ):
+        app.router.add_get(path, handle)
+        app.router.add_get(f'{path}/', handle)
+    app['stats'] = stats
+    return app
+
+@asynccontextmanager
+async def running_standin(
+    config: Optional[StandInConfig]=None, *,
+    ssl_context: Optional[SSLContext]=None,
+    host: str='127.0.0.1',
+    port: int=0
+) -> AsyncIterator[Tuple[str, StandInStats]]:
+    """Serve the stand-in in the current loop, yields its base url and counters."""
+
+    app = create_app(config or StandInConfig())
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    try:
+        site = web.TCPSite(runner, host, port, ssl_context=ssl_context)
+        await site.start()
+
+        bound_port = runner.addresses[0][1]
+        yield f'{ssl_context and "https" or "http"}://{host}:{bound_port}', app['stats']
+    finally:
+        await runner.cleanup()
+
+def _latency(specs: List[str]) -> Dict[str, Latency]:
+    """_latency"""
+
+    latency = {}
+    for spec in specs:
+        endpoint, _, distribution = spec.rpartition('=')
+        latency[endpoint or 'default'] = Latency.parse(distribution)
+    return latency
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--latency', action='append', default=[])
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--unauthorized-rate', type=float, default=0.0)
+    parser.add_argument('--not-found-rate', type=float, default=0.0)
+    parser.add_argument('--retry-after', type=float, default=1.0)
+    parser.add_argument('--quota', type=int, default=None)
+    parser.add_argument('--key', action='append', default=None)
+    parser.add_argument('--multiplier', type=int, default=1)
+    parser.add_argument('--page-size', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    arguments = parser.parse_args()
+
+    config = StandInConfig(
+        latency=_latency(arguments.latency),
+        throttle_rate=arguments.throttle_rate,
+        unauthorized_rate=arguments.unauthorized_rate,
+        not_found_rate=arguments.not_found_rate,
+        retry_after=arguments.retry_after,
+        quota=arguments.quota,
+        keys=arguments.key and frozenset(arguments.key) or None,
+        multiplier=arguments.multiplier,
+        page_size=arguments.page_size,
+        seed=arguments.seed
+    )
+    web.run_app(create_app(config), host=arguments.host, port=arguments.port, access_log=None)
@@ -1,7 +1,8 @@
 import asyncio as aio
+import sys
 
 from uuid import uuid4
-from json import dumps
+from json import dumps, loads
 
 from typing import Optional, Any
 
@@ -13,10 +14,42 @@ from config import conf
 from infrastructure.config import ServiceGatewayConfig
 
 
-def _compose_request_body(domain: str):
-    """_compose_request_body"""
+RECORDS = ('a', 'aaaa', 'mx', 'ns', 'soa', 'txt')
+# Statuses of a job still waiting for its result.
+PENDING_JOB_STATUSES = ('queued', 'running')
+JOB_POLL_INTERVAL = 1.0
 
-    return domain and { 'event': 'analyze_domain', 'data': { 'domain': domain } } or None
+
+def _compose_request_body(line: str, stream: bool=False):
+    """`domain [sections [records]]`, sections and history records are comma separated"""
+
+    domain, *projection = line.split() or ('',)
+    if not domain: return None
+
+    data = { 'domain': domain }
+    for name, values in zip(('sections', 'records'), projection):
+        data[name] = values.split(',')
+    if stream:
+        data['stream'] = True
+    return { 'event': 'analyze_domain', 'data': data }
+
+def _assemble_parts(parts: list[dict]) -> dict:
+    """Reassemble the parts of a streamed reply into the reply of a request that is not streamed."""
+
+    *sections, final = sorted(parts, key=lambda part: part['seq'])
+    result = final['data']
+
+    data = { (part['section'], part['record']): part['data'] for part in sections }
+    hostname = data.get(('hostname', None))
+    if hostname is not None:
+        result['summary'] = {
+            'hostname': hostname,
+            'present': data.get(('present', None)) or dict.fromkeys(RECORDS),
+            'history': { record: data.get(('history', record)) or [] for record in RECORDS },
+            'subdomains': data.get(('subdomains', None)) or [],
+            'deep': data.get(('deep', None)) or []
+        }
+    return result
 
 
 class TestRPCClient:
@@ -26,20 +59,39 @@ class TestRPCClient:
         self.__uri = uri
         self.__config = config
         self.__response_futures: dict[str, aio.Future[Any]] = {}
+        self.__stream_parts: dict[str, list[dict]] = {}
         self.__connection: Optional[AbstractConnection] = None
         self.__channel: Optional[AbstractChannel] = None
 
     async def __on_response(self, message: IncomingMessage):
+        parts = self.__stream_parts.get(message.correlation_id)
+        if parts is not None:
+            return self.__on_part(message, parts)
+
         future = self.__response_futures.pop(message.correlation_id, None)
         if not future: return
         future.set_result(message.body.decode())
 
-    async def call(self, request_body: bytes | str, timeout: int):
+    def __on_part(self, message: IncomingMessage, parts: list[dict]):
+        parts.append(loads(message.body))
+
+        # Parts may arrive out of order, the stream is complete once every part up to the final one is in.
+        final = next((part for part in parts if part['final']), None)
+        if final is None or len(parts) <= final['seq']: return
+
+        del self.__stream_parts[message.correlation_id]
+        future = self.__response_futures.pop(message.correlation_id, None)
+        if future and not future.done():
+            future.set_result(dumps(_assemble_parts(parts)))
+
+    async def call(self, request_body: bytes | str, timeout: int, stream: bool=False):
         if self.__channel is None or self.__channel.is_closed: return
 
         correlation_id = uuid4().hex
         future = aio.get_event_loop().create_future()
         self.__response_futures[correlation_id] = future
+        if stream:
+            self.__stream_parts[correlation_id] = []
 
         await self.__channel.default_exchange.publish(
             Message(
@@ -55,14 +107,15 @@ class TestRPCClient:
             return response
         except aio.TimeoutError:
             self.__response_futures.pop(correlation_id, None)
+            self.__stream_parts.pop(correlation_id, None)
         return None
 
-    async def call_json(self, serializable: Any, timeout: int=10):
+    async def call_json(self, serializable: Any, timeout: int=10, stream: bool=False):
         try:
             jsonified = dumps(serializable)
         except TypeError:
             return None
-        return await self.call(jsonified, timeout)
+        return await self.call(jsonified, timeout, stream)
 
     async def begin(self):
         self.__connection = await connect(self.__uri)
@@ -78,7 +131,21 @@ class TestRPCClient:
         if self.__connection is not None and not self.__connection.is_closed:
             await self.__connection.close()
 
-async def main():
+async def poll_job(client: TestRPCClient, request_body: dict, timeout: int=15) -> Optional[str]:
+    """Submit the analysis as a job and poll its result, every call is short whatever the analysis takes."""
+
+    request_body = { **request_body, 'event': 'submit_analysis' }
+    response = await client.call_json(request_body, timeout)
+    if response is None: return None
+
+    job_id = loads(response)['job_id']
+    while job_id is not None:
+        response = await client.call_json({ 'event': 'get_analysis_result', 'data': { 'job_id': job_id } }, timeout)
+        if response is None or loads(response)['status'] not in PENDING_JOB_STATUSES: break
+        await aio.sleep(JOB_POLL_INTERVAL)
+    return response
+
+async def main(stream: bool=False, job: bool=False):
     client = TestRPCClient(
         uri=conf.rabbitmq.uri,
         config=conf.service_gateway
@@ -88,11 +155,14 @@ async def main():
 
     try:
         while True:
-            domain = input('Enter domain: ')
-            request_body = _compose_request_body(domain)
+            domain = input('Enter domain [sections [records]]: ')
+            request_body = _compose_request_body(domain, stream)
             if request_body is None: continue
 
-            response = await client.call_json(request_body, 15)
+            if job:
+                response = await poll_job(client, request_body)
+            else:
+                response = await client.call_json(request_body, 15, stream)
             print(f'Analyzed: {response}')
     except KeyboardInterrupt:
         print('Quitting...')
@@ -100,4 +170,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    aio.run(main())
\ No newline at end of file
+    aio.run(main(stream='--stream' in sys.argv, job='--job' in sys.argv))
\ No newline at end of file
@@ -56,9 +56,19 @@ class HistoryDnsTable:
     txt: Tuple[HistoryDnsRow[TXTRecord], ...]
 
 
+@dataclass(frozen=True)
+class SubdomainSummary:
+    hostname: Hostname
+    current: CurrentDnsTable
+
+
 @dataclass
 class DomainSummary:
     hostname: Hostname
     current: CurrentDnsTable
     history: HistoryDnsTable
-    subdomains: Tuple[SubDomain, ...]
\ No newline at end of file
+    subdomains: Tuple[SubDomain, ...]
+    # Sections that did not finish before the deadline, e.g. `present` or `history.mx`.
+    missing: Tuple[str, ...] = tuple()
+    # Current DNS of the subdomains a deep analysis fanned out to.
+    deep: Tuple[SubdomainSummary, ...] = tuple()
\ No newline at end of file
@@ -4,6 +4,7 @@ from domain.Entities.dns import (
     CurrentDnsRow,
     HistoryDnsRow,
     DomainSummary,
+    SubdomainSummary,
     CurrentDnsTable,
     HistoryDnsTable,
 )
@@ -32,13 +33,26 @@ class DomainDnsService:
         hostname: Hostname,
         current: CurrentDnsTable,
         history: HistoryDnsTable,
-        subdomains: Tuple[SubDomain, ...]
+        subdomains: Tuple[SubDomain, ...],
+        missing: Tuple[str, ...]=tuple(),
+        deep: Tuple[SubdomainSummary, ...]=tuple()
     ) -> DomainSummary:
         return DomainSummary(
             hostname=hostname,
             current=current,
             history=history,
-            subdomains=subdomains
+            subdomains=subdomains,
+            missing=missing,
+            deep=deep
+        )
+
+    def new_subdomain_summary(self, *,
+        hostname: Hostname,
+        current: CurrentDnsTable
+    ) -> SubdomainSummary:
+        return SubdomainSummary(
+            hostname=hostname,
+            current=current
         )
 
     def new_current_dns_table(self, *,
@@ -1,5 +1,7 @@
 from dataclasses import dataclass
 
+from typing import Any, Iterable, Optional, Tuple
+
 from utils.is_root_domain import is_root_domain
 
 from domain.ValueObjects.base import ValueObject
@@ -20,4 +22,129 @@ class Domain(ValueObject[str]):
 
     def _validate(self) -> None:
         if not is_root_domain(self._value):
-            raise ValueError(f'Received invalid domain name: {self._value}.')
\ No newline at end of file
+            raise ValueError(f'Received invalid domain name: {self._value}.')
+
+SECTIONS = ('present', 'history', 'subdomains')
+HISTORY_RECORDS = ('a', 'aaaa', 'mx', 'ns', 'soa', 'txt')
+DEEP_MAX_SUBDOMAINS = 100
+DEEP_MAX_CONCURRENCY = 16
+
+
+@dataclass(frozen=True)
+class DeepAnalysis:
+    """
+    Fan-out over the first `subdomains` subdomains, analyzing the current DNS of each with at most
+    `concurrency` of them in flight. Every subdomain costs a credit, at most `budget` are spent.
+    """
+
+    subdomains: int = 10
+    budget: int = 10
+    concurrency: int = 4
+
+    def __post_init__(self) -> None:
+        for name, value, limit in (
+            ('subdomains', self.subdomains, DEEP_MAX_SUBDOMAINS),
+            ('budget', self.budget, DEEP_MAX_SUBDOMAINS),
+            ('concurrency', self.concurrency, DEEP_MAX_CONCURRENCY)
+        ):
+            if not isinstance(value, int) or isinstance(value, bool) or not 0 < value <= limit:
+                raise ValueError(f'Received invalid deep analysis {name}: {value}.')
+
+    @classmethod
+    def parse(cls, value: Any) -> Optional['DeepAnalysis']:
+        """`true` for the defaults, an object to override them, nothing or `false` for no fan-out."""
+
+        if value is None or value is False: return None
+        if value is True: return cls()
+        if not isinstance(value, dict):
+            raise ValueError(f'Received invalid deep analysis: {value}.')
+
+        unknown = set(value) - {'subdomains', 'budget', 'concurrency'}
+        if unknown:
+            raise ValueError(f'Received unknown deep analysis options: {unknown}.')
+
+        subdomains = value.get('subdomains', cls.subdomains)
+        return cls(
+            subdomains=subdomains,
+            budget=value.get('budget', subdomains),
+            concurrency=value.get('concurrency', cls.concurrency)
+        )
+
+    def key(self) -> str:
+        return f'{self.subdomains},{self.budget},{self.concurrency}'
+
+
+@dataclass(frozen=True)
+class Projection:
+    """
+    Sections of a domain summary to analyze, `history` holds the record types of the history section
+    and `deep` the subdomain fan-out, which needs the subdomains section.
+    """
+
+    present: bool = True
+    subdomains: bool = True
+    history: Tuple[str, ...] = HISTORY_RECORDS
+    deep: Optional[DeepAnalysis] = None
+
+    def __post_init__(self) -> None:
+        if not set(self.history) <= set(HISTORY_RECORDS):
+            raise ValueError(f'Received invalid history record types: {self.history}.')
+        if not (self.present or self.subdomains or self.history):
+            raise ValueError('Received a projection without any section.')
+        if self.deep is not None and not self.subdomains:
+            raise ValueError('Received a deep analysis without the subdomains section.')
+
+    @classmethod
+    def parse(cls,
+        sections: Optional[Iterable[str]]=None,
+        records: Optional[Iterable[str]]=None,
+        deep: Any=None
+    ) -> 'Projection':
+        """Projection of the requested sections and history record types, all of them when omitted."""
+
+        sections = _names(sections, SECTIONS, 'section')
+        records = _names(records, HISTORY_RECORDS, 'history record type')
+        return cls(
+            present='present' in sections,
+            subdomains='subdomains' in sections,
+            history='history' in sections and tuple((record for record in HISTORY_RECORDS if record in records)) or tuple(),
+            deep=DeepAnalysis.parse(deep)
+        )
+
+    @property
+    def is_full(self) -> bool:
+        return self == FULL_PROJECTION
+
+    @property
+    def credits(self) -> int:
+        """Upper bound of the upstream calls the projection is billed for."""
+
+        return self.present + self.subdomains + len(self.history) + (self.deep and self.deep.budget or 0)
+
+    def key(self) -> str:
+        """Stable name of the projection, equal projections share it."""
+
+        sections = (
+            self.present and 'present' or '',
+            self.subdomains and 'subdomains' or '',
+            ','.join(self.history),
+            *(self.deep and (f'deep:{self.deep.key()}',) or tuple())
+        )
+        return '|'.join(sections)
+
+
+FULL_PROJECTION = Projection()
+
+
+def _names(values: Optional[Iterable[str]], allowed: Tuple[str, ...], kind: str) -> Tuple[str, ...]:
+    """_names"""
+
+    if values is None: return allowed
+    if isinstance(values, str) or not isinstance(values, (list, tuple)):
+        raise ValueError(f'Received invalid {kind} list: {values}.')
+
+    names = tuple((isinstance(value, str) and value.lower() or value for value in values))
+    for name in names:
+        if name not in allowed:
+            raise ValueError(f'Received invalid {kind}: {name}.')
+    return names
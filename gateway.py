@@ -12,12 +12,15 @@ if __name__ == '__main__':
     loop = aio.new_event_loop()
     aio.set_event_loop(loop)
 
+    shutdown = None
     try:
         gateway_coroutine = run_gateway(loop)
-        loop.run_until_complete(gateway_coroutine)
+        shutdown = loop.run_until_complete(gateway_coroutine)
         loop.run_forever()
     except KeyboardInterrupt:
         print("Keyboard interrupt detected. Stopping event loop.")
         loop.stop()
     finally:
+        if shutdown is not None:
+            loop.run_until_complete(shutdown())
         loop.close()
\ No newline at end of file
@@ -0,0 +1,14 @@
+from typing import Protocol, Optional, Callable, Awaitable
+
+from libs.securitytrails.client import RecordType, DnsHistoryData, BaseResponse
+
+
+class IDnsHistoryStore(Protocol):
+    """IDnsHistoryStore"""
+
+    async def history(self,
+        domain: str,
+        record_type: RecordType,
+        fetch: Callable[[Optional[str]], Awaitable[BaseResponse[DnsHistoryData]]]
+    ) -> Optional[DnsHistoryData]:
+        pass
\ No newline at end of file
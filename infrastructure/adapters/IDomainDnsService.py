@@ -4,6 +4,7 @@ from domain.Entities.dns import (
     CurrentDnsRow,
     HistoryDnsRow,
     DomainSummary,
+    SubdomainSummary,
     CurrentDnsTable,
     HistoryDnsTable,
 )
@@ -32,10 +33,18 @@ class IDomainDnsService(Protocol):
         hostname: Hostname,
         current: CurrentDnsTable,
         history: HistoryDnsTable,
-        subdomains: Tuple[SubDomain, ...]
+        subdomains: Tuple[SubDomain, ...],
+        missing: Tuple[str, ...]=tuple(),
+        deep: Tuple[SubdomainSummary, ...]=tuple()
     ) -> DomainSummary:
         pass
 
+    def new_subdomain_summary(self, *,
+        hostname: Hostname,
+        current: CurrentDnsTable
+    ) -> SubdomainSummary:
+        pass
+
     def new_current_dns_table(self, *,
         a: Optional[CurrentDnsRow[ARecord]]=None,
         aaaa: Optional[CurrentDnsRow[AAAARecord]]=None,
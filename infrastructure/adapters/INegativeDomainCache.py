@@ -0,0 +1,11 @@
+from typing import Protocol
+
+
+class INegativeDomainCache(Protocol):
+    """INegativeDomainCache"""
+
+    async def contains(self, domain: str) -> bool:
+        pass
+
+    async def add(self, domain: str) -> None:
+        pass
\ No newline at end of file
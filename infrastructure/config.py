@@ -81,6 +81,112 @@ class SecurityTrailsProviderConfig:
     sync_inaccuracy: int
 
 
+@dataclass
+class SecurityTrailsClientConfig:
+    """SecurityTrailsClientConfig"""
+
+    base_url: str
+    connections_limit: int
+    connections_per_host: int
+    keepalive_timeout: float
+    dns_cache_ttl: int
+    usage_timeout: float
+    domain_timeout: float
+    subdomains_timeout: float
+    history_timeout: float
+    rate_limit: float
+    rate_burst: int
+    max_in_flight: int
+    retry_attempts: int
+    retry_base_delay: float
+    retry_max_delay: float
+    single_flight: bool
+    cache_backend: str
+    cache_max_entries: int
+    cache_redis_db: int
+    cache_domain_ttl: int
+    cache_subdomains_ttl: int
+    cache_history_ttl: int
+    history_max_pages: int
+    history_page_concurrency: int
+    decoder: str
+    hedge: bool
+    hedge_percentile: float
+    hedge_min_samples: int
+    hedge_min_delay: float
+    hedge_max_extra_credits: int
+    hedge_budget_window: float
+    instrumentation: bool
+    usage_max_bytes: int
+    domain_max_bytes: int
+    subdomains_max_bytes: int
+    history_max_bytes: int
+
+
+@dataclass
+class SummaryCacheConfig:
+    """SummaryCacheConfig"""
+
+    is_enabled: bool
+    redis_db: int
+    fresh_ttl: int
+    stale_ttl: int
+    early_expiry_beta: float
+
+
+@dataclass
+class NegativeCacheConfig:
+    """NegativeCacheConfig"""
+
+    is_enabled: bool
+    redis_db: int
+    ttl: int
+    capacity: int
+    error_rate: float
+    max_error_rate: float
+    rebuild_interval: int
+
+
+@dataclass
+class OffloadConfig:
+    """OffloadConfig"""
+
+    is_enabled: bool
+    mode: str
+    workers: int
+    min_rows: int
+
+
+@dataclass
+class AnalysisJobsConfig:
+    """AnalysisJobsConfig"""
+
+    is_enabled: bool
+    redis_db: int
+    ttl: int
+    workers: int
+    queue_size: int
+
+
+@dataclass
+class DnsHistoryStoreConfig:
+    """DnsHistoryStoreConfig"""
+
+    is_enabled: bool
+    max_age: int
+
+
+@dataclass
+class ProgressRegistryConfig:
+    """ProgressRegistryConfig"""
+
+    is_enabled: bool
+    redis_db: int
+    lease_ttl: int
+    result_ttl: int
+    poll_interval: float
+
+
 @dataclass
 class ServiceGatewayConfig:
     """ServiceGatewayConfig"""
@@ -91,6 +197,9 @@ class ServiceGatewayConfig:
     producer_exchange: str
     producer_queue: str
     producer_routing_key: str
+    batch_concurrency: int
+    batch_max_domains: int
+    fast_reply: bool
 
 
 @dataclass
@@ -103,6 +212,13 @@ class Config:
     redis: RedisConfig
     securitytrails_gateway: SecurityTrailsGatewayConfig
     securitytrails_provider: SecurityTrailsProviderConfig
+    securitytrails_client: SecurityTrailsClientConfig
+    summary_cache: SummaryCacheConfig
+    progress_registry: ProgressRegistryConfig
+    dns_history_store: DnsHistoryStoreConfig
+    negative_cache: NegativeCacheConfig
+    offload: OffloadConfig
+    analysis_jobs: AnalysisJobsConfig
     service_gateway: ServiceGatewayConfig
 
 
@@ -195,6 +311,183 @@ def load_securitytrails_provider_config() -> SecurityTrailsProviderConfig:
         sync_inaccuracy=sync_inaccuracy
     )
 
+def load_securitytrails_client_config() -> SecurityTrailsClientConfig:
+    """load_securitytrails_client_config"""
+
+    base_url: str = os.environ.get('SECURITYTRAILS_BASE_URL', 'https://api.securitytrails.com/v1')
+    connections_limit: int = int(os.environ.get('SECURITYTRAILS_CONNECTIONS_LIMIT', 100))
+    connections_per_host: int = int(os.environ.get('SECURITYTRAILS_CONNECTIONS_PER_HOST', 20))
+    keepalive_timeout: float = float(os.environ.get('SECURITYTRAILS_KEEPALIVE_TIMEOUT', 30))
+    dns_cache_ttl: int = int(os.environ.get('SECURITYTRAILS_DNS_CACHE_TTL', 300))
+    usage_timeout: float = float(os.environ.get('SECURITYTRAILS_USAGE_TIMEOUT', 10))
+    domain_timeout: float = float(os.environ.get('SECURITYTRAILS_DOMAIN_TIMEOUT', 15))
+    subdomains_timeout: float = float(os.environ.get('SECURITYTRAILS_SUBDOMAINS_TIMEOUT', 30))
+    history_timeout: float = float(os.environ.get('SECURITYTRAILS_HISTORY_TIMEOUT', 30))
+    rate_limit: float = float(os.environ.get('SECURITYTRAILS_RATE_LIMIT', 0))
+    rate_burst: int = int(os.environ.get('SECURITYTRAILS_RATE_BURST', 1))
+    max_in_flight: int = int(os.environ.get('SECURITYTRAILS_MAX_IN_FLIGHT', 4))
+    retry_attempts: int = int(os.environ.get('SECURITYTRAILS_RETRY_ATTEMPTS', 3))
+    retry_base_delay: float = float(os.environ.get('SECURITYTRAILS_RETRY_BASE_DELAY', 0.5))
+    retry_max_delay: float = float(os.environ.get('SECURITYTRAILS_RETRY_MAX_DELAY', 10))
+    single_flight: bool = _boolean(os.environ.get('SECURITYTRAILS_SINGLE_FLIGHT', False))
+    cache_backend: str = os.environ.get('SECURITYTRAILS_CACHE_BACKEND', 'none')
+    cache_max_entries: int = int(os.environ.get('SECURITYTRAILS_CACHE_MAX_ENTRIES', 1024))
+    cache_redis_db: int = int(os.environ.get('SECURITYTRAILS_CACHE_REDIS_DB', 1))
+    cache_domain_ttl: int = int(os.environ.get('SECURITYTRAILS_CACHE_DOMAIN_TTL', 15 * 60))
+    cache_subdomains_ttl: int = int(os.environ.get('SECURITYTRAILS_CACHE_SUBDOMAINS_TTL', 6 * 60 * 60))
+    cache_history_ttl: int = int(os.environ.get('SECURITYTRAILS_CACHE_HISTORY_TTL', 24 * 60 * 60))
+    history_max_pages: int = int(os.environ.get('SECURITYTRAILS_HISTORY_MAX_PAGES', 10))
+    history_page_concurrency: int = int(os.environ.get('SECURITYTRAILS_HISTORY_PAGE_CONCURRENCY', 3))
+    decoder: str = os.environ.get('SECURITYTRAILS_DECODER', 'json')
+    hedge: bool = _boolean(os.environ.get('SECURITYTRAILS_HEDGE', False))
+    hedge_percentile: float = float(os.environ.get('SECURITYTRAILS_HEDGE_PERCENTILE', 0.95))
+    hedge_min_samples: int = int(os.environ.get('SECURITYTRAILS_HEDGE_MIN_SAMPLES', 20))
+    hedge_min_delay: float = float(os.environ.get('SECURITYTRAILS_HEDGE_MIN_DELAY', 0.05))
+    hedge_max_extra_credits: int = int(os.environ.get('SECURITYTRAILS_HEDGE_MAX_EXTRA_CREDITS', 100))
+    hedge_budget_window: float = float(os.environ.get('SECURITYTRAILS_HEDGE_BUDGET_WINDOW', 3600))
+    instrumentation: bool = _boolean(os.environ.get('SECURITYTRAILS_INSTRUMENTATION', False))
+    usage_max_bytes: int = int(os.environ.get('SECURITYTRAILS_USAGE_MAX_BYTES', 64 * 1024))
+    domain_max_bytes: int = int(os.environ.get('SECURITYTRAILS_DOMAIN_MAX_BYTES', 4 * 1024 * 1024))
+    subdomains_max_bytes: int = int(os.environ.get('SECURITYTRAILS_SUBDOMAINS_MAX_BYTES', 32 * 1024 * 1024))
+    history_max_bytes: int = int(os.environ.get('SECURITYTRAILS_HISTORY_MAX_BYTES', 8 * 1024 * 1024))
+
+    return SecurityTrailsClientConfig(
+        base_url=base_url,
+        connections_limit=connections_limit,
+        connections_per_host=connections_per_host,
+        keepalive_timeout=keepalive_timeout,
+        dns_cache_ttl=dns_cache_ttl,
+        usage_timeout=usage_timeout,
+        domain_timeout=domain_timeout,
+        subdomains_timeout=subdomains_timeout,
+        history_timeout=history_timeout,
+        rate_limit=rate_limit,
+        rate_burst=rate_burst,
+        max_in_flight=max_in_flight,
+        retry_attempts=retry_attempts,
+        retry_base_delay=retry_base_delay,
+        retry_max_delay=retry_max_delay,
+        single_flight=single_flight,
+        cache_backend=cache_backend,
+        cache_max_entries=cache_max_entries,
+        cache_redis_db=cache_redis_db,
+        cache_domain_ttl=cache_domain_ttl,
+        cache_subdomains_ttl=cache_subdomains_ttl,
+        cache_history_ttl=cache_history_ttl,
+        history_max_pages=history_max_pages,
+        history_page_concurrency=history_page_concurrency,
+        decoder=decoder,
+        hedge=hedge,
+        hedge_percentile=hedge_percentile,
+        hedge_min_samples=hedge_min_samples,
+        hedge_min_delay=hedge_min_delay,
+        hedge_max_extra_credits=hedge_max_extra_credits,
+        hedge_budget_window=hedge_budget_window,
+        instrumentation=instrumentation,
+        usage_max_bytes=usage_max_bytes,
+        domain_max_bytes=domain_max_bytes,
+        subdomains_max_bytes=subdomains_max_bytes,
+        history_max_bytes=history_max_bytes
+    )
+
+def load_summary_cache_config() -> SummaryCacheConfig:
+    """load_summary_cache_config"""
+
+    is_enabled: bool = _boolean(os.environ.get('SUMMARY_CACHE_ENABLED', False))
+    redis_db: int = int(os.environ.get('SUMMARY_CACHE_REDIS_DB', 2))
+    fresh_ttl: int = int(os.environ.get('SUMMARY_CACHE_FRESH_TTL', 10 * 60))
+    stale_ttl: int = int(os.environ.get('SUMMARY_CACHE_STALE_TTL', 24 * 60 * 60))
+    early_expiry_beta: float = float(os.environ.get('SUMMARY_CACHE_EARLY_EXPIRY_BETA', 1.0))
+
+    return SummaryCacheConfig(
+        is_enabled=is_enabled,
+        redis_db=redis_db,
+        fresh_ttl=fresh_ttl,
+        stale_ttl=stale_ttl,
+        early_expiry_beta=early_expiry_beta
+    )
+
+def load_progress_registry_config() -> ProgressRegistryConfig:
+    """load_progress_registry_config"""
+
+    is_enabled: bool = _boolean(os.environ.get('PROGRESS_REGISTRY_ENABLED', False))
+    redis_db: int = int(os.environ.get('PROGRESS_REGISTRY_REDIS_DB', 3))
+    lease_ttl: int = int(os.environ.get('PROGRESS_REGISTRY_LEASE_TTL', 30))
+    result_ttl: int = int(os.environ.get('PROGRESS_REGISTRY_RESULT_TTL', 60))
+    poll_interval: float = float(os.environ.get('PROGRESS_REGISTRY_POLL_INTERVAL', 0.25))
+
+    return ProgressRegistryConfig(
+        is_enabled=is_enabled,
+        redis_db=redis_db,
+        lease_ttl=lease_ttl,
+        result_ttl=result_ttl,
+        poll_interval=poll_interval
+    )
+
+def load_dns_history_store_config() -> DnsHistoryStoreConfig:
+    """load_dns_history_store_config"""
+
+    is_enabled: bool = _boolean(os.environ.get('DNS_HISTORY_STORE_ENABLED', False))
+    max_age: int = int(os.environ.get('DNS_HISTORY_STORE_MAX_AGE', 86400))
+
+    return DnsHistoryStoreConfig(
+        is_enabled=is_enabled,
+        max_age=max_age
+    )
+
+def load_negative_cache_config() -> NegativeCacheConfig:
+    """load_negative_cache_config"""
+
+    is_enabled: bool = _boolean(os.environ.get('NEGATIVE_CACHE_ENABLED', False))
+    redis_db: int = int(os.environ.get('NEGATIVE_CACHE_REDIS_DB', 4))
+    ttl: int = int(os.environ.get('NEGATIVE_CACHE_TTL', 24 * 60 * 60))
+    capacity: int = int(os.environ.get('NEGATIVE_CACHE_CAPACITY', 100000))
+    error_rate: float = float(os.environ.get('NEGATIVE_CACHE_ERROR_RATE', 0.001))
+    max_error_rate: float = float(os.environ.get('NEGATIVE_CACHE_MAX_ERROR_RATE', 0.01))
+    rebuild_interval: int = int(os.environ.get('NEGATIVE_CACHE_REBUILD_INTERVAL', 5 * 60))
+
+    return NegativeCacheConfig(
+        is_enabled=is_enabled,
+        redis_db=redis_db,
+        ttl=ttl,
+        capacity=capacity,
+        error_rate=error_rate,
+        max_error_rate=max_error_rate,
+        rebuild_interval=rebuild_interval
+    )
+
+def load_offload_config() -> OffloadConfig:
+    """load_offload_config"""
+
+    is_enabled: bool = _boolean(os.environ.get('OFFLOAD_ENABLED', False))
+    mode: str = os.environ.get('OFFLOAD_MODE', 'process')
+    workers: int = int(os.environ.get('OFFLOAD_WORKERS', 2))
+    min_rows: int = int(os.environ.get('OFFLOAD_MIN_ROWS', 200))
+
+    return OffloadConfig(
+        is_enabled=is_enabled,
+        mode=mode,
+        workers=workers,
+        min_rows=min_rows
+    )
+
+def load_analysis_jobs_config() -> AnalysisJobsConfig:
+    """load_analysis_jobs_config"""
+
+    is_enabled: bool = _boolean(os.environ.get('ANALYSIS_JOBS_ENABLED', False))
+    redis_db: int = int(os.environ.get('ANALYSIS_JOBS_REDIS_DB', 5))
+    ttl: int = int(os.environ.get('ANALYSIS_JOBS_TTL', 60 * 60))
+    workers: int = int(os.environ.get('ANALYSIS_JOBS_WORKERS', 4))
+    queue_size: int = int(os.environ.get('ANALYSIS_JOBS_QUEUE_SIZE', 1000))
+
+    return AnalysisJobsConfig(
+        is_enabled=is_enabled,
+        redis_db=redis_db,
+        ttl=ttl,
+        workers=workers,
+        queue_size=queue_size
+    )
+
 def load_service_gateway_config() -> ServiceGatewayConfig:
     """load_service_gateway_config"""
 
@@ -204,6 +497,9 @@ def load_service_gateway_config() -> ServiceGatewayConfig:
     producer_exchange: str = os.environ.get('SERVICE_GATEWAY_PRODUCER_EXCHANGE', 'exchange')
     producer_queue: str = os.environ.get('SERVICE_GATEWAY_PRODUCER_QUEUE', 'aggregator.res')
     producer_routing_key: str = os.environ.get('SERVICE_GATEWAY_PRODUCER_ROUTING_KEY', 'aggregator.res')
+    batch_concurrency: int = int(os.environ.get('SERVICE_GATEWAY_BATCH_CONCURRENCY', 4))
+    batch_max_domains: int = int(os.environ.get('SERVICE_GATEWAY_BATCH_MAX_DOMAINS', 1000))
+    fast_reply: bool = _boolean(os.environ.get('SERVICE_GATEWAY_FAST_REPLY', False))
 
     return ServiceGatewayConfig(
         consumer_exchange=consumer_exchange,
@@ -211,7 +507,10 @@ def load_service_gateway_config() -> ServiceGatewayConfig:
         consumer_routing_key=consumer_routing_key,
         producer_exchange=producer_exchange,
         producer_queue=producer_queue,
-        producer_routing_key=producer_routing_key
+        producer_routing_key=producer_routing_key,
+        batch_concurrency=batch_concurrency,
+        batch_max_domains=batch_max_domains,
+        fast_reply=fast_reply
     )
 
 def load() -> Config:
@@ -223,6 +522,13 @@ def load() -> Config:
     redis = load_redis_config()
     securitytrails_gateway = load_securitytrails_gateway_config()
     securitytrails_provider = load_securitytrails_provider_config()
+    securitytrails_client = load_securitytrails_client_config()
+    summary_cache = load_summary_cache_config()
+    progress_registry = load_progress_registry_config()
+    dns_history_store = load_dns_history_store_config()
+    negative_cache = load_negative_cache_config()
+    offload = load_offload_config()
+    analysis_jobs = load_analysis_jobs_config()
     service_gateway = load_service_gateway_config()
 
     return Config(
@@ -232,5 +538,12 @@ def load() -> Config:
         redis=redis,
         securitytrails_gateway=securitytrails_gateway,
         securitytrails_provider=securitytrails_provider,
+        securitytrails_client=securitytrails_client,
+        summary_cache=summary_cache,
+        progress_registry=progress_registry,
+        dns_history_store=dns_history_store,
+        negative_cache=negative_cache,
+        offload=offload,
+        analysis_jobs=analysis_jobs,
         service_gateway=service_gateway
     )
\ No newline at end of file
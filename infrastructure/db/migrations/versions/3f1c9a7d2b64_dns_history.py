@@ -0,0 +1,52 @@
+"""dns history
+
+Revision ID: 3f1c9a7d2b64
+Revises: 
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7d2b64'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'dns_history_record',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('domain', sa.String(length=253), nullable=False),
+        sa.Column('record_type', sa.String(length=4), nullable=False),
+        sa.Column('first_seen', sa.String(length=10), nullable=False),
+        sa.Column('last_seen', sa.String(length=10), nullable=False),
+        sa.Column('organizations', postgresql.ARRAY(sa.String()), nullable=False),
+        sa.Column('values', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('digest', sa.String(length=32), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('domain', 'record_type', 'first_seen', 'digest', name='uq_dns_history_record_period')
+    )
+    op.create_index(
+        'ix_dns_history_record_last_seen', 'dns_history_record', ['domain', 'record_type', 'last_seen'], unique=False
+    )
+    op.create_table(
+        'dns_history_sync',
+        sa.Column('domain', sa.String(length=253), nullable=False),
+        sa.Column('record_type', sa.String(length=4), nullable=False),
+        sa.Column('synced_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('domain', 'record_type')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('dns_history_sync')
+    op.drop_index('ix_dns_history_record_last_seen', table_name='dns_history_record')
+    op.drop_table('dns_history_record')
@@ -1 +1 @@
-from . import securitytrails
\ No newline at end of file
+from . import securitytrails, dns
\ No newline at end of file
@@ -0,0 +1,66 @@
+from sqlalchemy.sql import func
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy import (
+    BigInteger,
+    String,
+    DateTime,
+    Index,
+    UniqueConstraint
+)
+
+from infrastructure.db.base import BaseModel
+
+
+class DnsHistoryRecordModel(BaseModel):
+    """
+    A period of a history record type, identified by its `first_seen` and the `digest` of its values.
+    `values` keeps the records as the SecurityTrails API returned them.
+    """
+
+    __tablename__ = 'dns_history_record'
+    __table_args__ = (
+        UniqueConstraint('domain', 'record_type', 'first_seen', 'digest', name='uq_dns_history_record_period'),
+        Index('ix_dns_history_record_last_seen', 'domain', 'record_type', 'last_seen')
+    )
+
+    id: Mapped[int] = mapped_column(
+        BigInteger, primary_key=True, autoincrement=True
+    )
+    domain: Mapped[str] = mapped_column(
+        String(253), nullable=False
+    )
+    record_type: Mapped[str] = mapped_column(
+        String(4), nullable=False
+    )
+    first_seen: Mapped[str] = mapped_column(
+        String(10), nullable=False
+    )
+    last_seen: Mapped[str] = mapped_column(
+        String(10), nullable=False
+    )
+    organizations: Mapped[list] = mapped_column(
+        ARRAY(String), nullable=False
+    )
+    values: Mapped[list] = mapped_column(
+        JSONB, nullable=False
+    )
+    digest: Mapped[str] = mapped_column(
+        String(32), nullable=False
+    )
+
+
+class DnsHistorySyncModel(BaseModel):
+    """When the history of a record type was last read from the SecurityTrails API."""
+
+    __tablename__ = 'dns_history_sync'
+
+    domain: Mapped[str] = mapped_column(
+        String(253), primary_key=True
+    )
+    record_type: Mapped[str] = mapped_column(
+        String(4), primary_key=True
+    )
+    synced_at: Mapped[DateTime] = mapped_column(
+        DateTime, nullable=False, default=func.now()
+    )
@@ -0,0 +1,98 @@
+import logging
+
+import asyncio as aio
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing import get_context
+from time import perf_counter
+
+from typing import Any, Callable, Tuple, TypeVar
+
+
+logger = logging.getLogger('Offloader')
+
+
+THREAD_MODE = 'thread'
+PROCESS_MODE = 'process'
+OFFLOAD_MODES = (THREAD_MODE, PROCESS_MODE)
+
+T = TypeVar('T')
+
+
+def _timed(job: Callable[..., T], *args: Any) -> Tuple[float, T]:
+    """Runs the job in the pool and times it there, module level so process pools can pickle it."""
+
+    started = perf_counter()
+    result = job(*args)
+    return perf_counter() - started, result
+
+
+@dataclass
+class OffloadStats:
+    """
+    OffloadStats, `blocked` seconds the jobs run inline held the event loop, `avoided` seconds the
+    offloaded ones ran in the pool, the loop would have been blocked as long.
+    """
+
+    inline: int = 0
+    offloaded: int = 0
+    blocked: float = 0.0
+    avoided: float = 0.0
+
+
+class Offloader:
+    """
+    Runs CPU-heavy jobs of at least `min_size` in a thread or process pool of `workers`, smaller ones inline
+    where handing them over would cost more than it saves. Process pools are spawned, jobs and their
+    arguments must pickle: module level functions over builtins or plain dataclasses. Threads need no
+    pickling but share the GIL, the loop is no longer blocked for a whole job yet still competes for it.
+    """
+
+    def __init__(self, *, mode: str, workers: int, min_size: int):
+        if mode not in OFFLOAD_MODES: raise ValueError(f':mode should be one of {", ".join(OFFLOAD_MODES)}.')
+
+        self.__mode = mode
+        self.__min_size = min_size
+        self.__executor: Executor
+        if mode == PROCESS_MODE:
+            self.__executor = ProcessPoolExecutor(workers, mp_context=get_context('spawn'))
+        else:
+            self.__executor = ThreadPoolExecutor(workers, thread_name_prefix='offload')
+        self.__stats = OffloadStats()
+
+    async def run(self, size: int, job: Callable[..., T], *args: Any) -> T:
+        """Run the job, in the pool when `size` reaches `min_size`."""
+
+        if size < self.__min_size:
+            return self.__inline(job, *args)
+
+        try:
+            elapsed, result = await aio.get_running_loop().run_in_executor(self.__executor, _timed, job, *args)
+        except BrokenProcessPool:
+            logger.exception('Process pool is broken, running the job inline.')
+            return self.__inline(job, *args)
+
+        self.__stats.offloaded += 1
+        self.__stats.avoided += elapsed
+        logger.debug(f'Offloaded a job of size {size} to the {self.__mode} pool, it ran for {elapsed:.3f}s.')
+        return result
+
+    def shutdown(self) -> None:
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+        stats = self.__stats
+        logger.info((
+            f'Offloaded {stats.offloaded} jobs, {stats.avoided:.3f}s of loop blocking avoided; '
+            f'{stats.inline} ran inline for {stats.blocked:.3f}s.'
+        ))
+
+    @property
+    def stats(self) -> OffloadStats:
+        return self.__stats
+
+    def __inline(self, job: Callable[..., T], *args: Any) -> T:
+        elapsed, result = _timed(job, *args)
+        self.__stats.inline += 1
+        self.__stats.blocked += elapsed
+        return result
\ No newline at end of file
@@ -1,9 +1,12 @@
 from  asyncio_redis import Connection
+from asyncio_redis.encoders import BaseEncoder
+
+from typing import Optional
 
 from infrastructure.config import RedisConfig
 
 
-async def get_redis_factory(config: RedisConfig, db: int=0):
+async def get_redis_factory(config: RedisConfig, db: int=0, encoder: Optional[BaseEncoder]=None):
     """get_redis_factory"""
     
     
@@ -12,5 +15,6 @@ async def get_redis_factory(config: RedisConfig, db: int=0):
         port=config.port,
         password=config.password,
         db=db,
+        encoder=encoder,
         auto_reconnect=True
     )
\ No newline at end of file
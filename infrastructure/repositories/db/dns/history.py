@@ -0,0 +1,135 @@
+from hashlib import md5
+from json import dumps
+from datetime import timedelta
+
+from typing import Optional, Tuple, Dict
+
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from libs.securitytrails.client import RecordType
+from libs.securitytrails.types.records import HistoryRecordInfo
+from libs.securitytrails.serialization import TYPE_BY_ENUM, FIELDS_BY_TYPE
+
+from infrastructure.db.models.dns import DnsHistoryRecordModel, DnsHistorySyncModel
+
+
+def _dump_values(info: HistoryRecordInfo) -> list:
+    """Records in the positional form of `libs.securitytrails.serialization`."""
+
+    return [
+        [getattr(value, name) for name in FIELDS_BY_TYPE[type(value)]]
+        for value in info.values
+    ]
+
+def _map_record(record: DnsHistoryRecordModel, record_type: RecordType) -> HistoryRecordInfo:
+    """_map_record"""
+
+    value_type = TYPE_BY_ENUM[record_type]
+    return HistoryRecordInfo(
+        first_seen=record.first_seen,
+        last_seen=record.last_seen,
+        organizations=tuple(record.organizations),
+        values=tuple((value_type(*value) for value in record.values))
+    )
+
+def _periods(domain: str, record_type: RecordType, records: Tuple[HistoryRecordInfo, ...]) -> list:
+    """Rows to upsert, one per period, a period listed twice keeps its latest `last_seen`."""
+
+    periods: Dict[Tuple[str, str], dict] = {}
+    for info in records:
+        values = _dump_values(info)
+        digest = md5(dumps(values, separators=(',', ':')).encode()).hexdigest()
+        known = periods.get((info.first_seen, digest))
+        if known is not None and known['last_seen'] >= info.last_seen: continue
+
+        periods[(info.first_seen, digest)] = {
+            'domain': domain,
+            'record_type': record_type.value,
+            'first_seen': info.first_seen,
+            'last_seen': info.last_seen,
+            'organizations': list(info.organizations),
+            'values': values,
+            'digest': digest
+        }
+    return list(periods.values())
+
+
+class DnsHistoryRepository:
+    """DnsHistoryRepository, stored periods never change but for the `last_seen` of the current one."""
+
+    def __init__(self, session: AsyncSession):
+        self.__session = session
+
+    async def is_fresh(self, domain: str, record_type: RecordType, max_age: float) -> bool:
+        query = (
+            select(DnsHistorySyncModel.synced_at)
+            .where(
+                DnsHistorySyncModel.domain == domain,
+                DnsHistorySyncModel.record_type == record_type.value,
+                DnsHistorySyncModel.synced_at > func.now() - timedelta(seconds=max_age)
+            )
+        )
+        result = await self.__session.execute(query)
+        return result.scalar_one_or_none() is not None
+
+    async def latest(self, domain: str, record_type: RecordType) -> Optional[str]:
+        """The latest `last_seen` stored, periods seen before it are already known."""
+
+        query = (
+            select(func.max(DnsHistoryRecordModel.last_seen))
+            .where(
+                DnsHistoryRecordModel.domain == domain,
+                DnsHistoryRecordModel.record_type == record_type.value
+            )
+        )
+        result = await self.__session.execute(query)
+        return result.scalar_one_or_none()
+
+    async def merge(self, domain: str, record_type: RecordType, records: Tuple[HistoryRecordInfo, ...]) -> int:
+        """Insert the new periods, extend the known ones and mark the record type synced."""
+
+        periods = _periods(domain, record_type, records)
+        if periods:
+            query = insert(DnsHistoryRecordModel).values(periods)
+            query = query.on_conflict_do_update(
+                constraint='uq_dns_history_record_period',
+                set_={
+                    'last_seen': func.greatest(DnsHistoryRecordModel.last_seen, query.excluded.last_seen),
+                    'organizations': query.excluded.organizations
+                }
+            )
+            await self.__session.execute(query)
+
+        synced = insert(DnsHistorySyncModel).values(domain=domain, record_type=record_type.value, synced_at=func.now())
+        synced = synced.on_conflict_do_update(
+            index_elements=[DnsHistorySyncModel.domain, DnsHistorySyncModel.record_type],
+            set_={ 'synced_at': synced.excluded.synced_at }
+        )
+        await self.__session.execute(synced)
+        return len(periods)
+
+    async def records(self,
+        domain: str,
+        record_type: RecordType,
+        since: Optional[str]=None
+    ) -> Tuple[HistoryRecordInfo, ...]:
+        """Periods newest first, with `since` (YYYY-MM-DD) only those last seen on or after it."""
+
+        query = (
+            select(DnsHistoryRecordModel)
+            .where(
+                DnsHistoryRecordModel.domain == domain,
+                DnsHistoryRecordModel.record_type == record_type.value
+            )
+            .order_by(DnsHistoryRecordModel.last_seen.desc(), DnsHistoryRecordModel.first_seen.desc())
+        )
+        if since is not None:
+            query = query.where(DnsHistoryRecordModel.last_seen >= since)
+
+        result = await self.__session.execute(query)
+        return tuple((
+            _map_record(record, record_type)
+            for record in result.scalars().all()
+        ))
@@ -0,0 +1,94 @@
+import logging
+
+from dataclasses import dataclass
+
+from typing import Optional, Callable, Awaitable
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+
+from libs.securitytrails.client import RecordType, DnsHistoryData, BaseResponse, BaseStatus
+
+from .history import DnsHistoryRepository
+
+
+logger = logging.getLogger('DnsHistoryStore')
+
+
+THistoryFetch = Callable[[Optional[str]], Awaitable[BaseResponse[DnsHistoryData]]]
+
+
+@dataclass
+class DnsHistoryStoreStats:
+    """DnsHistoryStoreStats"""
+
+    hits: int = 0
+    refreshes: int = 0
+    merged: int = 0
+    partial: int = 0
+    failures: int = 0
+
+
+class DnsHistoryStore:
+    """
+    DNS history kept in Postgres per domain and record type, served newest first from the
+    `(domain, record_type, last_seen)` index. Once the stored history is older than `max_age` seconds
+    it is refreshed with the periods last seen since the latest stored one, the API stops paging there,
+    and only those are merged. A partial read is served as is and never stored, the record type stays
+    stale so the next analysis reads it again. Database failures fall back to the full history from the API.
+    """
+
+    def __init__(self, *,
+        session_factory: async_sessionmaker[AsyncSession],
+        max_age: int
+    ):
+        self.__session_factory = session_factory
+        self.__max_age = max_age
+        self.__stats = DnsHistoryStoreStats()
+
+    async def history(self, domain: str, record_type: RecordType, fetch: THistoryFetch) -> Optional[DnsHistoryData]:
+        """The stored history, refreshed first when stale, `fetch` reads the API from its `stop_before` on."""
+
+        try:
+            async with self.__session_factory() as session:
+                repository = DnsHistoryRepository(session)
+                if await repository.is_fresh(domain, record_type, self.__max_age):
+                    self.__stats.hits += 1
+                    return DnsHistoryData(type=record_type, records=await repository.records(domain, record_type))
+                latest = await repository.latest(domain, record_type)
+        except SQLAlchemyError as exp:
+            logger.exception(f'Failed to read stored history: {domain} {record_type.value}.')
+            self.__stats.failures += 1
+            return (await fetch(None)).response
+
+        # No connection is held while the API is read.
+        self.__stats.refreshes += 1
+        response = await fetch(latest)
+        data = response.response
+
+        if response.status is BaseStatus.PARTIAL:
+            # Merging it would mark the record type synced and move `latest` past the pages it misses.
+            logger.warning(f'Not storing a partial history: {domain} {record_type.value}.')
+            self.__stats.partial += 1
+            if latest is None: return data
+            data = None
+
+        try:
+            async with self.__session_factory() as session:
+                repository = DnsHistoryRepository(session)
+                if data is not None:
+                    self.__stats.merged += await repository.merge(domain, record_type, data.records)
+                    await session.commit()
+                elif latest is None:
+                    return None
+                return DnsHistoryData(type=record_type, records=await repository.records(domain, record_type))
+        except SQLAlchemyError as exp:
+            logger.exception(f'Failed to merge history: {domain} {record_type.value}.')
+            self.__stats.failures += 1
+            # Without a stored history the data read is already the full one.
+            if latest is None: return data
+            return (await fetch(None)).response
+
+    @property
+    def stats(self) -> DnsHistoryStoreStats:
+        return self.__stats
@@ -59,6 +59,16 @@ class StrBytesExpiryStorage(Generic[T]):
             logger.exception('Failed to remove expired items. Error: {e}')
         return []
     
+    async def alive(self) -> List[T]:
+        boundary_min = ZScoreBoundary(time())
+        boundary_max = ZScoreBoundary('+inf')
+        try:
+            items = await self.__client.zrangebyscore(self.__key, boundary_min, boundary_max)
+            return [await item for item in items]
+        except Error as exp:
+            logger.exception('Failed to list items not expired.')
+        return []
+
     async def all_alive(self) -> int:
         boundary_min = ZScoreBoundary(time())
         boundary_max = ZScoreBoundary('+inf')
@@ -0,0 +1,45 @@
+import logging
+import zlib
+
+from asyncio_redis import RedisProtocol, Error
+
+from typing import Optional
+
+
+logger = logging.getLogger('AnalysisJobStore')
+
+
+class AnalysisJobStore:
+    """
+    Compressed state of the analysis jobs in Redis, the client has to use `BytesEncoder`. A job holds the JSON
+    body `get_analysis_result` replies with, every write keeps it for `ttl` seconds from then on.
+    Redis failures are logged, a failed write reports False and a failed read looks like an unknown job.
+    """
+
+    def __init__(self, *,
+        client: RedisProtocol,
+        ttl: int,
+        prefix: str='jobs:'
+    ):
+        self.__client = client
+        self.__ttl = ttl
+        self.__prefix = prefix
+
+    async def put(self, job_id: str, body: bytes) -> bool:
+        try:
+            await self.__client.set(self.__key(job_id), zlib.compress(body), expire=self.__ttl)
+        except Error as exp:
+            logger.exception(f'Failed to write job: {job_id}.')
+            return False
+        return True
+
+    async def get(self, job_id: str) -> Optional[bytes]:
+        try:
+            raw = await self.__client.get(self.__key(job_id))
+            return raw is not None and zlib.decompress(raw) or None
+        except (Error, zlib.error) as exp:
+            logger.exception(f'Failed to read job: {job_id}.')
+        return None
+
+    def __key(self, job_id: str) -> bytes:
+        return f'{self.__prefix}{job_id}'.encode()
\ No newline at end of file
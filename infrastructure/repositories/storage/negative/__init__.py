@@ -0,0 +1,156 @@
+import logging
+
+import asyncio as aio
+
+from dataclasses import dataclass
+
+from typing import List, Optional, Set
+
+from utils.bloom_filter import BloomFilter
+from utils.cancel_tasks import cancel_task
+
+from infrastructure.repositories.storage.bytes import StrBytesExpiryStorage
+
+
+logger = logging.getLogger('NegativeDomainCache')
+
+
+# Too few negative lookups say nothing about the false positive rate.
+MIN_FALSE_POSITIVE_SAMPLES = 100
+
+
+@dataclass
+class NegativeCacheStats:
+    """NegativeCacheStats, `filtered` lookups were answered by the Bloom filter alone."""
+
+    lookups: int = 0
+    filtered: int = 0
+    hits: int = 0
+    false_positives: int = 0
+    added: int = 0
+    rebuilds: int = 0
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Share of the lookups of unknown domains the Bloom filter let through to Redis."""
+
+        negatives = self.filtered + self.false_positives
+        return negatives and self.false_positives / negatives or 0.0
+
+
+class NegativeDomainCache:
+    """
+    Domains the SecurityTrails API knows nothing about or rejects, kept for `ttl` seconds in a Redis sorted set
+    and mirrored by an in-process Bloom filter, so lookups of other domains never reach Redis. The filter can
+    not forget expired domains nor see the ones other replicas add, it is rebuilt from the set every
+    `rebuild_interval` seconds and as soon as either the false positive rate its fill implies or the one
+    measured since the last rebuild exceeds `max_error_rate`.
+    """
+
+    def __init__(self, *,
+        storage: StrBytesExpiryStorage[str],
+        ttl: int,
+        capacity: int,
+        error_rate: float,
+        max_error_rate: float,
+        rebuild_interval: int
+    ):
+        if max_error_rate < error_rate: raise ValueError(':max_error_rate should not be less then :error_rate.')
+
+        self.__storage = storage
+        self.__ttl = ttl
+        self.__capacity = capacity
+        self.__error_rate = error_rate
+        self.__max_error_rate = max_error_rate
+        self.__rebuild_interval = rebuild_interval
+        self.__filter = BloomFilter(capacity, error_rate)
+        self.__window = NegativeCacheStats()
+        self.__stats = NegativeCacheStats()
+        self.__added_while_rebuilding: List[Set[str]] = []
+        self.__rebuilding: Optional[aio.Task] = None
+        self.__rebuilder: Optional[aio.Task] = None
+
+    async def start(self) -> None:
+        await self.rebuild()
+        if self.__rebuilder is None:
+            self.__rebuilder = aio.create_task(self.__rebuild_forever())
+
+    async def contains(self, domain: str) -> bool:
+        self.__count('lookups')
+        if domain not in self.__filter:
+            self.__count('filtered')
+            return False
+
+        if await self.__storage.exists(domain):
+            self.__count('hits')
+            return True
+
+        self.__count('false_positives')
+        window = self.__window
+        is_measured = window.filtered + window.false_positives >= MIN_FALSE_POSITIVE_SAMPLES
+        if is_measured and window.false_positive_rate > self.__max_error_rate:
+            logger.info(f'Measured false positive rate {window.false_positive_rate:.4f}, rebuilding.')
+            self.__schedule_rebuild()
+        return False
+
+    async def add(self, domain: str) -> None:
+        self.__filter.add(domain)
+        for added in self.__added_while_rebuilding:
+            added.add(domain)
+        await self.__storage.add(domain, ttl=self.__ttl)
+        self.__count('added')
+
+        if self.__filter.expected_error_rate > self.__max_error_rate:
+            logger.info(f'Bloom filter holds {self.__filter.count} domains, rebuilding.')
+            self.__schedule_rebuild()
+
+    async def rebuild(self) -> None:
+        """Rebuild the filter from the domains alive in Redis, sized for twice as many when they outgrow it."""
+
+        # Domains added while Redis is read may be missing from the snapshot, they are replayed before the swap.
+        added: Set[str] = set()
+        self.__added_while_rebuilding.append(added)
+        try:
+            await self.__storage.remove_expired()
+            domains = await self.__storage.alive()
+        finally:
+            self.__added_while_rebuilding.remove(added)
+
+        bloom_filter = BloomFilter(max(self.__capacity, 2 * len(domains)), self.__error_rate)
+        for domain in (*domains, *added):
+            bloom_filter.add(domain)
+
+        self.__filter = bloom_filter
+        self.__window = NegativeCacheStats()
+        self.__stats.rebuilds += 1
+        logger.debug(f'Bloom filter rebuilt with {len(domains)} domains, capacity {bloom_filter.capacity}.')
+
+    async def shutdown(self) -> None:
+        for task in (self.__rebuilder, self.__rebuilding):
+            if task is not None:
+                await cancel_task(task)
+        self.__rebuilder = self.__rebuilding = None
+
+    @property
+    def stats(self) -> NegativeCacheStats:
+        return self.__stats
+
+    def __count(self, name: str) -> None:
+        for stats in (self.__stats, self.__window):
+            setattr(stats, name, getattr(stats, name) + 1)
+
+    def __schedule_rebuild(self) -> None:
+        if self.__rebuilding is not None and not self.__rebuilding.done(): return
+
+        self.__rebuilding = aio.create_task(self.__try_rebuild())
+
+    async def __try_rebuild(self) -> None:
+        try:
+            await self.rebuild()
+        except Exception as exp:
+            logger.exception('Failed to rebuild the Bloom filter.')
+
+    async def __rebuild_forever(self) -> None:
+        while True:
+            await aio.sleep(self.__rebuild_interval)
+            await self.__try_rebuild()
\ No newline at end of file
@@ -0,0 +1,266 @@
+import logging
+import zlib
+
+import asyncio as aio
+
+from asyncio_redis import RedisProtocol, Error
+from asyncio_redis.protocol import Script
+
+from dataclasses import dataclass, asdict
+from json import dumps, loads
+from os import getpid
+from socket import gethostname
+from uuid import uuid4
+
+from typing import Optional, Callable, Awaitable, Dict, Any
+
+from utils.cancel_tasks import cancel_task, cancel_all
+
+from application.Dto.dns import DomainSummary
+from application.Dto.mappers.dns import map_dict_to_summary
+
+from infrastructure.repositories.storage.set import AsyncSetStorage
+
+
+logger = logging.getLogger('DomainProgressRegistry')
+
+
+# Extends the lease only while this replica still owns it, one that expired and was taken over is left alone.
+RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+@dataclass
+class ProgressRegistryStats:
+    """ProgressRegistryStats"""
+
+    led: int = 0
+    waited: int = 0
+    taken_over: int = 0
+    gave_up: int = 0
+    swept: int = 0
+
+
+class DomainProgressRegistry:
+    """
+    Tracks the domains being analyzed across replicas, the client has to use `BytesEncoder`.
+    The replica analyzing a domain holds its lease key (set only if absent, with `lease_ttl`) and renews
+    it while the analysis runs, the domain itself is a member of the in-progress set. Other replicas poll
+    the result key instead of analyzing the domain again. A crashed replica stops renewing, its lease
+    expires and a waiting replica takes the analysis over, stale set members are swept periodically.
+    A replica waits at most `lease_ttl` seconds or until the request deadline, then analyzes the domain
+    locally. Redis failures fall back to analyzing the domain locally.
+    """
+
+    def __init__(self, *,
+        client: RedisProtocol,
+        lease_ttl: int,
+        result_ttl: int,
+        poll_interval: float=0.25,
+        prefix: str='progress:'
+    ):
+        if lease_ttl < 3: raise ValueError(':lease_ttl should be at least 3 seconds.')
+
+        self.__client = client
+        self.__lease_ttl = lease_ttl
+        self.__result_ttl = result_ttl
+        self.__poll_interval = poll_interval
+        self.__prefix = prefix
+        self.__storage: AsyncSetStorage[bytes] = AsyncSetStorage(client=client, key=f'{prefix}domains'.encode())
+        self.__owner = f'{gethostname()}:{getpid()}:{uuid4().hex}'.encode()
+        self.__leases: Dict[str, aio.Task] = {}
+        self.__scripts: Dict[str, Script] = {}
+        self.__sweeper: Optional[aio.Task] = None
+        self.__stats = ProgressRegistryStats()
+
+    def start(self) -> None:
+        if self.__sweeper is None:
+            self.__sweeper = aio.create_task(self.__sweep_forever())
+
+    async def run(self,
+        domain: str,
+        loader: Callable[[], Awaitable[DomainSummary]],
+        deadline: Optional[float]=None
+    ) -> DomainSummary:
+        """
+        Analyze the domain with `loader` unless another replica already does, then await its result.
+        `deadline` is in event loop time.
+        """
+
+        while True:
+            acquired = await self.__acquire(domain)
+            if acquired is None:
+                return await loader()
+            if acquired:
+                return await self.__lead(domain, loader)
+
+            self.__stats.waited += 1
+            try:
+                summary = await self.__wait(domain, deadline)
+            except TimeoutError:
+                self.__stats.gave_up += 1
+                logger.warning(f'Gave up waiting for the result of {domain}, analyzing it locally.')
+                return await loader()
+
+            if summary is not None:
+                return summary
+
+            self.__stats.taken_over += 1
+            logger.warning(f'Lease of {domain} expired without a result, taking the analysis over.')
+
+    async def sweep(self) -> int:
+        """Remove set members whose lease is gone, left behind by crashed replicas."""
+
+        swept = 0
+        for member in await self.__storage.members():
+            domain = member.decode()
+            if domain in self.__leases: continue
+            try:
+                if await self.__client.exists(self.__lease_key(domain)): continue
+            except Error as exp:
+                logger.exception(f'Failed to check lease: {domain}.')
+                break
+            await self.__storage.remove(member)
+            swept += 1
+
+        self.__stats.swept += swept
+        return swept
+
+    async def shutdown(self) -> None:
+        if self.__sweeper is not None:
+            await cancel_task(self.__sweeper)
+            self.__sweeper = None
+        await cancel_all(set(self.__leases.values()))
+
+    @property
+    def stats(self) -> ProgressRegistryStats:
+        return self.__stats
+
+    async def __acquire(self, domain: str) -> Optional[bool]:
+        """True when the lease was taken, False when it is held elsewhere, None when Redis failed."""
+
+        try:
+            reply = await self.__client.set(self.__lease_key(domain), self.__owner,
+                                            expire=self.__lease_ttl, only_if_not_exists=True)
+            if reply is None:
+                return False
+
+            # A result left by a previous analysis must not be served to this one's waiters.
+            await self.__client.delete([self.__result_key(domain)])
+        except Error as exp:
+            logger.exception(f'Failed to acquire lease: {domain}.')
+            return None
+
+        await self.__storage.add(domain.encode())
+        return True
+
+    async def __lead(self, domain: str, loader: Callable[[], Awaitable[DomainSummary]]) -> DomainSummary:
+        self.__stats.led += 1
+        self.__leases[domain] = aio.create_task(self.__renew(domain))
+        try:
+            summary = await loader()
+            await self.__publish(domain, summary)
+            return summary
+        finally:
+            await cancel_task(self.__leases.pop(domain))
+            await self.__release(domain)
+
+    async def __renew(self, domain: str) -> None:
+        while True:
+            await aio.sleep(self.__lease_ttl / 3)
+            try:
+                renewed = await self.__run_script(RENEW_SCRIPT, self.__lease_key(domain),
+                                                  str(self.__lease_ttl).encode())
+            except Error as exp:
+                logger.exception(f'Failed to renew lease: {domain}.')
+                continue
+
+            if not renewed:
+                logger.warning(f'Lease of {domain} was lost, it is no longer renewed.')
+                return
+
+    async def __release(self, domain: str) -> None:
+        try:
+            # The lease may have expired and been taken over, only the owner deletes it.
+            await self.__run_script(RELEASE_SCRIPT, self.__lease_key(domain))
+        except Error as exp:
+            logger.exception(f'Failed to release lease: {domain}.')
+        await self.__storage.remove(domain.encode())
+
+    async def __run_script(self, code: str, key: bytes, *args: bytes) -> Any:
+        """Run a compare-with-owner script on the lease key, it is loaded into Redis on first use."""
+
+        script = self.__scripts.get(code)
+        if script is None:
+            script = self.__scripts[code] = await self.__client.register_script(code)
+        reply = await script.run(keys=[key], args=[self.__owner, *args])
+        return await reply.return_value()
+
+    async def __publish(self, domain: str, summary: DomainSummary) -> None:
+        entry = dumps(asdict(summary), separators=(',', ':'))
+        try:
+            await self.__client.set(self.__result_key(domain), zlib.compress(entry.encode()),
+                                    expire=self.__result_ttl)
+        except Error as exp:
+            logger.exception(f'Failed to publish result: {domain}.')
+
+    async def __wait(self, domain: str, deadline: Optional[float]=None) -> Optional[DomainSummary]:
+        """
+        Poll the result until it appears, None once the lease is gone without one.
+        Raises `TimeoutError` after `lease_ttl` seconds or at the deadline.
+        """
+
+        loop = aio.get_running_loop()
+        until = loop.time() + self.__lease_ttl
+        if deadline is not None:
+            until = min(until, deadline)
+
+        while True:
+            summary = await self.__result(domain)
+            if summary is not None:
+                return summary
+
+            try:
+                is_leased = await self.__client.exists(self.__lease_key(domain))
+            except Error as exp:
+                logger.exception(f'Failed to check lease: {domain}.')
+                return None
+
+            if not is_leased:
+                # The result is published before the lease is released, look once more.
+                return await self.__result(domain)
+
+            remaining = until - loop.time()
+            if remaining <= 0:
+                raise TimeoutError(f'No result for {domain} in time.')
+            await aio.sleep(min(self.__poll_interval, remaining))
+
+    async def __result(self, domain: str) -> Optional[DomainSummary]:
+        try:
+            raw = await self.__client.get(self.__result_key(domain))
+            return raw is not None and map_dict_to_summary(loads(zlib.decompress(raw))) or None
+        except (Error, ValueError, KeyError, TypeError, zlib.error) as exp:
+            logger.exception(f'Failed to read result: {domain}.')
+        return None
+
+    async def __sweep_forever(self) -> None:
+        while True:
+            await aio.sleep(self.__lease_ttl)
+            swept = await self.sweep()
+            if swept:
+                logger.info(f'Swept {swept} stale in-progress domains.')
+
+    def __lease_key(self, domain: str) -> bytes:
+        return f'{self.__prefix}lease:{domain}'.encode()
+
+    def __result_key(self, domain: str) -> bytes:
+        return f'{self.__prefix}result:{domain}'.encode()
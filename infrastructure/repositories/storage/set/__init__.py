@@ -2,7 +2,7 @@ import logging
 
 from asyncio_redis import RedisProtocol, Error
 
-from typing import TypeVar, Generic
+from typing import TypeVar, Generic, Set
 
 
 logger = logging.getLogger(__name__)
@@ -35,4 +35,11 @@ class AsyncSetStorage(Generic[T]):
             return await self.__client.sismember(self.__key, encodable)
         except Error as exp:
             logger.exception(f'Error occurred while checking existence of item: {encodable} on ({self.__key}).')
-        return False
\ No newline at end of file
+        return False
+
+    async def members(self) -> Set[T]:
+        try:
+            return await self.__client.smembers_asset(self.__key)
+        except Error as exp:
+            logger.exception(f'Error occurred while listing items of set ({self.__key}).')
+        return set()
\ No newline at end of file
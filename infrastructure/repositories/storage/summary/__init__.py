@@ -0,0 +1,128 @@
+import logging
+import zlib
+
+import asyncio as aio
+
+from asyncio_redis import RedisProtocol, Error
+
+from dataclasses import dataclass, asdict
+from json import dumps, loads
+from math import log
+from random import random
+from time import time, perf_counter
+
+from typing import Optional, Callable, Awaitable, Dict
+
+from utils.cancel_tasks import cancel_all
+
+from application.Dto.dns import DomainSummary, CachedSummary
+from application.Dto.mappers.dns import map_dict_to_summary
+
+
+logger = logging.getLogger('DomainSummaryCache')
+
+
+@dataclass
+class SummaryCacheStats:
+    """SummaryCacheStats"""
+
+    fresh_hits: int = 0
+    stale_hits: int = 0
+    early_refreshes: int = 0
+    misses: int = 0
+    refreshes: int = 0
+
+
+class DomainSummaryCache:
+    """
+    Compressed `DomainSummary` cache in Redis, the client has to use `BytesEncoder`.
+    An entry is fresh for `fresh_ttl` and kept until `stale_ttl`, a stale hit is answered
+    and refreshed by a single background task per domain. Hits may also refresh early, with a
+    probability growing as the entry nears `fresh_ttl` and with the time it took to analyze it
+    (XFetch, scaled by `beta`), so a hot domain is refreshed once rather than by a stampede.
+    """
+
+    def __init__(self, *,
+        client: RedisProtocol,
+        fresh_ttl: int,
+        stale_ttl: int,
+        beta: float=1.0,
+        prefix: str='summary:'
+    ):
+        if stale_ttl < fresh_ttl: raise ValueError(':stale_ttl should not be less then :fresh_ttl.')
+
+        self.__client = client
+        self.__fresh_ttl = fresh_ttl
+        self.__stale_ttl = stale_ttl
+        self.__beta = beta
+        self.__prefix = prefix
+        self.__refreshing: Dict[str, aio.Task] = {}
+        self.__stats = SummaryCacheStats()
+
+    async def get(self, domain: str) -> Optional[CachedSummary]:
+        try:
+            raw = await self.__client.get(self.__key(domain))
+            if raw is None:
+                self.__stats.misses += 1
+                return None
+
+            entry = loads(zlib.decompress(raw))
+            summary = map_dict_to_summary(entry['summary'])
+        except (Error, ValueError, KeyError, TypeError, zlib.error) as exp:
+            logger.exception(f'Failed to read cached summary: {domain}.')
+            self.__stats.misses += 1
+            return None
+
+        age = max(0.0, time() - entry['stored_at'])
+        is_stale = age >= self.__fresh_ttl
+        expires_early = not is_stale and self.__expires_early(age, entry['elapsed'])
+
+        self.__stats.stale_hits += is_stale
+        self.__stats.fresh_hits += not is_stale
+        self.__stats.early_refreshes += expires_early
+        return CachedSummary(summary=summary, age=age, should_refresh=is_stale or expires_early)
+
+    async def set(self, domain: str, summary: DomainSummary, elapsed: float) -> None:
+        entry = dumps({
+            'summary': asdict(summary),
+            'stored_at': time(),
+            'elapsed': elapsed
+        }, separators=(',', ':'))
+        try:
+            await self.__client.set(self.__key(domain), zlib.compress(entry.encode()), expire=self.__stale_ttl)
+        except Error as exp:
+            logger.exception(f'Failed to cache summary: {domain}.')
+
+    def refresh(self, domain: str, loader: Callable[[], Awaitable[Optional[DomainSummary]]]) -> None:
+        """Refresh the entry in the background, unless a refresh of the domain is already running."""
+
+        if domain in self.__refreshing: return
+
+        task = aio.create_task(self.__refresh(domain, loader))
+        self.__refreshing[domain] = task
+        task.add_done_callback(lambda _: self.__refreshing.pop(domain, None))
+
+    async def shutdown(self) -> None:
+        await cancel_all(set(self.__refreshing.values()))
+        self.__refreshing.clear()
+
+    @property
+    def stats(self) -> SummaryCacheStats:
+        return self.__stats
+
+    async def __refresh(self, domain: str, loader: Callable[[], Awaitable[Optional[DomainSummary]]]) -> None:
+        self.__stats.refreshes += 1
+        try:
+            started = perf_counter()
+            summary = await loader()
+            if summary is not None:
+                await self.set(domain, summary, perf_counter() - started)
+        except Exception as exp:
+            logger.exception(f'Failed to refresh cached summary: {domain}.')
+
+    def __expires_early(self, age: float, elapsed: float) -> bool:
+        # 1 - random() lies in (0, 1], so the logarithm is always defined.
+        return age - elapsed * self.__beta * log(1 - random()) >= self.__fresh_ttl
+
+    def __key(self, domain: str) -> bytes:
+        return f'{self.__prefix}{domain}'.encode()
@@ -0,0 +1,146 @@
+import logging
+
+from typing import AsyncGenerator, Optional
+
+from aiohttp import ClientTimeout
+
+from libs.securitytrails.client import SecurityTrailsClient
+from libs.securitytrails.limiter import KeyRateLimiter
+from libs.securitytrails.retry import RetryPolicy
+from libs.securitytrails.singleflight import SingleFlight
+from libs.securitytrails.hedging import HedgePolicy
+from libs.securitytrails.instrumentation import ClientInstrumentation
+from libs.securitytrails.cache import (
+    IResponseCache,
+    LRUResponseCache,
+    RedisResponseCache
+)
+
+from infrastructure.config import SecurityTrailsClientConfig, RedisConfig
+from infrastructure.redis.main import get_redis_factory
+
+
+def _timeouts(config: SecurityTrailsClientConfig):
+    """_timeouts"""
+
+    return {
+        'usage': ClientTimeout(total=config.usage_timeout, connect=5),
+        'base_domain': ClientTimeout(total=config.domain_timeout, connect=5),
+        'subdomain_list': ClientTimeout(total=config.subdomains_timeout, connect=5),
+        'history_dns': ClientTimeout(total=config.history_timeout, connect=5)
+    }
+
+def _limiter(config: SecurityTrailsClientConfig) -> Optional[KeyRateLimiter]:
+    """_limiter"""
+
+    if config.rate_limit <= 0: return None
+
+    return KeyRateLimiter(
+        rate=config.rate_limit,
+        burst=config.rate_burst,
+        max_in_flight=config.max_in_flight
+    )
+
+def _retry(config: SecurityTrailsClientConfig) -> Optional[RetryPolicy]:
+    """_retry"""
+
+    if config.retry_attempts <= 0: return None
+
+    return RetryPolicy(
+        max_attempts=config.retry_attempts,
+        base_delay=config.retry_base_delay,
+        max_delay=config.retry_max_delay
+    )
+
+def _cache(config: SecurityTrailsClientConfig, redis_client) -> Optional[IResponseCache]:
+    """_cache"""
+
+    match config.cache_backend:
+        case 'memory':
+            return LRUResponseCache(max_entries=config.cache_max_entries)
+        case 'redis':
+            return RedisResponseCache(client=redis_client)
+    return None
+
+def _hedge(config: SecurityTrailsClientConfig) -> Optional[HedgePolicy]:
+    """_hedge"""
+
+    if not config.hedge: return None
+
+    return HedgePolicy(
+        percentile=config.hedge_percentile,
+        min_samples=config.hedge_min_samples,
+        min_delay=config.hedge_min_delay,
+        max_extra_credits=config.hedge_max_extra_credits,
+        budget_window=config.hedge_budget_window
+    )
+
+def _body_limits(config: SecurityTrailsClientConfig):
+    """Per-endpoint body limits, zero disables the limit."""
+
+    return {
+        'usage': config.usage_max_bytes or None,
+        'base_domain': config.domain_max_bytes or None,
+        'subdomain_list': config.subdomains_max_bytes or None,
+        'history_dns': config.history_max_bytes or None
+    }
+
+def _cache_ttls(config: SecurityTrailsClientConfig):
+    """_cache_ttls"""
+
+    return {
+        'base_domain': config.cache_domain_ttl,
+        'subdomain_list': config.cache_subdomains_ttl,
+        'history_dns': config.cache_history_ttl
+    }
+
+async def get_securitytrails_client_factory(
+    config: SecurityTrailsClientConfig,
+    redis: RedisConfig
+) -> AsyncGenerator[SecurityTrailsClient, None]:
+    """get_securitytrails_client_factory"""
+
+    redis_client = None
+    if config.cache_backend == 'redis':
+        redis_client = await get_redis_factory(redis, config.cache_redis_db)
+
+    client = SecurityTrailsClient(
+        base_url=config.base_url,
+        limit=config.connections_limit,
+        limit_per_host=config.connections_per_host,
+        keepalive_timeout=config.keepalive_timeout,
+        dns_cache_ttl=config.dns_cache_ttl,
+        timeouts=_timeouts(config),
+        limiter=_limiter(config),
+        retry=_retry(config),
+        single_flight=config.single_flight and SingleFlight() or None,
+        cache=_cache(config, redis_client),
+        cache_ttls=_cache_ttls(config),
+        history_max_pages=config.history_max_pages,
+        history_page_concurrency=config.history_page_concurrency,
+        decoder=config.decoder,
+        hedge=_hedge(config),
+        instrumentation=config.instrumentation and ClientInstrumentation() or None,
+        body_limits=_body_limits(config)
+    )
+    await client.start()
+
+    logging.info('SecurityTrails client session is started.')
+
+    yield client
+
+    await client.aclose()
+
+    if redis_client is not None:
+        redis_client.close()
+
+    if client.rejected_too_large:
+        logging.info(f'SecurityTrails responses dropped over their body limit: {dict(client.rejected_too_large)}.')
+
+    if client.metrics is not None:
+        logging.info(f'SecurityTrails client metrics: {client.metrics.snapshot()}.')
+
+    if client.hedge_stats is not None:
+        logging.info(f'SecurityTrails hedging spent {client.hedge_stats.extra_credits} extra credits: {client.hedge_stats}.')
+
+    logging.info('SecurityTrails client session is closed.')
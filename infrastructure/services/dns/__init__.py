@@ -2,6 +2,8 @@ import logging
 
 import asyncio as aio
 
+from functools import partial
+
 from typing import (
     Optional,
     Tuple,
@@ -9,7 +11,8 @@ from typing import (
     Callable,
     Dict,
     TypeVar,
-    Awaitable
+    Awaitable,
+    AsyncIterator
 )
 
 from libs.securitytrails.client import (
@@ -18,24 +21,36 @@ from libs.securitytrails.client import (
     BaseStatus,
     RecordType,
     DomainData,
-    DnsHistoryData
+    DnsHistoryData,
+    StatusError
 )
 
 from .mappers import (
     empty_response,
     map_to_current_dns,
-    map_to_history_dns,
-    map_to_subdomains_list
+    map_to_history_rows,
+    map_to_subdomains_chunk
+)
+from .reply import (
+    TReply,
+    map_to_present_reply,
+    map_to_history_reply,
+    map_to_subdomain_reply,
+    map_to_summary_reply
 )
 
 from domain.Entities.dns import (
     DomainSummary,
+    SubdomainSummary,
+    HistoryDnsRow,
     HistoryDnsTable
 )
-from domain.ValueObjects.app import Domain
+from domain.ValueObjects.app import Domain, Projection, DeepAnalysis, FULL_PROJECTION
 from domain.ValueObjects.dns import Hostname, SubDomain
 
 from infrastructure.adapters.IDomainDnsService import IDomainDnsService
+from infrastructure.adapters.IDnsHistoryStore import IDnsHistoryStore
+from infrastructure.adapters.INegativeDomainCache import INegativeDomainCache
 from infrastructure.adapters.securitytrails.ISecurityTrailsAccountProvider import ISecurityTrailsAccountProvider
 
 
@@ -43,6 +58,9 @@ logger = logging.getLogger('DnsAnalyzeService')
 
 
 MAX_FETCH_ATTEMPTS = 5
+# Statuses of `get_domain` the negative cache remembers, asking again would bring the same answer.
+NEGATIVE_STATUSES = frozenset((BaseStatus.INVALID_DOMAIN, BaseStatus.NO_INFO))
+WAIT_REPORT_THRESHOLD = 0.05
 SUPPORTED_DNS_RECORDS = [
     RecordType.A,
     RecordType.AAAA,
@@ -53,19 +71,64 @@ SUPPORTED_DNS_RECORDS = [
 ]
 
 TMethod = TypeVar('TMethod', bound=Callable[..., Awaitable[BaseResponse]])
+TSummary = TypeVar('TSummary')
+# Receives every finished section: its name, the history record type and the mapped value.
+TPartListener = Callable[[str, Optional[str], Any], None]
+
+
+class _CreditRefused(Exception):
+    """Raised by a key source whose caller has no credit left, so the request is not sent."""
+
+def _log_wait(response: BaseResponse):
+    """_log_wait"""
+
+    if response.waited >= WAIT_REPORT_THRESHOLD:
+        logger.debug(f'Waited {response.waited:.3f}s for a rate limiter slot.')
+
+async def _hedge_key(provider: ISecurityTrailsAccountProvider) -> str:
+    """Key for a hedged request, taken from the provider like any other request's key."""
+
+    account = await provider.get()
+    return account.api_key.raw()
 
 async def _fetch(
     method: TMethod, *,
     provider: ISecurityTrailsAccountProvider,
     args: Tuple[Any, ...]=tuple(),
     kwargs: Dict[str, Any]=dict(),
-    max_attempts: int=MAX_FETCH_ATTEMPTS
+    max_attempts: int=MAX_FETCH_ATTEMPTS,
+    charge: Optional[Callable[[], bool]]=None
 ):
-    """_fetch"""
+    """_fetch, `charge` is called before every request sent upstream and returns None when it refuses one."""
 
     attempts = 0
-    account = await provider.get()
-    response = await method(*args, **kwargs, api_key=account.api_key.raw())
+    hedge_key = partial(_hedge_key, provider)
+    account = None
+    refused = False
+
+    async def lease() -> str:
+        # Called by the client only when the request goes upstream, cache hits spend no credit.
+        # The account is the key this call used, only it is expired on a bad key response.
+        nonlocal account, refused
+        if charge is not None and not charge():
+            refused = True
+            raise _CreditRefused()
+        account = await provider.get()
+        return account.api_key.raw()
+
+    async def call() -> Optional[BaseResponse]:
+        while True:
+            try:
+                response = await method(*args, **kwargs, api_key=lease, hedge_key=hedge_key)
+            except _CreditRefused:
+                if refused: return None
+                # The shared call of another caller was refused, this one loads with its own key.
+                continue
+            _log_wait(response)
+            return response
+
+    response = await call()
+    if response is None: return None
 
     while attempts < max_attempts and (
         response.status is BaseStatus.API_KEY_EXHAUSTED or
@@ -73,80 +136,209 @@ async def _fetch(
     ):
         attempts += 1
         logger.warning(f'Bad key response: {response.status}')
-        await provider.expire_account(account)
+        if account is not None:
+            await provider.expire_account(account)
         await aio.sleep(2)
-        account = await provider.get()
-        response = await method(*args, **kwargs, api_key=account.api_key.raw())
+        account = None
+        response = await call()
+        if response is None: return None
+
+    if response.status is BaseStatus.RATE_LIMITED:
+        # Throttling is transient, the key keeps its quota and is not expired.
+        logger.warning(f'Rate limited response after client retries: {response.rate_limit}.')
     return response
 
 async def _process_domain(
     domain: Domain,
     client: SecurityTrailsClient,
     provider: ISecurityTrailsAccountProvider
-) -> Tuple[bool, Optional[DomainData]]:
+) -> Tuple[BaseStatus, Optional[DomainData]]:
     """_process_domain"""
 
     domain_name = domain.raw()
     response = await _fetch(client.get_domain, provider=provider,
                             args=(domain_name,))
 
-    data = response.response
-    if response.status is not BaseStatus.FETCHED:
-        return False, data
-    return True, data
+    return response.status, response.response
 
 async def _process_subdomains(
     domain: Domain,
     client: SecurityTrailsClient,
     provider: ISecurityTrailsAccountProvider
-) -> Tuple[SubDomain, ...]:
-    """_process_subdomains"""
+) -> Tuple[str, ...]:
+    """_process_subdomains, left unmapped as both the entities and the fast path build on them"""
 
     domain_name = domain.raw()
     response = await _fetch(client.get_subdomains, provider=provider,
                             args=(domain_name,))
 
     data = response.response
+    if response.status is BaseStatus.TOO_LARGE:
+        # The summary and its reply carry every subdomain, so the list is still built here. Streaming keeps
+        # the raw body and the decoded JSON out of memory, only the names are held, once.
+        logger.info(f'Subdomains of {domain_name} are over the body limit, streaming them instead.')
+        subdomains = []
+        async for chunk in _stream_subdomains(domain, client, provider):
+            subdomains.extend(chunk)
+        return tuple(subdomains)
     if response.status is not BaseStatus.FETCHED:
         return tuple()
-    return map_to_subdomains_list(data)
+    return data.subdomains
+
+async def _stream_subdomains(
+    domain: Domain,
+    client: SecurityTrailsClient,
+    provider: ISecurityTrailsAccountProvider,
+    max_attempts: int=MAX_FETCH_ATTEMPTS
+) -> AsyncIterator[Tuple[str, ...]]:
+    """_stream_subdomains"""
+
+    attempts = 0
+    account = await provider.get()
+    while True:
+        try:
+            async for chunk in client.iter_subdomains(domain.raw(), api_key=account.api_key.raw()):
+                yield chunk
+            return
+        except StatusError as exp:
+            response = exp.response
+            if attempts >= max_attempts or not (
+                response.status is BaseStatus.API_KEY_EXHAUSTED or
+                response.status is BaseStatus.UNAUTHORIZED
+            ):
+                logger.warning(f'Failed to stream subdomains: {response.status}.')
+                return
+
+        attempts += 1
+        logger.warning(f'Bad key response: {response.status}')
+        await provider.expire_account(account)
+        await aio.sleep(2)
+        account = await provider.get()
 
 async def _process_dns_record(
     domain: Domain,
     client: SecurityTrailsClient,
     provider: ISecurityTrailsAccountProvider,
-    record: RecordType
-) -> Optional[DnsHistoryData]:
+    record: RecordType,
+    stop_before: Optional[str]=None
+) -> BaseResponse[DnsHistoryData]:
     """_process_dns_record"""
 
     domain_name = domain.raw()
     response = await _fetch(client.get_history_dns, provider=provider,
-                            args=(domain_name,), kwargs={'record_type': record})
+                            args=(domain_name,), kwargs={'record_type': record, 'stop_before': stop_before})
 
-    return response.response
+    return response
+
+async def _fetch_history(
+    domain: Domain,
+    client: SecurityTrailsClient,
+    provider: ISecurityTrailsAccountProvider,
+    record: RecordType,
+    store: Optional[IDnsHistoryStore]=None
+) -> Optional[DnsHistoryData]:
+    """_fetch_history, through the store when there is one"""
+
+    if store is None:
+        return (await _process_dns_record(domain, client, provider, record)).response
+
+    fetch = partial(_process_dns_record, domain, client, provider, record)
+    return await store.history(domain.raw(), record, fetch)
 
 async def _process_history(
     domain: Domain,
     client: SecurityTrailsClient,
     provider: ISecurityTrailsAccountProvider,
-    service: IDomainDnsService
+    service: IDomainDnsService,
+    records: Tuple[RecordType, ...]=tuple(SUPPORTED_DNS_RECORDS),
+    on_part: Optional[TPartListener]=None,
+    store: Optional[IDnsHistoryStore]=None
 ) -> HistoryDnsTable:
-    """_process_history"""
+    """_process_history, record types left out are not fetched and stay empty, a store serves what it holds"""
+
+    async def process(record: RecordType) -> Tuple[HistoryDnsRow, ...]:
+        data = await _fetch_history(domain, client, provider, record, store)
+        rows = map_to_history_rows(record.value, data, service)
+        if on_part is not None:
+            on_part('history', record.value, rows)
+        return rows
+
+    rows = await aio.gather(*(process(record) for record in records))
+    return service.new_history_dns_table(**{
+        record.value: record_rows
+        for record, record_rows in zip(records, rows)
+    })
+
+async def _process_history_reply(
+    domain: Domain,
+    client: SecurityTrailsClient,
+    provider: ISecurityTrailsAccountProvider,
+    records: Tuple[RecordType, ...]=tuple(SUPPORTED_DNS_RECORDS),
+    store: Optional[IDnsHistoryStore]=None
+) -> Dict[str, Tuple[TReply, ...]]:
+    """_process_history_reply, `_process_history` for the fast path"""
 
-    a, aaaa, mx, ns, soa, txt = await aio.gather(*(
-        _process_dns_record(domain, client, provider, record)
-        for record in SUPPORTED_DNS_RECORDS
-    ))
+    async def process(record: RecordType) -> Tuple[TReply, ...]:
+        return map_to_history_reply(record.value, await _fetch_history(domain, client, provider, record, store))
 
-    return map_to_history_dns(
-        service,
-        a_data=a,
-        aaaa_data=aaaa,
-        mx_data=mx,
-        ns_data=ns,
-        soa_data=soa,
-        txt_data=txt
-    )
+    rows = await aio.gather(*(process(record) for record in records))
+    return {
+        record.value: record_rows
+        for record, record_rows in zip(records, rows)
+    }
+
+async def _process_deep(
+    domain: Domain,
+    subdomains: Tuple[str, ...],
+    client: SecurityTrailsClient,
+    provider: ISecurityTrailsAccountProvider,
+    deep: DeepAnalysis,
+    summarize: Callable[[str, Optional[DomainData]], TSummary]
+) -> Tuple[TSummary, ...]:
+    """
+    _process_deep, the current DNS of the first subdomains over the client's connection pool.
+    Every request sent upstream, bad key retries included, is billed a credit, cached subdomains are free.
+    Once the budget is spent the subdomains left uncached are skipped.
+    `summarize` maps a hostname and its data, None when it was not fetched.
+    """
+
+    semaphore = aio.Semaphore(deep.concurrency)
+    credits = deep.budget
+    skipped = 0
+
+    def charge() -> bool:
+        nonlocal credits
+        if credits <= 0: return False
+        credits -= 1
+        return True
+
+    async def process(subdomain: str) -> Optional[TSummary]:
+        nonlocal skipped
+        hostname = f'{subdomain}.{domain.raw()}'
+        async with semaphore:
+            response = await _fetch(client.get_domain, provider=provider, args=(hostname,), charge=charge)
+        if response is None:
+            skipped += 1
+            return None
+        return summarize(hostname, response.status is BaseStatus.FETCHED and response.response or None)
+
+    summaries = await aio.gather(*(process(subdomain) for subdomain in subdomains[:deep.subdomains]))
+    if skipped:
+        logger.info(f'Deep analysis of {domain.raw()} spent its budget of {deep.budget} credits, {skipped} skipped.')
+    return tuple((summary for summary in summaries if summary is not None))
+
+async def _emitted(coroutine: Awaitable[Any], section: str, on_part: Optional[TPartListener]) -> Any:
+    """_emitted"""
+
+    value = await coroutine
+    if on_part is not None:
+        on_part(section, None, value)
+    return value
+
+async def _skipped(value: Any) -> Any:
+    """Stands in for a section left out of the projection."""
+
+    return value
 
 
 class DnsAnalyzeService:
@@ -154,26 +346,195 @@ class DnsAnalyzeService:
 
     def __init__(self, *,
         provider: ISecurityTrailsAccountProvider,
-        service: IDomainDnsService
+        service: IDomainDnsService,
+        client: SecurityTrailsClient,
+        history_store: Optional[IDnsHistoryStore]=None,
+        negative_cache: Optional[INegativeDomainCache]=None
     ):
         self.__provider = provider
         self.__service = service
-        self.__client = SecurityTrailsClient()
-
-    async def analyze(self, domain: Domain) -> DomainSummary:
-        success, data = await _process_domain(domain, self.__client, self.__provider)
-        if not success:
+        self.__client = client
+        self.__history_store = history_store
+        self.__negative_cache = negative_cache
+
+    async def analyze(self,
+        domain: Domain,
+        projection: Projection=FULL_PROJECTION,
+        on_part: Optional[TPartListener]=None,
+        deadline: Optional[float]=None
+    ) -> DomainSummary:
+        """
+        Analyze the domain, only the upstream calls the projection needs are made. Domains the negative cache
+        knows to be invalid or without data get an empty summary without any upstream call.
+        `on_part` receives the present table, the subdomains, every history record type and, for a deep
+        projection, the subdomain summaries as they complete.
+        At the `deadline`, in event loop time, the calls still running are cancelled, waiting for an api key
+        or between retries included, and the summary holds the finished sections and names the missing ones.
+        """
+
+        if deadline is None:
+            return await self.__analyze(domain, projection, on_part)
+
+        finished: Dict[Tuple[str, Optional[str]], Any] = {}
+
+        def track(section: str, record: Optional[str], value: Any) -> None:
+            finished[(section, record)] = value
+            if on_part is not None:
+                on_part(section, record, value)
+
+        try:
+            async with aio.timeout_at(deadline) as timeout:
+                return await self.__analyze(domain, projection, track)
+        except TimeoutError:
+            if not timeout.expired(): raise
+
+        summary = self.__partial(domain, projection, finished)
+        logger.warning(f'Deadline hit analyzing {domain.raw()}, missing: {", ".join(summary.missing)}.')
+        return summary
+
+    async def __analyze(self,
+        domain: Domain,
+        projection: Projection,
+        on_part: Optional[TPartListener]
+    ) -> DomainSummary:
+        if await self.__is_known_empty(domain):
             return empty_response(domain, self.__service)
 
-        current_dns_table = map_to_current_dns(data, self.__service)
-        subdomains, history_dns_table = await aio.gather(
-            _process_subdomains(domain, self.__client, self.__provider),
-            _process_history(domain, self.__client, self.__provider, self.__service)
+        current_dns_table = self.__service.new_current_dns_table()
+        if projection.present:
+            data = await self.__domain_data(domain)
+            if data is None:
+                return empty_response(domain, self.__service)
+            current_dns_table = map_to_current_dns(data, self.__service)
+            if on_part is not None:
+                on_part('present', None, current_dns_table)
+
+        records = tuple((RecordType(record) for record in projection.history))
+        (subdomains, deep), history_dns_table = await aio.gather(
+            projection.subdomains and self.__subdomains(domain, projection.deep, on_part) or _skipped((tuple(), tuple())),
+            _process_history(domain, self.__client, self.__provider, self.__service, records, on_part,
+                             self.__history_store)
         )
 
         return self.__service.new_summary(
             hostname=Hostname(domain.raw()),
             current=current_dns_table,
             history=history_dns_table,
-            subdomains=subdomains
-        )
\ No newline at end of file
+            subdomains=subdomains,
+            deep=deep
+        )
+
+    async def __subdomains(
+        self,
+        domain: Domain,
+        deep: Optional[DeepAnalysis],
+        on_part: Optional[TPartListener]
+    ) -> Tuple[Tuple[SubDomain, ...], Tuple[SubdomainSummary, ...]]:
+        """The subdomains, then the fan-out over them while the history is still being fetched."""
+
+        names = await _process_subdomains(domain, self.__client, self.__provider)
+        subdomains = map_to_subdomains_chunk(names)
+        if on_part is not None:
+            on_part('subdomains', None, subdomains)
+        if deep is None:
+            return subdomains, tuple()
+
+        return subdomains, await _emitted(
+            _process_deep(domain, names, self.__client, self.__provider, deep, self.__subdomain_summary),
+            'deep', on_part
+        )
+
+    def __subdomain_summary(self, hostname: str, data: Optional[DomainData]) -> SubdomainSummary:
+        if data is None:
+            current = self.__service.new_current_dns_table()
+        else:
+            current = map_to_current_dns(data, self.__service)
+        return self.__service.new_subdomain_summary(hostname=Hostname(hostname), current=current)
+
+    async def analyze_reply(self, domain: Domain, projection: Projection=FULL_PROJECTION) -> TReply:
+        """
+        The fast path of `analyze`, with no deadline nor parts: the same upstream calls, mapped in a single pass
+        from the client data to the `asdict` form of the application `DomainSummary`, see `reply`.
+        """
+
+        if await self.__is_known_empty(domain):
+            return map_to_summary_reply(domain.raw())
+
+        present = None
+        if projection.present:
+            data = await self.__domain_data(domain)
+            if data is None:
+                return map_to_summary_reply(domain.raw())
+            present = map_to_present_reply(data)
+
+        records = tuple((RecordType(record) for record in projection.history))
+        (subdomains, deep), history = await aio.gather(
+            projection.subdomains and self.__subdomain_replies(domain, projection.deep) or _skipped((tuple(), tuple())),
+            _process_history_reply(domain, self.__client, self.__provider, records, self.__history_store)
+        )
+
+        return map_to_summary_reply(domain.raw(), present=present, history=history, subdomains=subdomains, deep=deep)
+
+    async def __subdomain_replies(
+        self,
+        domain: Domain,
+        deep: Optional[DeepAnalysis]
+    ) -> Tuple[Tuple[str, ...], Tuple[TReply, ...]]:
+        subdomains = await _process_subdomains(domain, self.__client, self.__provider)
+        if deep is None:
+            return subdomains, tuple()
+
+        return subdomains, await _process_deep(
+            domain, subdomains, self.__client, self.__provider, deep, map_to_subdomain_reply
+        )
+
+    async def __is_known_empty(self, domain: Domain) -> bool:
+        negative_cache = self.__negative_cache
+        return negative_cache is not None and await negative_cache.contains(domain.raw())
+
+    async def __domain_data(self, domain: Domain) -> Optional[DomainData]:
+        """The current DNS of the domain, None when it was not fetched."""
+
+        status, data = await _process_domain(domain, self.__client, self.__provider)
+        if status is BaseStatus.FETCHED:
+            return data
+
+        if self.__negative_cache is not None and status in NEGATIVE_STATUSES:
+            await self.__negative_cache.add(domain.raw())
+        return None
+
+    def __partial(
+        self,
+        domain: Domain,
+        projection: Projection,
+        finished: Dict[Tuple[str, Optional[str]], Any]
+    ) -> DomainSummary:
+        sections = (
+            *(projection.present and (('present', None),) or tuple()),
+            *(projection.subdomains and (('subdomains', None),) or tuple()),
+            *(('history', record) for record in projection.history),
+            *(projection.deep and (('deep', None),) or tuple())
+        )
+
+        return self.__service.new_summary(
+            hostname=Hostname(domain.raw()),
+            current=finished.get(('present', None)) or self.__service.new_current_dns_table(),
+            history=self.__service.new_history_dns_table(**{
+                record: rows
+                for (section, record), rows in finished.items()
+                if section == 'history'
+            }),
+            subdomains=finished.get(('subdomains', None), tuple()),
+            deep=finished.get(('deep', None), tuple()),
+            missing=tuple((
+                record and f'{section}.{record}' or section
+                for section, record in sections
+                if (section, record) not in finished
+            ))
+        )
+
+    async def iter_subdomains(self, domain: Domain) -> AsyncIterator[Tuple[SubDomain, ...]]:
+        """Stream subdomains chunk by chunk, peak memory does not grow with the size of the list."""
+
+        async for chunk in _stream_subdomains(domain, self.__client, self.__provider):
+            yield map_to_subdomains_chunk(chunk)
\ No newline at end of file
@@ -26,6 +26,7 @@ from libs.securitytrails.types.records import (
 
 from domain.Entities.dns import (
     CurrentDnsRow,
+    HistoryDnsRow,
     CurrentDnsTable,
     HistoryDnsTable
 )
@@ -98,9 +99,14 @@ def map_to_current_dns(data: DomainData, service: IDomainDnsService) -> CurrentD
 def map_to_subdomains_list(data: SubDomainData) -> Tuple[SubDomain, ...]:
     """map_to_subdomains_list"""
 
+    return map_to_subdomains_chunk(data.subdomains)
+
+def map_to_subdomains_chunk(chunk: Tuple[str, ...]) -> Tuple[SubDomain, ...]:
+    """map_to_subdomains_chunk"""
+
     return tuple((
         SubDomain(subdomain)
-        for subdomain in data.subdomains
+        for subdomain in chunk
     ))
 
 def map_to_history_dns(
@@ -234,4 +240,23 @@ def _map_txt_record(record: ClientTXTRecord) -> TXTRecord:
 
     return TXTRecord(TXTRecordValue(
         value=Txt(record.value)
-    ))
\ No newline at end of file
+    ))
+
+
+HISTORY_MAPPERS = {
+    'a': _map_a_record,
+    'aaaa': _map_aaaa_record,
+    'mx': _map_mx_record,
+    'ns': _map_ns_record,
+    'soa': _map_soa_record,
+    'txt': _map_txt_record
+}
+
+def map_to_history_rows(
+    record_type: str,
+    data: Optional[DnsHistoryData],
+    service: IDomainDnsService
+) -> Tuple[HistoryDnsRow, ...]:
+    """History rows of a single record type, mapped as soon as its data arrives."""
+
+    return _init_history_tuple(data, service, HISTORY_MAPPERS[record_type])
\ No newline at end of file
@@ -0,0 +1,158 @@
+from typing import (
+    Optional,
+    Tuple,
+    Dict,
+    Any,
+    Callable,
+    Sequence
+)
+
+from libs.securitytrails.client import (
+    DomainData,
+    DnsHistoryData
+)
+from libs.securitytrails.types.records import (
+    BaseRecordInfo,
+    TRecord as TClientRecord,
+    ARecord as ClientARecord,
+    AAAARecord as ClientAAAARecord,
+    MXRecord as ClientMXRecord,
+    NSRecord as ClientNSRecord,
+    SOARecord as ClientSOARecord,
+    TXTRecord as ClientTXTRecord
+)
+
+
+# The fast path skips the domain entities and the application DTOs, it maps the client data straight to
+# the `asdict` form of the application `DomainSummary`. Any change to either chain must keep both equal,
+# `benchmarks/securitytrails_reply.py` checks they are before measuring, `benchmarks/securitytrails_reply_check.py`
+# checks the encoded replies of the result codes, projections, failed calls and deadlines.
+
+TReply = Dict[str, Any]
+TReplyMapper = Callable[[TClientRecord], TReply]
+
+RECORD_TYPES = ('a', 'aaaa', 'mx', 'ns', 'soa', 'txt')
+
+
+def _map_a_record(record: ClientARecord) -> TReply:
+    """_map_a_record"""
+
+    return {'ip': record.ip, 'count': record.ip_count, 'organization': record.ip_organization}
+
+def _map_aaaa_record(record: ClientAAAARecord) -> TReply:
+    """_map_aaaa_record"""
+
+    return {'ipv6': record.ipv6, 'count': record.ipv6_count, 'organization': record.ipv6_organization}
+
+def _map_mx_record(record: ClientMXRecord) -> TReply:
+    """_map_mx_record"""
+
+    return {
+        'priority': record.priority,
+        'host': record.host,
+        'count': record.host_count,
+        'organization': record.hostname_organization
+    }
+
+def _map_ns_record(record: ClientNSRecord) -> TReply:
+    """_map_ns_record"""
+
+    return {
+        'nameserver': record.nameserver,
+        'count': record.nameserver_count,
+        'organization': record.nameserver_organization
+    }
+
+def _map_soa_record(record: ClientSOARecord) -> TReply:
+    """_map_soa_record"""
+
+    return {'ttl': record.ttl, 'email': record.email, 'count': record.email_count}
+
+def _map_txt_record(record: ClientTXTRecord) -> TReply:
+    """_map_txt_record"""
+
+    return {'value': record.value}
+
+
+REPLY_MAPPERS: Dict[str, TReplyMapper] = {
+    'a': _map_a_record,
+    'aaaa': _map_aaaa_record,
+    'mx': _map_mx_record,
+    'ns': _map_ns_record,
+    'soa': _map_soa_record,
+    'txt': _map_txt_record
+}
+
+def _current_row(record: Optional[BaseRecordInfo], mapper: TReplyMapper) -> Optional[TReply]:
+    """_current_row"""
+
+    if record is None: return None
+
+    return {
+        'first_seen': record.first_seen,
+        'values': tuple([mapper(value) for value in record.values if value]),
+        'last_seen': None,
+        'organizations': None
+    }
+
+def empty_present_reply() -> TReply:
+    """empty_present_reply"""
+
+    return dict.fromkeys(RECORD_TYPES)
+
+def map_to_present_reply(data: Optional[DomainData]) -> TReply:
+    """The present table, empty for a subdomain the deep analysis failed to fetch."""
+
+    if data is None: return empty_present_reply()
+
+    records = data.records
+    return {
+        'a': _current_row(records.A, _map_a_record),
+        'aaaa': _current_row(records.AAAA, _map_aaaa_record),
+        'mx': _current_row(records.MX, _map_mx_record),
+        'ns': _current_row(records.NS, _map_ns_record),
+        'soa': _current_row(records.SOA, _map_soa_record),
+        'txt': _current_row(records.TXT, _map_txt_record)
+    }
+
+def map_to_history_reply(record_type: str, data: Optional[DnsHistoryData]) -> Tuple[TReply, ...]:
+    """History rows of a single record type, rows without values are left out like in the entities."""
+
+    if data is None: return tuple()
+
+    mapper = REPLY_MAPPERS[record_type]
+    return tuple([
+        {
+            'first_seen': record.first_seen,
+            'values': tuple([mapper(value) for value in record.values if value]),
+            'last_seen': record.last_seen or None,
+            'organizations': tuple(record.organizations) or None
+        }
+        for record in data.records
+        if record.values
+    ])
+
+def map_to_subdomain_reply(hostname: str, data: Optional[DomainData]) -> TReply:
+    """map_to_subdomain_reply"""
+
+    return {'hostname': hostname, 'present': map_to_present_reply(data)}
+
+def map_to_summary_reply(
+    hostname: str, *,
+    present: Optional[TReply]=None,
+    history: Dict[str, Tuple[TReply, ...]]=dict(),
+    subdomains: Sequence[str]=tuple(),
+    deep: Tuple[TReply, ...]=tuple()
+) -> TReply:
+    """map_to_summary_reply, history record types left out are empty"""
+
+    return {
+        'hostname': hostname,
+        'present': present or empty_present_reply(),
+        'history': {
+            record_type: history.get(record_type, tuple())
+            for record_type in RECORD_TYPES
+        },
+        'subdomains': list(subdomains),
+        'deep': deep
+    }
\ No newline at end of file
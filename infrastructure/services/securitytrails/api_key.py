@@ -12,8 +12,8 @@ from domain.ValueObjects.securitytrails.account import (
 class SecurityTrailsApiKeyService:
     """SecurityTrailsApiKeyService"""
 
-    def __init__(self):
-        self.__client = SecurityTrailsClient()
+    def __init__(self, *, client: SecurityTrailsClient):
+        self.__client = client
 
     async def verify(self,
         api_key: SecurityTrailsAccountApiKey
@@ -1,6 +1,8 @@
 from typing import Protocol, ContextManager, runtime_checkable
 
 from application.UseCases.DnsAnalyzeDomain import DnsAnalyzeDomain
+from application.UseCases.DnsAnalyzeDomains import DnsAnalyzeDomains
+from application.UseCases.DnsStreamDomainAnalysis import DnsStreamDomainAnalysis
 
 
 @runtime_checkable
@@ -8,4 +10,10 @@ class IInteractorFactory(Protocol):
     """IInteractorFactory"""
 
     def analyze_domain(self) -> ContextManager[DnsAnalyzeDomain]:
+        pass
+
+    def analyze_domains(self) -> ContextManager[DnsAnalyzeDomains]:
+        pass
+
+    def stream_domain_analysis(self) -> ContextManager[DnsStreamDomainAnalysis]:
         pass
\ No newline at end of file
@@ -1,5 +1,7 @@
 import asyncio as aio
 
+from asyncio_redis.encoders import BytesEncoder
+
 from config import conf
 
 from integration.interactor import InteractorFactory
@@ -20,7 +22,14 @@ from infrastructure.db.main import (
     get_async_sessionmaker_factory
 )
 from infrastructure.redis.main import get_redis_factory
+from infrastructure.securitytrails.main import get_securitytrails_client_factory
 from infrastructure.repositories.storage.bytes import StrBytesExpiryStorage
+from infrastructure.repositories.storage.summary import DomainSummaryCache
+from infrastructure.repositories.storage.progress import DomainProgressRegistry
+from infrastructure.repositories.storage.negative import NegativeDomainCache
+from infrastructure.repositories.storage.jobs import AnalysisJobStore
+from infrastructure.repositories.db.dns.store import DnsHistoryStore
+from infrastructure.offload import Offloader
 from infrastructure.services.securitytrails.api_key import SecurityTrailsApiKeyService
 
 
@@ -34,6 +43,66 @@ async def main(loop: aio.AbstractEventLoop):
     redis_client = await get_redis_factory(conf.redis, conf.securitytrails_provider.redis_db)
     provider_storage = StrBytesExpiryStorage(client=redis_client, key='provider:uuids')
 
+    securitytrails_client_factory = get_securitytrails_client_factory(conf.securitytrails_client, conf.redis)
+    securitytrails_client = await anext(securitytrails_client_factory)
+
+    summary_cache = summary_redis = None
+    if conf.summary_cache.is_enabled:
+        summary_redis = await get_redis_factory(conf.redis, conf.summary_cache.redis_db, BytesEncoder())
+        summary_cache = DomainSummaryCache(
+            client=summary_redis,
+            fresh_ttl=conf.summary_cache.fresh_ttl,
+            stale_ttl=conf.summary_cache.stale_ttl,
+            beta=conf.summary_cache.early_expiry_beta
+        )
+
+    progress_registry = progress_redis = None
+    if conf.progress_registry.is_enabled:
+        progress_redis = await get_redis_factory(conf.redis, conf.progress_registry.redis_db, BytesEncoder())
+        progress_registry = DomainProgressRegistry(
+            client=progress_redis,
+            lease_ttl=conf.progress_registry.lease_ttl,
+            result_ttl=conf.progress_registry.result_ttl,
+            poll_interval=conf.progress_registry.poll_interval
+        )
+        progress_registry.start()
+
+    history_store = None
+    if conf.dns_history_store.is_enabled:
+        history_store = DnsHistoryStore(
+            session_factory=db_session_factory,
+            max_age=conf.dns_history_store.max_age
+        )
+
+    negative_cache = negative_redis = None
+    if conf.negative_cache.is_enabled:
+        negative_redis = await get_redis_factory(conf.redis, conf.negative_cache.redis_db)
+        negative_cache = NegativeDomainCache(
+            storage=StrBytesExpiryStorage(client=negative_redis, key='negative:domains'),
+            ttl=conf.negative_cache.ttl,
+            capacity=conf.negative_cache.capacity,
+            error_rate=conf.negative_cache.error_rate,
+            max_error_rate=conf.negative_cache.max_error_rate,
+            rebuild_interval=conf.negative_cache.rebuild_interval
+        )
+        await negative_cache.start()
+
+    offloader = None
+    if conf.offload.is_enabled:
+        offloader = Offloader(
+            mode=conf.offload.mode,
+            workers=conf.offload.workers,
+            min_size=conf.offload.min_rows
+        )
+
+    analysis_jobs = jobs_redis = None
+    if conf.analysis_jobs.is_enabled:
+        jobs_redis = await get_redis_factory(conf.redis, conf.analysis_jobs.redis_db, BytesEncoder())
+        analysis_jobs = AnalysisJobStore(
+            client=jobs_redis,
+            ttl=conf.analysis_jobs.ttl
+        )
+
     consumer =  AsyncConsumer(config=conf.rabbitmq, loop=loop)
 
     securitytrails_producer = SecurityTrailsApiKeyProducer(config=conf.securitytrails_gateway)
@@ -47,7 +116,7 @@ async def main(loop: aio.AbstractEventLoop):
         producer=securitytrails_producer,
         module=securitytrails_module,
         storage=provider_storage,
-        service=SecurityTrailsApiKeyService()
+        service=SecurityTrailsApiKeyService(client=securitytrails_client)
     )
     securitytrails_channel = SecurityTrailsApiKeyChannel(
         config=conf.securitytrails_gateway,
@@ -57,7 +126,15 @@ async def main(loop: aio.AbstractEventLoop):
     )
 
     ioc = InteractorFactory(
-        provider=securitytrails_provider
+        provider=securitytrails_provider,
+        client=securitytrails_client,
+        summary_cache=summary_cache,
+        registry=progress_registry,
+        history_store=history_store,
+        negative_cache=negative_cache,
+        batch_concurrency=conf.service_gateway.batch_concurrency,
+        batch_max_domains=conf.service_gateway.batch_max_domains,
+        fast_reply=conf.service_gateway.fast_reply
     )
 
     gateway_producer = GatewayProducer(
@@ -66,8 +143,13 @@ async def main(loop: aio.AbstractEventLoop):
 
     gateway_domain_controller = DomainController(
         ioc=ioc,
-        producer=gateway_producer
+        producer=gateway_producer,
+        offloader=offloader,
+        jobs=analysis_jobs,
+        job_workers=conf.analysis_jobs.workers,
+        job_queue_size=conf.analysis_jobs.queue_size
     )
+    gateway_domain_controller.start()
 
     rpc_gateway_channel = RpcGatewayChannel(
         config=conf.service_gateway,
@@ -83,4 +165,29 @@ async def main(loop: aio.AbstractEventLoop):
     await consumer.connect()
 
     initialize_provider = securitytrails_provider.initialize()
-    loop.create_task(initialize_provider)
\ No newline at end of file
+    loop.create_task(initialize_provider)
+
+    async def shutdown():
+        """shutdown"""
+
+        await consumer.disconnect()
+        await gateway_domain_controller.shutdown()
+        if jobs_redis is not None:
+            jobs_redis.close()
+        await securitytrails_provider.shutdown()
+        redis_client.close()
+        if summary_cache is not None:
+            await summary_cache.shutdown()
+            summary_redis.close()
+        if progress_registry is not None:
+            await progress_registry.shutdown()
+            progress_redis.close()
+        if negative_cache is not None:
+            await negative_cache.shutdown()
+            negative_redis.close()
+        if offloader is not None:
+            offloader.shutdown()
+        await anext(securitytrails_client_factory, None)
+        await anext(db_engine_factory, None)
+
+    return shutdown
\ No newline at end of file
@@ -0,0 +1,11 @@
+from typing import Protocol, Optional
+
+
+class IAnalysisJobStore(Protocol):
+    """IAnalysisJobStore"""
+
+    async def put(self, job_id: str, body: bytes) -> bool:
+        pass
+
+    async def get(self, job_id: str) -> Optional[bytes]:
+        pass
\ No newline at end of file
@@ -7,4 +7,13 @@ class IDomainController(Protocol):
     """IDomainController"""
 
     async def analyze(self, request: RpcRequest) -> None:
+        pass
+
+    async def analyze_batch(self, request: RpcRequest) -> None:
+        pass
+
+    async def submit_analysis(self, request: RpcRequest) -> None:
+        pass
+
+    async def get_analysis_result(self, request: RpcRequest) -> None:
         pass
\ No newline at end of file
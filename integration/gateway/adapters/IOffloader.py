@@ -0,0 +1,11 @@
+from typing import Protocol, Callable, TypeVar, Any
+
+
+T = TypeVar('T')
+
+
+class IOffloader(Protocol):
+    """IOffloader"""
+
+    async def run(self, size: int, job: Callable[..., T], *args: Any) -> T:
+        pass
\ No newline at end of file
@@ -3,15 +3,17 @@ from aio_pika import IncomingMessage
 from typing import (
     Protocol,
     Optional,
-    Any,
-    Dict
+    Sequence
 )
 
 
 class IProducer(Protocol):
     """IProducer"""
 
-    async def reply_domain_analysis(self, *, message: IncomingMessage, data: Dict[str, Any]) -> None:
+    async def reply_domain_analysis(self, *, message: IncomingMessage, body: bytes) -> None:
+        pass
+
+    async def reply_domain_analyses(self, *, messages: Sequence[IncomingMessage], body: bytes) -> None:
         pass
 
     @property
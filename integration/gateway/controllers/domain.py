@@ -1,35 +1,306 @@
 import logging
 
+import asyncio as aio
+
+from aio_pika import IncomingMessage
+from datetime import datetime, timezone
+from json import dumps
+from uuid import uuid4
+
+from typing import Any, Dict, Hashable, List, Optional
+
+from utils.cancel_tasks import cancel_all
+from utils.normalize_domain import normalize_domain
+
 from integration.adapters.IInteractorFactory import IInteractorFactory
 from integration.gateway.adapters.IProducer import IProducer
+from integration.gateway.adapters.IOffloader import IOffloader
+from integration.gateway.adapters.IAnalysisJobStore import IAnalysisJobStore
 from integration.gateway.models.request import RpcRequest
+from integration.gateway.models.jobs import JobStatus
 
-from application.Dto.dns import DomainAnalysisInputDTO, DomainAnalysisOutputDTO
+from application.Dto.dns import (
+    ResultCode,
+    StreamSection,
+    DomainAnalysisInputDTO,
+    DomainAnalysisOutputDTO,
+    TAnalysisResult,
+    BatchAnalysisInputDTO,
+    BatchAnalysisSummaryDTO
+)
+from application.Dto.mappers.reply import TReply, reply_size, encode_reply
 
 
 logger = logging.getLogger('DomainController')
 
 
+JOB_WRITE_ATTEMPTS = 3
+JOB_WRITE_DELAY = 0.5
+
+
+def _request_key(data: Dict[str, Any]) -> Optional[Hashable]:
+    """Requests sharing the key get the same reply, None when they can not be told apart safely."""
+
+    domain = normalize_domain(data.get('domain'))
+    if not isinstance(domain, str): return None
+    # Deep analyses are still shared by the use case, their options are just not compared here.
+    if data.get('deep') not in (None, False): return None
+
+    sections, records = data.get('sections'), data.get('records')
+    try:
+        return (
+            domain,
+            None if sections is None else frozenset(sections),
+            None if records is None else frozenset(records)
+        )
+    except TypeError:
+        return None
+
+def _timeout(data: Dict[str, Any]) -> Optional[float]:
+    """The `timeout` in the request data, in seconds, None when missing or invalid."""
+
+    timeout = data.get('timeout')
+    if isinstance(timeout, (int, float)) and not isinstance(timeout, bool) and timeout > 0:
+        return float(timeout)
+    return None
+
+def _deadline(request: RpcRequest) -> Optional[float]:
+    """
+    Deadline of the request in event loop time, the earliest of the `timeout` in its data and of its AMQP
+    `expiration`, counted from the message `timestamp` when it has one so time spent queued is deducted.
+    """
+
+    timeout = _timeout(request.data)
+    timeouts = timeout is not None and [timeout] or []
+
+    message = request.message
+    if message.expiration is not None:
+        queued = 0.0
+        if message.timestamp is not None:
+            sent_at = message.timestamp.tzinfo and message.timestamp or message.timestamp.replace(tzinfo=timezone.utc)
+            queued = max(0.0, (datetime.now(timezone.utc) - sent_at).total_seconds())
+        timeouts.append(message.expiration - queued)
+
+    return timeouts and aio.get_running_loop().time() + min(timeouts) or None
+
+def _job_body(job_id: Optional[str], status: str) -> bytes:
+    """_job_body"""
+
+    return dumps({ 'job_id': job_id, 'status': status }).encode()
+
+def _input(data: Dict[str, Any], deadline: Optional[float]=None) -> DomainAnalysisInputDTO:
+    """_input"""
+
+    return DomainAnalysisInputDTO(
+        domain=data.get('domain'),
+        sections=data.get('sections'),
+        records=data.get('records'),
+        deep=data.get('deep'),
+        deadline=deadline
+    )
+
+
 class DomainController:
-    """DomainController"""
+    """
+    DomainController, requests for a domain already being analyzed join the running analysis
+    and its single result is replied to every `reply_to`/`correlation_id` that asked for it.
+    Requests with `stream` set get a reply per finished section instead, numbered by `seq`,
+    the last one has `final` set and carries the result code. Requests with a deadline are answered
+    on their own, with the `partial` code and the missing sections when it hits.
+    Batches get a reply per domain as it is done and a summary last, numbered and flagged the same way.
+    With an offloader large replies are mapped to their JSON body in its pool, off the event loop.
+    Submitted analyses are answered with a job id right away and run by `job_workers` from a queue of
+    `job_queue_size`, a burst waits there rather than analyzing at once and a full queue rejects the job.
+    The result is kept in the job store, read by `get_analysis_result`, and replied once more to the
+    submitter with `notify` set. Jobs honor the `timeout` in their data, counted from when they start.
+    """
 
     def __init__(self, *,
         ioc: IInteractorFactory,
-        producer: IProducer
+        producer: IProducer,
+        offloader: Optional[IOffloader]=None,
+        jobs: Optional[IAnalysisJobStore]=None,
+        job_workers: int=4,
+        job_queue_size: int=1000
     ):
         self.__ioc = ioc
         self.__producer = producer
+        self.__offloader = offloader
+        self.__jobs = jobs
+        self.__job_workers = job_workers
+        self.__waiting: Dict[Hashable, List[IncomingMessage]] = {}
+        self.__pending: aio.Queue = aio.Queue(job_queue_size)
+        # Queue slots taken by submissions still writing their job, so `put_nowait` always has room.
+        self.__reserved = 0
+        self.__workers: List[aio.Task] = []
+
+    def start(self) -> None:
+        if self.__jobs is not None and not self.__workers:
+            self.__workers = [aio.create_task(self.__work()) for _ in range(self.__job_workers)]
+
+    async def shutdown(self) -> None:
+        await cancel_all(set(self.__workers))
+        self.__workers = []
 
     async def analyze(self, request: RpcRequest) -> None:
-        domain_name = request.data.get('domain')
-        logger.info(f'Analyzing domain: {domain_name}.')
-        async with self.__ioc.analyze_domain() as analyze_domain:
-            result: DomainAnalysisOutputDTO = await analyze_domain(DomainAnalysisInputDTO(
-                domain=domain_name
-            ))
+        deadline = _deadline(request)
+        if request.data.get('stream') is True:
+            return await self.__stream(request, deadline)
+
+        key = deadline is None and _request_key(request.data) or None
+        if key is None:
+            result = await self.__analyze(request.data, deadline)
+            return await self.__reply([request.message], result)
+
+        waiting = self.__waiting.get(key)
+        if waiting is not None:
+            logger.info(f'Joining the running analysis of: {key[0]}.')
+            waiting.append(request.message)
+            return
+
+        self.__waiting[key] = waiting = [request.message]
+        try:
+            result = await self.__analyze(request.data)
+        except Exception as exp:
+            # Every joined request waits on this reply, a failure is replied to all of them.
+            logger.exception(f'Failed to analyze domain: {key[0]}.')
+            result = DomainAnalysisOutputDTO(code=ResultCode.FAILED)
+        finally:
+            # Requests arriving from now on start a new analysis.
+            self.__waiting.pop(key, None)
+
+        await self.__reply(waiting, result)
+
+    async def analyze_batch(self, request: RpcRequest) -> None:
+        data = request.data
+        domains = data.get('domains')
+        logger.info(f'Analyzing batch of {isinstance(domains, list) and len(domains) or 0} domains.')
+        async with self.__ioc.analyze_domains() as analyze_domains:
+            seq = 0
+            async for reply in analyze_domains(BatchAnalysisInputDTO(
+                domains=domains,
+                sections=data.get('sections'),
+                records=data.get('records'),
+                deep=data.get('deep'),
+                deadline=_deadline(request),
+                concurrency=data.get('concurrency')
+            )):
+                body = await self.__encode(reply, { 'seq': seq, 'final': isinstance(reply, BatchAnalysisSummaryDTO) })
+                if body is not None:
+                    await self.__producer.reply_domain_analysis(message=request.message, body=body)
+                seq += 1
+
+    async def submit_analysis(self, request: RpcRequest) -> None:
+        if self.__jobs is None:
+            return await self.__producer.reply_domain_analysis(
+                message=request.message,
+                body=_job_body(None, JobStatus.DISABLED)
+            )
+
+        job_id = uuid4().hex
+        status = JobStatus.QUEUED
+        notify = request.data.get('notify') is True and request.message or None
+        if not self.__has_room():
+            logger.warning(f'Job queue is full, rejecting analysis of: {request.data.get("domain")}.')
+            job_id, status = None, JobStatus.REJECTED
+        else:
+            self.__reserved += 1
+            try:
+                is_stored = await self.__jobs.put(job_id, _job_body(job_id, status))
+            finally:
+                self.__reserved -= 1
+
+            if is_stored:
+                self.__pending.put_nowait((job_id, request.data, notify))
+            else:
+                job_id, status = None, JobStatus.REJECTED
+
+        await self.__producer.reply_domain_analysis(message=request.message, body=_job_body(job_id, status))
+
+    async def get_analysis_result(self, request: RpcRequest) -> None:
+        job_id = request.data.get('job_id')
+        body = None
+        if self.__jobs is None:
+            body = _job_body(None, JobStatus.DISABLED)
+        elif isinstance(job_id, str):
+            body = await self.__jobs.get(job_id)
 
-        dicted = result.to_dict()
         await self.__producer.reply_domain_analysis(
             message=request.message,
-            data=dicted
-        )
\ No newline at end of file
+            body=body or _job_body(isinstance(job_id, str) and job_id or None, JobStatus.UNKNOWN)
+        )
+
+    async def __work(self) -> None:
+        while True:
+            job_id, data, notify = await self.__pending.get()
+            try:
+                await self.__run_job(job_id, data, notify)
+            except Exception as exp:
+                logger.exception(f'Failed to run job: {job_id}.')
+
+    async def __run_job(self, job_id: str, data: Dict[str, Any], notify: Optional[IncomingMessage]) -> None:
+        await self.__jobs.put(job_id, _job_body(job_id, JobStatus.RUNNING))
+
+        timeout = _timeout(data)
+        deadline = timeout is not None and aio.get_running_loop().time() + timeout or None
+        body = None
+        try:
+            result = await self.__analyze(data, deadline)
+            body = await self.__encode(result, { 'job_id': job_id, 'status': JobStatus.DONE })
+        except Exception as exp:
+            logger.exception(f'Failed to analyze job: {job_id}.')
+
+        body = body or _job_body(job_id, JobStatus.FAILED)
+        if not await self.__store_job(job_id, body):
+            # The job stays `running` until it expires, the submitter is told it failed rather than left polling.
+            logger.error(f'Failed to store the result of job: {job_id}.')
+            body = _job_body(job_id, JobStatus.FAILED)
+        if notify is not None:
+            await self.__producer.reply_domain_analysis(message=notify, body=body)
+
+    def __has_room(self) -> bool:
+        pending = self.__pending
+        return pending.maxsize <= 0 or pending.qsize() + self.__reserved < pending.maxsize
+
+    async def __store_job(self, job_id: str, body: bytes) -> bool:
+        """Write the job, retrying a failed write, False when every attempt failed."""
+
+        for attempt in range(JOB_WRITE_ATTEMPTS):
+            if attempt:
+                await aio.sleep(JOB_WRITE_DELAY * attempt)
+            if await self.__jobs.put(job_id, body):
+                return True
+        return False
+
+    async def __stream(self, request: RpcRequest, deadline: Optional[float]) -> None:
+        data = request.data
+        logger.info(f'Streaming analysis of domain: {data.get("domain")}.')
+        async with self.__ioc.stream_domain_analysis() as stream_analysis:
+            seq = 0
+            async for part in stream_analysis(_input(data, deadline)):
+                body = await self.__encode(part, { 'seq': seq, 'final': part.section == StreamSection.FINAL })
+                if body is not None:
+                    await self.__producer.reply_domain_analysis(message=request.message, body=body)
+                seq += 1
+
+    async def __analyze(self, data: Dict[str, Any], deadline: Optional[float]=None) -> TAnalysisResult:
+        domain_name = data.get('domain')
+        logger.info(f'Analyzing domain: {domain_name}.')
+        async with self.__ioc.analyze_domain() as analyze_domain:
+            return await analyze_domain(_input(data, deadline))
+
+    async def __reply(self, messages: List[IncomingMessage], result: TAnalysisResult) -> None:
+        body = await self.__encode(result)
+        if body is not None:
+            await self.__producer.reply_domain_analyses(messages=messages, body=body)
+
+    async def __encode(self, reply: TReply, extra: Dict[str, Any]=dict()) -> Optional[bytes]:
+        """The JSON body of the reply, None when it does not serialize."""
+
+        try:
+            if self.__offloader is None:
+                return encode_reply(reply, extra)
+            return await self.__offloader.run(reply_size(reply), encode_reply, reply, extra)
+        except TypeError as exp:
+            logger.exception(f'Failed to dump reply to json: {reply}.')
+        return None
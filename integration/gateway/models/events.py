@@ -2,6 +2,9 @@ class ConsumerEvents:
     """ConsumerEvents"""
 
     ANALYZE_DOMAIN = 'analyze_domain'
+    ANALYZE_DOMAINS = 'analyze_domains'
+    SUBMIT_ANALYSIS = 'submit_analysis'
+    GET_ANALYSIS_RESULT = 'get_analysis_result'
 
     @classmethod
     def is_valid(cls, value: str) -> bool:
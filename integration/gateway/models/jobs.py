@@ -0,0 +1,10 @@
+class JobStatus:
+    """JobStatus, `rejected` jobs were never queued, `unknown` ones expired or never existed."""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    REJECTED = 'rejected'
+    DISABLED = 'disabled'
+    UNKNOWN = 'unknown'
\ No newline at end of file
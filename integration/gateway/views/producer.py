@@ -1,8 +1,6 @@
 import logging
 
-from json import dumps
-
-from typing import Optional, Any, Dict
+from typing import Optional, Sequence
 
 from aio_pika import (
     ExchangeType,
@@ -51,29 +49,30 @@ class GatewayProducer(AsyncProducerBase):
     async def shutdown(self) -> None:
         self.__channel = None
 
-    async def reply_domain_analysis(self, *, message: IncomingMessage, data: Dict[str, Any]) -> None:
+    async def reply_domain_analysis(self, *, message: IncomingMessage, body: bytes) -> None:
+        await self.reply_domain_analyses(messages=(message,), body=body)
+
+    async def reply_domain_analyses(self, *, messages: Sequence[IncomingMessage], body: bytes) -> None:
+        """Reply the same JSON body to every message, the controller encodes it once."""
+
         if not self.allowed:
             return logger.warn(f'Could not produce, channel bad state.')
 
-        try:
-            jsonified = dumps(data)
-        except TypeError as exp:
-            return logger.exception(f'Failed to dump data to json: {data}.')
-
-        properties = {
-            'content_type': 'application/json',
-            'delivery_mode': DeliveryMode.NOT_PERSISTENT,
-            'reply_to': message.reply_to,
-            'correlation_id': message.correlation_id
-        }
-
-        await self.__channel.default_exchange.publish(
-            message=Message(
-                body=jsonified.encode(),
-                **properties
-            ),
-            routing_key=self.__config.producer_routing_key
-        )
+        for message in messages:
+            properties = {
+                'content_type': 'application/json',
+                'delivery_mode': DeliveryMode.NOT_PERSISTENT,
+                'reply_to': message.reply_to,
+                'correlation_id': message.correlation_id
+            }
+
+            await self.__channel.default_exchange.publish(
+                message=Message(
+                    body=body,
+                    **properties
+                ),
+                routing_key=self.__config.producer_routing_key
+            )
 
     @property
     def allowed(self) -> bool:
@@ -103,6 +103,15 @@ class RpcGatewayChannel(AsyncChannelBase):
                     case ConsumerEvents.ANALYZE_DOMAIN:
                         coroutine = self.__controller.analyze(request)
                         self.__add_task(coroutine)
+                    case ConsumerEvents.ANALYZE_DOMAINS:
+                        coroutine = self.__controller.analyze_batch(request)
+                        self.__add_task(coroutine)
+                    case ConsumerEvents.SUBMIT_ANALYSIS:
+                        coroutine = self.__controller.submit_analysis(request)
+                        self.__add_task(coroutine)
+                    case ConsumerEvents.GET_ANALYSIS_RESULT:
+                        coroutine = self.__controller.get_analysis_result(request)
+                        self.__add_task(coroutine)
                     case _:
                         logger.warning(f'Unexpected event encountered: {request.event}.')
 
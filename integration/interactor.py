@@ -1,23 +1,76 @@
 from contextlib import asynccontextmanager
 
-from typing import AsyncIterator
+from typing import AsyncIterator, Optional
 
 from application.adapters.securitytrails.ISecurityTrailsAccountProvider import ISecurityTrailsAccountProvider
+from application.adapters.IDomainSummaryCache import IDomainSummaryCache
+from application.adapters.IAnalysisCoalescer import IAnalysisCoalescer
+from application.adapters.IAnalysisRegistry import IAnalysisRegistry
 from application.UseCases.DnsAnalyzeDomain import DnsAnalyzeDomain
+from application.UseCases.DnsAnalyzeDomains import DnsAnalyzeDomains
+from application.UseCases.DnsStreamDomainAnalysis import DnsStreamDomainAnalysis
 
 from domain.Services.dns import DomainDnsService
 
+from infrastructure.adapters.IDnsHistoryStore import IDnsHistoryStore
+from infrastructure.adapters.INegativeDomainCache import INegativeDomainCache
 from infrastructure.services.dns import DnsAnalyzeService
 
+from libs.securitytrails.client import SecurityTrailsClient
+from libs.securitytrails.singleflight import SingleFlight
+
 
 class InteractorFactory:
     """InteractorFactory"""
 
-    def __init__(self, *, provider: ISecurityTrailsAccountProvider):
-        self.__analyze_service = DnsAnalyzeService(provider=provider, service=DomainDnsService())
+    def __init__(self, *,
+        provider: ISecurityTrailsAccountProvider,
+        client: SecurityTrailsClient,
+        summary_cache: Optional[IDomainSummaryCache]=None,
+        registry: Optional[IAnalysisRegistry]=None,
+        history_store: Optional[IDnsHistoryStore]=None,
+        negative_cache: Optional[INegativeDomainCache]=None,
+        batch_concurrency: int=4,
+        batch_max_domains: int=1000,
+        fast_reply: bool=False
+    ):
+        self.__analyze_service = DnsAnalyzeService(provider=provider, service=DomainDnsService(),
+                                                   client=client, history_store=history_store,
+                                                   negative_cache=negative_cache)
+        self.__provider = provider
+        self.__batch_concurrency = batch_concurrency
+        self.__batch_max_domains = batch_max_domains
+        self.__fast_reply = fast_reply
+        self.__summary_cache = summary_cache
+        self.__registry = registry
+        # Shared by every use case instance, concurrent analyses of a domain collapse into one.
+        self.__coalescer: IAnalysisCoalescer = SingleFlight()
 
     @asynccontextmanager
     async def analyze_domain(self) -> AsyncIterator[DnsAnalyzeDomain]:
-        yield DnsAnalyzeDomain(
-            service=self.__analyze_service
+        yield self.__analyze_domain()
+
+    @asynccontextmanager
+    async def analyze_domains(self) -> AsyncIterator[DnsAnalyzeDomains]:
+        yield DnsAnalyzeDomains(
+            analyze=self.__analyze_domain(),
+            provider=self.__provider,
+            concurrency=self.__batch_concurrency,
+            max_domains=self.__batch_max_domains
+        )
+
+    @asynccontextmanager
+    async def stream_domain_analysis(self) -> AsyncIterator[DnsStreamDomainAnalysis]:
+        yield DnsStreamDomainAnalysis(
+            service=self.__analyze_service,
+            cache=self.__summary_cache
+        )
+
+    def __analyze_domain(self) -> DnsAnalyzeDomain:
+        return DnsAnalyzeDomain(
+            service=self.__analyze_service,
+            cache=self.__summary_cache,
+            coalescer=self.__coalescer,
+            registry=self.__registry,
+            fast_reply=self.__fast_reply
         )
\ No newline at end of file
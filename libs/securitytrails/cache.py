@@ -0,0 +1,82 @@
+import logging
+
+from time import monotonic
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from typing import Protocol, Optional, Any, Tuple
+
+
+logger = logging.getLogger('SecurityTrailsClient')
+
+
+class IResponseCache(Protocol):
+    """IResponseCache"""
+
+    async def get(self, key: str) -> Optional[str]:
+        pass
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        pass
+
+
+@dataclass
+class CacheStats:
+    """CacheStats"""
+
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+
+
+class LRUResponseCache:
+    """In-process least recently used cache with per-entry expiry."""
+
+    def __init__(self, *, max_entries: int=1024):
+        if max_entries <= 0: raise ValueError(':max_entries should be greater then zero.')
+
+        self.__max_entries = max_entries
+        self.__entries: OrderedDict[str, Tuple[float, str]] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self.__entries.get(key)
+        if entry is None: return None
+
+        expires_at, value = entry
+        if expires_at <= monotonic():
+            del self.__entries[key]
+            return None
+
+        self.__entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        self.__entries[key] = (monotonic() + ttl, value)
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.__max_entries:
+            self.__entries.popitem(last=False)
+
+    @property
+    def length(self) -> int:
+        return len(self.__entries)
+
+
+class RedisResponseCache:
+    """Redis cache over an asyncio_redis compatible client (`get`, `set` with `expire`)."""
+
+    def __init__(self, *, client: Any, prefix: str='securitytrails:response:'):
+        self.__client = client
+        self.__prefix = prefix
+
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            return await self.__client.get(f'{self.__prefix}{key}')
+        except Exception as exp:
+            logger.exception(f'Failed to read cached response: {key}.')
+        return None
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        try:
+            await self.__client.set(f'{self.__prefix}{key}', value, expire=ttl)
+        except Exception as exp:
+            logger.exception(f'Failed to cache response: {key}.')
@@ -1,9 +1,20 @@
 import logging
 
-from aiohttp import ClientSession
+import asyncio as aio
+
+from aiohttp import ClientSession, ClientResponse, ClientTimeout, TCPConnector
 from http import HTTPStatus as status
 
 from functools import partial
+from dataclasses import replace
+from contextlib import AsyncExitStack
+
+from ssl import SSLContext
+from time import time, monotonic, perf_counter
+from email.utils import parsedate_to_datetime
+
+from collections import Counter
+from typing import Optional, Dict, Mapping, Any, AsyncIterator, Tuple, Callable, Awaitable, List
 
 from .types.records import RecordType
 from .types.data import (
@@ -12,15 +23,28 @@ from .types.data import (
     SubDomainData,
     DnsHistoryData
 )
+from .types.search import DomainSearchPage
 from .types.response import (
     BaseStatus,
-    BaseResponse
+    BaseResponse,
+    RateLimitInfo,
+    StatusError
 )
+from .limiter import KeyRateLimiter
+from .retry import RetryPolicy
+from .singleflight import SingleFlight
+from .hedging import HedgePolicy, HedgeStats
+from .cache import IResponseCache, CacheStats
+from .serialization import dump_response, load_response
+from .streaming import JsonArrayStreamParser
+from .decoders import JSON_DECODER, LOADS, validate_decoder
+from .instrumentation import ClientInstrumentation, ClientMetrics, RequestTrace
 from .mappers import (
     usage_mapper,
     domain_mapper,
     subdomains_mapper,
-    history_dns_mapper
+    history_dns_mapper,
+    domain_search_mapper
 )
 
 
@@ -30,18 +54,127 @@ logger = logging.getLogger('SecurityTrailsClient')
 # Todo: make these types similar to ValueObjects and add custom validation errors.
 DomainT = str
 ApiKeyT = str
+HedgeKeyT = Callable[[], Awaitable[ApiKeyT]]
+# Leases the key only once a request has to go upstream, cache hits and shared calls never call it.
+KeySourceT = Callable[[], Awaitable[ApiKeyT]]
 
 BASE_URL = 'https://api.securitytrails.com/v1'
 ENDPOINTS = {
-    'usage': f'{BASE_URL}/account/usage/',
-    'base_domain': lambda domain: f'{BASE_URL}/domain/{domain}/',
-    'subdomain_list': lambda domain: f'{BASE_URL}/domain/{domain}/subdomains/',
-    'history_dns': lambda domain, record_type: f'{BASE_URL}/history/{domain}/dns/{record_type}/'
+    'usage': lambda: '/account/usage/',
+    'base_domain': lambda domain: f'/domain/{domain}/',
+    'subdomain_list': lambda domain: f'/domain/{domain}/subdomains/',
+    'history_dns': lambda domain, record_type: f'/history/{domain}/dns/{record_type}/',
+    'domains_search': lambda: '/domains/list',
+    'scroll': lambda scroll_id: f'/scroll/{scroll_id}'
+}
+METHODS = {
+    'domains_search': 'POST'
+}
+TIMEOUTS = {
+    'usage': ClientTimeout(total=10, connect=5),
+    'base_domain': ClientTimeout(total=15, connect=5),
+    'subdomain_list': ClientTimeout(total=30, connect=5),
+    'history_dns': ClientTimeout(total=30, connect=5),
+    'domains_search': ClientTimeout(total=60, connect=5),
+    'scroll': ClientTimeout(total=60, connect=5)
 }
+CACHE_TTLS = {
+    'base_domain': 15 * 60,
+    'subdomain_list': 6 * 60 * 60,
+    'history_dns': 24 * 60 * 60
+}
+# Upper bounds of response bodies in bytes, enforced while they stream in.
+BODY_LIMITS = {
+    'usage': 64 * 1024,
+    'base_domain': 4 * 1024 * 1024,
+    'subdomain_list': 32 * 1024 * 1024,
+    'history_dns': 8 * 1024 * 1024,
+    'domains_search': 8 * 1024 * 1024,
+    'scroll': 8 * 1024 * 1024
+}
+CACHEABLE_STATUSES = (
+    BaseStatus.FETCHED,
+    BaseStatus.NO_INFO,
+    # Credits are spent either way, asking again would return the same oversized body.
+    BaseStatus.TOO_LARGE
+)
+# Failures of the key a call was made with, a call sharing it with another key may not fail.
+KEY_STATUSES = (
+    BaseStatus.API_KEY_EXHAUSTED,
+    BaseStatus.UNAUTHORIZED
+)
+SUBDOMAINS_CHUNK_SIZE = 1000
+SEARCH_MAX_PAGES = 100
 STATUS_BY_DETAILS = {
     'The requested domain is invalid': BaseStatus.INVALID_DOMAIN
 }
 
+QUOTA_DETAILS = (
+    'usage limit',
+    'monthly'
+)
+
+def _header_number(headers: Mapping[str, str], name: str, cast=int):
+    """_header_number"""
+
+    try:
+        return cast(headers[name])
+    except (KeyError, ValueError):
+        return None
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse `Retry-After` given either as delay-seconds or as HTTP-date."""
+
+    if value is None: return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time())
+    except (TypeError, ValueError):
+        return None
+
+def _rate_limit_info(headers: Mapping[str, str]) -> RateLimitInfo:
+    """_rate_limit_info"""
+
+    return RateLimitInfo(
+        retry_after=_retry_after(headers.get('Retry-After')),
+        limit_second=_header_number(headers, 'X-RateLimit-Limit-Second'),
+        remaining_second=_header_number(headers, 'X-RateLimit-Remaining-Second'),
+        limit_month=_header_number(headers, 'X-RateLimit-Limit-Month'),
+        remaining_month=_header_number(headers, 'X-RateLimit-Remaining-Month')
+    )
+
+def _too_many_requests_status(rate_limit: RateLimitInfo, details: Dict[str, Any]) -> BaseStatus:
+    """Tell a spent monthly quota apart from short-term throttling."""
+
+    if rate_limit.is_quota_exhausted:
+        return BaseStatus.API_KEY_EXHAUSTED
+
+    message = str(details.get('message') or '').lower()
+    if rate_limit.retry_after is None and any(detail in message for detail in QUOTA_DETAILS):
+        return BaseStatus.API_KEY_EXHAUSTED
+    return BaseStatus.RATE_LIMITED
+
+async def _details(response) -> Dict[str, Any]:
+    """_details"""
+
+    try:
+        details = await response.json(content_type=None)
+    except ValueError:
+        return {}
+    return isinstance(details, dict) and details or {}
+
+async def _resolve_key(api_key: ApiKeyT | KeySourceT) -> ApiKeyT:
+    """_resolve_key"""
+
+    if callable(api_key):
+        return await api_key()
+    return api_key
+
 def _headers(api_key: str):
     """_headers"""
 
@@ -50,42 +183,143 @@ def _headers(api_key: str):
         'Content-Type': 'application/json'
     }
 
-def _params(api_key: str):
+def _params(api_key: str, timeout: ClientTimeout, query: Optional[Dict[str, Any]]=None):
     """_params"""
 
-    return {
-        'headers': _headers(api_key)
+    params = {
+        'headers': _headers(api_key),
+        'timeout': timeout
     }
+    if query: params['params'] = query
+    return params
+
+def _page(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep a history page raw, pages are mapped together once all of them are read."""
+
+    return data
+
+def _page_count(data: Dict[str, Any]) -> int:
+    """_page_count"""
+
+    try:
+        return max(1, int(data.get('pages') or 1))
+    except (TypeError, ValueError):
+        return 1
+
+def _reaches(data: Dict[str, Any], stop_before: Optional[str]) -> bool:
+    """Whether a history page already holds records last seen before the cutoff."""
+
+    if stop_before is None: return False
+
+    records = data.get('records') or []
+    return any((
+        (record.get('last_seen') or stop_before) < stop_before
+        for record in records
+    ))
 
-async def _fetch(url, *, mapper, **params) -> BaseResponse:
+async def _read_limited(response: ClientResponse, limit: Optional[int]) -> Optional[bytes]:
+    """Read the body unless it grows past `limit` bytes, it is never buffered beyond the limit."""
+
+    if limit is None: return await response.read()
+
+    if (response.content_length or 0) > limit: return None
+
+    body = bytearray()
+    async for data in response.content.iter_any():
+        body += data
+        if len(body) > limit: return None
+    return bytes(body)
+
+async def _prefetched(
+    fetch_page: Callable[[Any], Awaitable[BaseResponse[DomainSearchPage]]],
+    first: Any,
+    next_cursor: Callable[[DomainSearchPage], Optional[Any]]
+) -> AsyncIterator[DomainSearchPage]:
+    """Yield pages while the next one is already being fetched, `next_cursor` returns None on the last page."""
+
+    task = aio.ensure_future(fetch_page(first))
+    try:
+        while task is not None:
+            response, task = await task, None
+            if response.status is not BaseStatus.FETCHED or response.response is None:
+                raise StatusError(response)
+
+            cursor = next_cursor(response.response)
+            if cursor is not None:
+                task = aio.ensure_future(fetch_page(cursor))
+            yield response.response
+    finally:
+        if task is not None:
+            task.cancel()
+
+async def _fetch(session: ClientSession, url, *,
+    mapper,
+    loads,
+    method: str='GET',
+    limit: Optional[int]=None,
+    trace: Optional[RequestTrace]=None,
+    **params
+) -> BaseResponse:
     """_fetch"""
 
-    async with ClientSession() as session:
-        async with session.get(url, **params) as response:
-            match response.status:
-                case status.OK:
-                    data = await response.json()
-                    return BaseResponse(status=BaseStatus.FETCHED, response=mapper(data))
+    async with session.request(method, url, trace_request_ctx=trace, **params) as response:
+        if response.status != status.OK:
+            return await _status_response(response, url)
+
+        body = await _read_limited(response, limit)
+        if body is None:
+            logger.warning(f'Response body of {url} is larger than {limit} bytes, dropping it.')
+            return BaseResponse(status=BaseStatus.TOO_LARGE)
+        if trace is None:
+            return BaseResponse(status=BaseStatus.FETCHED, response=mapper(loads(body)))
+
+        read = perf_counter()
+        trace.bytes = len(body)
+        data = loads(body)
+        decoded = perf_counter()
+        mapped = mapper(data)
+        trace.body, trace.decode, trace.mapping = read - trace.headers_at, decoded - read, perf_counter() - decoded
+        return BaseResponse(status=BaseStatus.FETCHED, response=mapped)
 
-                case status.TOO_MANY_REQUESTS:
-                    return BaseResponse(status=BaseStatus.API_KEY_EXHAUSTED)
+async def _first_fetched(tasks: List[aio.Task]) -> aio.Task:
+    """Wait for the first task answering FETCHED, otherwise the first one that did not fail, in `tasks` order."""
 
-                case status.BAD_REQUEST:
-                    details = await response.json()
-                    detailed_status = STATUS_BY_DETAILS.get(details.get('message'))
-                    if detailed_status is None:
-                        logger.warning(f'Received unknown details: {details} from {url}.')
-                    return BaseResponse(status=detailed_status or BaseResponse.UNDEFINED)
+    pending = set(tasks)
+    while pending:
+        done, pending = await aio.wait(pending, return_when=aio.FIRST_COMPLETED)
+        for task in tasks:
+            if task in done and task.exception() is None and task.result().status is BaseStatus.FETCHED:
+                return task
 
-                case status.UNAUTHORIZED:
-                    return BaseResponse(status=BaseStatus.UNAUTHORIZED)
+    answered = [task for task in tasks if task.exception() is None]
+    return answered and answered[0] or tasks[0]
 
-                case status.NOT_FOUND:
-                    return BaseResponse(status=BaseStatus.NO_INFO)
+async def _status_response(response: ClientResponse, url) -> BaseResponse:
+    """Map a response other than 200 OK to its `BaseStatus`."""
 
-                case _:
-                    logger.warning(f'Encountered unknown server reponse status: {response.status}.')
-                    return BaseResponse(status=BaseStatus.UNDEFINED)
+    match response.status:
+        case status.TOO_MANY_REQUESTS:
+            rate_limit = _rate_limit_info(response.headers)
+            details = await _details(response)
+            return BaseResponse(status=_too_many_requests_status(rate_limit, details),
+                                rate_limit=rate_limit)
+
+        case status.BAD_REQUEST:
+            details = await _details(response)
+            detailed_status = STATUS_BY_DETAILS.get(details.get('message'))
+            if detailed_status is None:
+                logger.warning(f'Received unknown details: {details} from {url}.')
+            return BaseResponse(status=detailed_status or BaseStatus.UNDEFINED)
+
+        case status.UNAUTHORIZED:
+            return BaseResponse(status=BaseStatus.UNAUTHORIZED)
+
+        case status.NOT_FOUND:
+            return BaseResponse(status=BaseStatus.NO_INFO)
+
+        case _:
+            logger.warning(f'Encountered unknown server reponse status: {response.status}.')
+            return BaseResponse(status=BaseStatus.UNDEFINED)
 
 
 class SecurityTrailsClient:
@@ -98,33 +332,547 @@ class SecurityTrailsClient:
         - get_domain                Domain information endpoints that return various information about domains.
         - get_subdomain             Returns subdomains for a given domain.
         - get_history_dns           Lists out specific historical information about the given domain parameter.
+        - iter_subdomains           Streams subdomains for a given domain in chunks, parsing the body incrementally.
+        - iter_domains_search       Pages through domains matching a search filter, e.g. sharing an IP or a nameserver.
+        - iter_domains_scroll       Same as `iter_domains_search` through the scroll API, past the search page limit.
+        - iter_domains_by_ip        Pages through domains resolving to an IPv4 address.
+        - iter_domains_by_nameserver Pages through domains served by a nameserver.
+
+        Lifecycle
+        The client owns a single pooled `ClientSession` (keep-alive, DNS cache, per-host limits),
+        it has to be opened with `start` and released with `aclose`, or used as an async context manager.
+
+        Pacing
+        An optional `KeyRateLimiter` paces requests per api key, the time spent waiting
+        for a slot is reported on `BaseResponse.waited`.
+
+        Hedging
+        With a `HedgePolicy` a request still in flight after a percentile of the recent latency of
+        its endpoint is sent again, with the key returned by the call's `hedge_key` when given.
+        The first response wins and the other one is cancelled, extra credits are capped per window and reported.
+
+        Body limits
+        Bodies are read up to a per-endpoint byte limit (`body_limits`, None disables it), a larger one
+        is dropped while it streams in and answered with `BaseStatus.TOO_LARGE`, see `rejected_too_large`.
+
+        Instrumentation
+        A `ClientInstrumentation` hooks into the session's trace config and records per-endpoint and
+        per-status latency histograms, phase timings (dns, connect, ttfb, body, decode, mapping) and byte counts.
+
+        Decoding
+        `decoder='json'` decodes with the stdlib parser and builds records by keyword, `decoder='fast'`
+        decodes the raw body (orjson when installed) and builds slotted records positionally.
+        Both produce identical values, the decoder can be switched at runtime.
     """
 
+    def __init__(self, *,
+        base_url: str=BASE_URL,
+        limit: int=100,
+        limit_per_host: int=20,
+        keepalive_timeout: float=30,
+        dns_cache_ttl: int=300,
+        timeouts: Optional[Dict[str, ClientTimeout]]=None,
+        ssl: bool | SSLContext=True,
+        limiter: Optional[KeyRateLimiter]=None,
+        retry: Optional[RetryPolicy]=None,
+        single_flight: Optional[SingleFlight]=None,
+        cache: Optional[IResponseCache]=None,
+        cache_ttls: Optional[Dict[str, int]]=None,
+        history_max_pages: int=10,
+        history_page_concurrency: int=3,
+        decoder: str=JSON_DECODER,
+        hedge: Optional[HedgePolicy]=None,
+        instrumentation: Optional[ClientInstrumentation]=None,
+        body_limits: Optional[Dict[str, Optional[int]]]=None
+    ):
+        self.__base_url = base_url.rstrip('/')
+        self.__limit = limit
+        self.__limit_per_host = limit_per_host
+        self.__keepalive_timeout = keepalive_timeout
+        self.__dns_cache_ttl = dns_cache_ttl
+        self.__timeouts = { **TIMEOUTS, **(timeouts or {}) }
+        self.__ssl = ssl
+        self.__limiter = limiter
+        self.__retry = retry
+        self.__single_flight = single_flight
+        self.__cache = cache
+        self.__cache_ttls = { **CACHE_TTLS, **(cache_ttls or {}) }
+        self.__cache_stats = CacheStats()
+        self.__history_max_pages = history_max_pages
+        self.__history_page_concurrency = history_page_concurrency
+        self.__decoder = validate_decoder(decoder)
+        self.__hedge = hedge
+        self.__instrumentation = instrumentation
+        self.__body_limits = { **BODY_LIMITS, **(body_limits or {}) }
+        self.__rejected_too_large: Counter = Counter()
+        self.__session: Optional[ClientSession] = None
+
+    async def start(self) -> None:
+        """Open the pooled session, calling it on a started client is a no-op."""
+
+        if self.is_started: return
+
+        connector = TCPConnector(
+            limit=self.__limit,
+            limit_per_host=self.__limit_per_host,
+            keepalive_timeout=self.__keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self.__dns_cache_ttl,
+            enable_cleanup_closed=True,
+            ssl=self.__ssl
+        )
+        trace_configs = self.__instrumentation and [self.__instrumentation.trace_config] or None
+        self.__session = ClientSession(connector=connector, trace_configs=trace_configs)
+
+    async def aclose(self) -> None:
+        """Close the pooled session and release all kept-alive connections."""
+
+        if self.__session is None: return
+
+        session, self.__session = self.__session, None
+        await session.close()
+
+    async def __aenter__(self) -> 'SecurityTrailsClient':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    @property
+    def is_started(self) -> bool:
+        return self.__session is not None and not self.__session.closed
+
+    @property
+    def limiter(self) -> Optional[KeyRateLimiter]:
+        return self.__limiter
+
+    @property
+    def single_flight(self) -> Optional[SingleFlight]:
+        return self.__single_flight
+
+    @property
+    def cache_stats(self) -> CacheStats:
+        return self.__cache_stats
+
+    @property
+    def hedge_stats(self) -> Optional[HedgeStats]:
+        return self.__hedge and self.__hedge.stats
+
+    @property
+    def rejected_too_large(self) -> Counter:
+        """Responses dropped for going over their body limit, per endpoint."""
+
+        return self.__rejected_too_large
+
+    @property
+    def metrics(self) -> Optional[ClientMetrics]:
+        return self.__instrumentation and self.__instrumentation.metrics
+
+    @property
+    def decoder(self) -> str:
+        return self.__decoder
+
+    @decoder.setter
+    def decoder(self, decoder: str) -> None:
+        self.__decoder = validate_decoder(decoder)
+
     async def get_usage(self, api_key: ApiKeyT) -> BaseResponse[ApiKeyUsage]:
-        endpoint = ENDPOINTS['usage']
-        return await _fetch(endpoint, mapper=usage_mapper, **_params(api_key))
+        return await self.__retried_fetch('usage', (), mapper=usage_mapper, api_key=api_key)
 
     async def get_domain(self,
         domain: DomainT, *,
-        api_key: ApiKeyT
+        api_key: ApiKeyT | KeySourceT,
+        hedge_key: Optional[HedgeKeyT]=None
     ) -> BaseResponse[DomainData]:
-        endpoint = ENDPOINTS['base_domain'](domain)
-        return await _fetch(endpoint, mapper=domain_mapper, **_params(api_key))
+        return await self.__shared('base_domain', (domain,), api_key, lambda key: self.__retried_fetch(
+            'base_domain', (domain,), mapper=partial(domain_mapper, decoder=self.__decoder), api_key=key,
+            hedge_key=hedge_key
+        ))
 
     async def get_subdomains(self,
         domain: DomainT, *,
-        api_key: ApiKeyT
+        api_key: ApiKeyT | KeySourceT,
+        hedge_key: Optional[HedgeKeyT]=None
     ) -> BaseResponse[SubDomainData]:
-        endpoint = ENDPOINTS['subdomain_list'](domain)
-        return await _fetch(endpoint, mapper=subdomains_mapper, **_params(api_key))
+        return await self.__shared('subdomain_list', (domain,), api_key, lambda key: self.__retried_fetch(
+            'subdomain_list', (domain,), mapper=subdomains_mapper, api_key=key, hedge_key=hedge_key
+        ))
 
     async def get_history_dns(self,
         domain: DomainT,
         record_type: RecordType, *,
-        api_key: ApiKeyT
+        api_key: ApiKeyT | KeySourceT,
+        stop_before: Optional[str]=None,
+        max_pages: Optional[int]=None,
+        hedge_key: Optional[HedgeKeyT]=None
     ) -> BaseResponse[DnsHistoryData]:
+        """
+        Reads every page of the record type history, up to `max_pages` (client default otherwise).
+        With `stop_before` (YYYY-MM-DD) records last seen before it are dropped and no further pages are requested.
+        Every page is requested with the same key. When a later page fails the pages read before it are returned
+        with `BaseStatus.PARTIAL`, which is not cached.
+        """
+
         if not record_type in RecordType:
             raise TypeError(f'get_history_dns received inappropriate record_type: {record_type}')
 
-        endpoint = ENDPOINTS['history_dns'](domain, record_type.value)
-        return await _fetch(endpoint, mapper=partial(history_dns_mapper, type=record_type), **_params(api_key))
\ No newline at end of file
+        max_pages = max_pages or self.__history_max_pages
+        key_args = (domain, record_type.value, str(max_pages), stop_before or '')
+        return await self.__shared('history_dns', key_args, api_key, lambda key: self.__paginated_history(
+            domain, record_type, api_key=key, stop_before=stop_before, max_pages=max_pages,
+            hedge_key=hedge_key
+        ))
+
+    async def iter_subdomains(self,
+        domain: DomainT, *,
+        api_key: ApiKeyT,
+        chunk_size: int=SUBDOMAINS_CHUNK_SIZE
+    ) -> AsyncIterator[Tuple[str, ...]]:
+        """
+        Yields subdomains in chunks of at most `chunk_size` while the body streams in, so neither the raw
+        body nor the full list is held in memory. Bypasses the cache and single-flight layers.
+        Raises `StatusError` before the first chunk unless the response is OK or 404 (no subdomains).
+        """
+
+        if not self.is_started:
+            raise RuntimeError('SecurityTrailsClient is not started, call `start` first.')
+
+        url = f'{self.__base_url}{ENDPOINTS["subdomain_list"](domain)}'
+        params = _params(api_key, self.__timeouts['subdomain_list'])
+
+        attempt = 0
+        while True:
+            async with AsyncExitStack() as stack:
+                if self.__limiter is not None:
+                    await stack.enter_async_context(self.__limiter.slot(api_key))
+                trace = self.__instrumentation and self.__instrumentation.trace('subdomain_list')
+                if trace is not None:
+                    stack.callback(self.__instrumentation.record, trace)
+                response = await stack.enter_async_context(self.__session.get(url, trace_request_ctx=trace, **params))
+
+                if response.status == status.OK:
+                    parser, chunk = JsonArrayStreamParser('subdomains'), []
+                    async for data in response.content.iter_any():
+                        if trace is not None: trace.bytes += len(data)
+                        chunk.extend(parser.feed(data))
+                        while len(chunk) >= chunk_size:
+                            yield tuple(chunk[:chunk_size])
+                            del chunk[:chunk_size]
+                    if chunk:
+                        yield tuple(chunk)
+                    return
+
+                result = await _status_response(response, url)
+
+            if result.status is BaseStatus.NO_INFO: return
+
+            if result.status is not BaseStatus.RATE_LIMITED or self.__retry is None:
+                raise StatusError(result)
+
+            delay = self.__retry.delay(attempt, result.rate_limit.retry_after)
+            if delay is None:
+                raise StatusError(result)
+
+            attempt += 1
+            await aio.sleep(delay)
+
+    async def iter_domains_search(self,
+        filter: Dict[str, Any], *,
+        api_key: ApiKeyT,
+        include_ips: bool=False,
+        max_pages: int=SEARCH_MAX_PAGES
+    ) -> AsyncIterator[DomainSearchPage]:
+        """
+        Yields pages of domains matching the search `filter`, e.g. `{'ipv4': ...}` or `{'ns': ...}`.
+        The next page is requested while the caller processes the current one, through the same
+        pacing and retries as any other call. Raises `StatusError` on a page that is not FETCHED.
+        """
+
+        async def fetch_page(number: int) -> BaseResponse[DomainSearchPage]:
+            return await self.__retried_fetch(
+                'domains_search', (), mapper=partial(domain_search_mapper, page=number), api_key=api_key,
+                query={ 'page': number, 'include_ips': str(include_ips).lower() }, body={ 'filter': filter }
+            )
+
+        def next_page(page: DomainSearchPage) -> Optional[int]:
+            return not page.is_last and page.page < max_pages and page.page + 1 or None
+
+        async for page in _prefetched(fetch_page, 1, next_page):
+            yield page
+
+    async def iter_domains_scroll(self,
+        filter: Dict[str, Any], *,
+        api_key: ApiKeyT,
+        include_ips: bool=False,
+        max_pages: int=SEARCH_MAX_PAGES
+    ) -> AsyncIterator[DomainSearchPage]:
+        """Same as `iter_domains_search` through the scroll API, which is not bound by the search page limit."""
+
+        fetched = 0
+
+        async def fetch_page(scroll_id: Optional[str]) -> BaseResponse[DomainSearchPage]:
+            nonlocal fetched
+            fetched += 1
+            if scroll_id is None:
+                return await self.__retried_fetch(
+                    'domains_search', (), mapper=domain_search_mapper, api_key=api_key,
+                    query={ 'scroll': 'true', 'include_ips': str(include_ips).lower() }, body={ 'filter': filter }
+                )
+            return await self.__retried_fetch('scroll', (scroll_id,), mapper=partial(domain_search_mapper, page=fetched),
+                                              api_key=api_key)
+
+        def next_scroll(page: DomainSearchPage) -> Optional[str]:
+            return page.records and fetched < max_pages and page.scroll_id or None
+
+        async for page in _prefetched(fetch_page, None, next_scroll):
+            # A scroll ends with an empty page.
+            if page.records:
+                yield page
+
+    def iter_domains_by_ip(self,
+        ip: str, *,
+        api_key: ApiKeyT,
+        scroll: bool=False,
+        **kwargs
+    ) -> AsyncIterator[DomainSearchPage]:
+        iterate = scroll and self.iter_domains_scroll or self.iter_domains_search
+        return iterate({ 'ipv4': ip }, api_key=api_key, **kwargs)
+
+    def iter_domains_by_nameserver(self,
+        nameserver: str, *,
+        api_key: ApiKeyT,
+        scroll: bool=False,
+        **kwargs
+    ) -> AsyncIterator[DomainSearchPage]:
+        iterate = scroll and self.iter_domains_scroll or self.iter_domains_search
+        return iterate({ 'ns': nameserver }, api_key=api_key, **kwargs)
+
+    async def __shared(self, endpoint: str, key_args: tuple, api_key: ApiKeyT | KeySourceT, loader) -> BaseResponse:
+        """
+        Serve a domain request from the cache or a shared in-flight call before loading it,
+        a key source is only called by the call that loads. A caller served by another caller's
+        call that failed on its key loads again with its own key.
+        """
+
+        cache_key = ':'.join((endpoint, *key_args))
+        cached = await self.__cached(endpoint, cache_key)
+        if cached is not None:
+            return cached
+
+        load = lambda: self.__load_and_store(endpoint, cache_key, api_key, loader)
+        if self.__single_flight is None:
+            return await load()
+
+        led = False
+        def lead():
+            nonlocal led
+            led = True
+            return load()
+
+        response = await self.__single_flight.do((endpoint, *key_args), lead)
+        if not led and response.status in KEY_STATUSES:
+            return await load()
+        return response
+
+    async def __cached(self, endpoint: str, cache_key: str) -> Optional[BaseResponse]:
+        if self.__cache is None or not self.__cache_ttls.get(endpoint): return None
+
+        raw = await self.__cache.get(cache_key)
+        if raw is None:
+            self.__cache_stats.misses += 1
+            return None
+
+        self.__cache_stats.hits += 1
+        return load_response(endpoint, raw)
+
+    async def __load_and_store(self,
+        endpoint: str,
+        cache_key: str,
+        api_key: ApiKeyT | KeySourceT,
+        loader
+    ) -> BaseResponse:
+        response = await loader(await _resolve_key(api_key))
+
+        ttl = self.__cache_ttls.get(endpoint)
+        is_cacheable = response.status in CACHEABLE_STATUSES and (
+            response.status is not BaseStatus.FETCHED or response.response is not None
+        )
+        if self.__cache is not None and ttl and is_cacheable:
+            await self.__cache.set(cache_key, dump_response(endpoint, response), ttl)
+            self.__cache_stats.stores += 1
+        return response
+
+    async def __paginated_history(self,
+        domain: DomainT,
+        record_type: RecordType, *,
+        api_key: ApiKeyT,
+        stop_before: Optional[str],
+        max_pages: int,
+        hedge_key: Optional[HedgeKeyT]
+    ) -> BaseResponse[DnsHistoryData]:
+        args = (domain, record_type.value)
+        first = await self.__retried_fetch('history_dns', args, mapper=_page, api_key=api_key,
+                                           hedge_key=hedge_key)
+        if first.status is not BaseStatus.FETCHED or first.response is None:
+            return replace(first, response=None)
+
+        last_page = min(_page_count(first.response), max_pages)
+        stopped_at = _reaches(first.response, stop_before) and 1 or None
+        semaphore = aio.Semaphore(self.__history_page_concurrency)
+
+        async def fetch_page(number: int) -> Optional[BaseResponse]:
+            nonlocal stopped_at
+            async with semaphore:
+                if stopped_at is not None and number > stopped_at: return None
+                response = await self.__retried_fetch('history_dns', args, mapper=_page, api_key=api_key,
+                                                      query={ 'page': number }, hedge_key=hedge_key)
+
+            if response.status is BaseStatus.FETCHED and _reaches(response.response, stop_before):
+                stopped_at = min(stopped_at or number, number)
+            return response
+
+        rest = await aio.gather(*(fetch_page(number) for number in range(2, last_page + 1)))
+
+        pages, waited, status = [first.response], first.waited, BaseStatus.FETCHED
+        for number, response in enumerate(rest, start=2):
+            if response is None: break
+            waited += response.waited
+            if response.status is not BaseStatus.FETCHED or response.response is None:
+                logger.warning(f'History of {domain} ({record_type.value}) truncated at page {number}: {response.status}.')
+                status = BaseStatus.PARTIAL
+                break
+            pages.append(response.response)
+
+        return BaseResponse(
+            status=status,
+            response=history_dns_mapper(pages, type=record_type, stop_before=stop_before,
+                                        decoder=self.__decoder),
+            waited=waited
+        )
+
+    async def __retried_fetch(self,
+        endpoint: str,
+        args: tuple, *,
+        mapper,
+        api_key: ApiKeyT,
+        query: Optional[Dict[str, Any]]=None,
+        body: Optional[Dict[str, Any]]=None,
+        hedge_key: Optional[HedgeKeyT]=None
+    ) -> BaseResponse:
+        if not self.is_started:
+            raise RuntimeError('SecurityTrailsClient is not started, call `start` first.')
+
+        url = f'{self.__base_url}{ENDPOINTS[endpoint](*args)}'
+        params = _params(api_key, self.__timeouts[endpoint], query)
+        params['method'] = METHODS.get(endpoint, 'GET')
+        if body is not None: params['json'] = body
+
+        attempt, waited = 0, 0.0
+        while True:
+            response = await self.__hedged_fetch(endpoint, url, mapper=mapper, api_key=api_key,
+                                                 hedge_key=hedge_key, **params)
+            waited += response.waited
+            if response.status is not BaseStatus.RATE_LIMITED or self.__retry is None:
+                break
+
+            delay = self.__retry.delay(attempt, response.rate_limit.retry_after)
+            if delay is None:
+                break
+
+            logger.info(f'Rate limited on {endpoint}, retrying in {delay:.2f}s.')
+            attempt += 1
+            waited += delay
+            await aio.sleep(delay)
+        return waited and replace(response, waited=waited) or response
+
+    async def __hedged_fetch(self,
+        endpoint: str,
+        url: str, *,
+        mapper,
+        api_key: ApiKeyT,
+        hedge_key: Optional[HedgeKeyT],
+        **params
+    ) -> BaseResponse:
+        if self.__hedge is None:
+            return await self.__paced_fetch(endpoint, url, mapper=mapper, api_key=api_key, **params)
+
+        delay = self.__hedge.delay(endpoint)
+        tasks = [aio.ensure_future(self.__timed_fetch(endpoint, url, mapper=mapper, api_key=api_key, **params))]
+        try:
+            if delay is None:
+                return await tasks[0]
+
+            done, _ = await aio.wait(tasks, timeout=delay)
+            # The credit is reserved before a key is leased for the copy, and refunded when none is sent.
+            if done or not self.__hedge.spend():
+                return await tasks[0]
+
+            hedge_api_key = await self.__hedge_api_key(tasks[0], api_key, hedge_key)
+            if hedge_api_key is None:
+                self.__hedge.refund()
+                return await tasks[0]
+
+            logger.info((
+                f'Hedging {endpoint} after {delay:.3f}s{hedge_api_key == api_key and " with the same key" or ""}; '
+                f'extra credits left: {self.__hedge.budget_remaining}.'
+            ))
+            hedge_params = { **params, 'headers': _headers(hedge_api_key) }
+            tasks.append(aio.ensure_future(self.__timed_fetch(endpoint, url, mapper=mapper,
+                                                              api_key=hedge_api_key, **hedge_params)))
+            winner = await _first_fetched(tasks)
+            self.__hedge.settle(hedge_won=winner is tasks[1], cancelled=sum((not task.done() for task in tasks)))
+            return winner.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def __hedge_api_key(self,
+        primary: aio.Task,
+        api_key: ApiKeyT,
+        hedge_key: Optional[HedgeKeyT]
+    ) -> Optional[ApiKeyT]:
+        """The key for the hedged copy, None when the primary request completed while it was looked up."""
+
+        if hedge_key is None: return api_key
+
+        # The key source may wait for accounts, it is not cancelled once the primary completes:
+        # its bookkeeping finishes in the background.
+        lookup = aio.ensure_future(hedge_key())
+        lookup.add_done_callback(lambda done: done.cancelled() or done.exception())
+        await aio.wait((primary, lookup), return_when=aio.FIRST_COMPLETED)
+        if primary.done(): return None
+
+        try:
+            return lookup.result()
+        except Exception:
+            logger.exception('Failed to look up a hedge key, hedging with the same key.')
+            return api_key
+
+    async def __timed_fetch(self, endpoint: str, url: str, *, mapper, api_key: ApiKeyT, **params) -> BaseResponse:
+        started = monotonic()
+        response = await self.__paced_fetch(endpoint, url, mapper=mapper, api_key=api_key, **params)
+        if response.status is BaseStatus.FETCHED:
+            self.__hedge.observe(endpoint, monotonic() - started - response.waited)
+        return response
+
+    async def __paced_fetch(self, endpoint: str, url: str, *, mapper, api_key: ApiKeyT, **params) -> BaseResponse:
+        if self.__limiter is None:
+            return await self.__traced_fetch(endpoint, url, mapper=mapper, **params)
+
+        async with self.__limiter.slot(api_key) as waited:
+            response = await self.__traced_fetch(endpoint, url, mapper=mapper, **params)
+        return replace(response, waited=waited)
+
+    async def __traced_fetch(self, endpoint: str, url: str, *, mapper, **params) -> BaseResponse:
+        trace = self.__instrumentation and self.__instrumentation.trace(endpoint)
+        try:
+            response = await _fetch(self.__session, url, mapper=mapper, loads=LOADS[self.__decoder],
+                                    limit=self.__body_limits.get(endpoint), trace=trace, **params)
+        finally:
+            if trace is not None:
+                self.__instrumentation.record(trace)
+
+        if response.status is BaseStatus.TOO_LARGE:
+            self.__rejected_too_large[endpoint] += 1
+        return response
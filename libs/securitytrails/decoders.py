@@ -0,0 +1,72 @@
+from json import loads as json_loads
+
+from dataclasses import fields
+from typing import Any, Callable, Dict
+
+try:
+    from orjson import loads as orjson_loads
+except ImportError:
+    orjson_loads = None
+
+from .types.records import (
+    ARecord,
+    AAAARecord,
+    MXRecord,
+    NSRecord,
+    SOARecord,
+    TXTRecord,
+    RecordType
+)
+
+
+JSON_DECODER = 'json'
+FAST_DECODER = 'fast'
+DECODERS = (JSON_DECODER, FAST_DECODER)
+
+TYPE_BY_ENUM = {
+    RecordType.A: ARecord,
+    RecordType.AAAA: AAAARecord,
+    RecordType.MX: MXRecord,
+    RecordType.NS: NSRecord,
+    RecordType.SOA: SOARecord,
+    RecordType.TXT: TXTRecord
+}
+
+RecordBuilder = Callable[[Dict[str, Any]], Any]
+
+
+def _positional_builder(record_type) -> RecordBuilder:
+    """Build a record straight from the upstream object, record fields are named after upstream keys."""
+
+    names = tuple((field.name for field in fields(record_type)))
+    return lambda data: record_type(*[data.get(name) for name in names])
+
+RECORD_BUILDERS: Dict[str, Dict[RecordType, RecordBuilder]] = {
+    JSON_DECODER: {
+        record_enum: record_type.from_response
+        for record_enum, record_type in TYPE_BY_ENUM.items()
+    },
+    FAST_DECODER: {
+        record_enum: _positional_builder(record_type)
+        for record_enum, record_type in TYPE_BY_ENUM.items()
+    }
+}
+
+def fast_loads(body: bytes) -> Any:
+    """Decode the raw body with orjson when installed, falling back to the stdlib parser."""
+
+    if orjson_loads is not None:
+        return orjson_loads(body)
+    return json_loads(body)
+
+LOADS = {
+    JSON_DECODER: json_loads,
+    FAST_DECODER: fast_loads
+}
+
+def validate_decoder(decoder: str) -> str:
+    """validate_decoder"""
+
+    if decoder not in DECODERS:
+        raise ValueError(f'Unknown decoder: {decoder}, expected one of {DECODERS}.')
+    return decoder
@@ -0,0 +1,117 @@
+from collections import deque
+from dataclasses import dataclass
+from time import monotonic
+
+from typing import Deque, Dict, Iterable, Optional
+
+
+HEDGED_ENDPOINTS = (
+    'base_domain',
+    'subdomain_list',
+    'history_dns'
+)
+
+
+@dataclass
+class HedgeStats:
+    """HedgeStats"""
+
+    hedged: int = 0
+    won: int = 0
+    cancelled: int = 0
+    denied: int = 0
+    extra_credits: int = 0
+
+
+class HedgePolicy:
+    """
+    Decides when a slow request gets a second, hedged copy: once it has been in flight
+    longer than `percentile` of the recent latencies observed for its endpoint.
+    Every hedge spends one extra credit, hedging pauses once `max_extra_credits` were spent
+    within the last `budget_window` seconds.
+    """
+
+    def __init__(self, *,
+        percentile: float=0.95,
+        min_samples: int=20,
+        window: int=200,
+        min_delay: float=0.05,
+        max_extra_credits: int=100,
+        budget_window: float=3600,
+        endpoints: Iterable[str]=HEDGED_ENDPOINTS
+    ):
+        if not 0 < percentile < 1: raise ValueError(':percentile should be between zero and one.')
+        if min_samples <= 0: raise ValueError(':min_samples should be greater then zero.')
+        if window < min_samples: raise ValueError(':window should not be less then :min_samples.')
+        if max_extra_credits < 0: raise ValueError(':max_extra_credits should not be negative.')
+        if budget_window <= 0: raise ValueError(':budget_window should be greater then zero.')
+
+        self.__percentile = percentile
+        self.__min_samples = min_samples
+        self.__window = window
+        self.__min_delay = min_delay
+        self.__max_extra_credits = max_extra_credits
+        self.__budget_window = budget_window
+        self.__spent: Deque[float] = deque()
+        self.__endpoints = frozenset(endpoints)
+        self.__latencies: Dict[str, Deque[float]] = {}
+        self.__stats = HedgeStats()
+
+    def observe(self, endpoint: str, elapsed: float) -> None:
+        """Record the latency of a completed request."""
+
+        latencies = self.__latencies.get(endpoint)
+        if latencies is None:
+            latencies = self.__latencies[endpoint] = deque(maxlen=self.__window)
+        latencies.append(elapsed)
+
+    def delay(self, endpoint: str) -> Optional[float]:
+        """Time to wait before hedging, None when the endpoint is not hedged or has too few samples."""
+
+        if endpoint not in self.__endpoints: return None
+
+        latencies = self.__latencies.get(endpoint)
+        if latencies is None or len(latencies) < self.__min_samples: return None
+
+        ordered = sorted(latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.__percentile))
+        return max(self.__min_delay, ordered[index])
+
+    def spend(self) -> bool:
+        """Reserve one extra credit before a hedge is prepared, False when the budget of the window is spent."""
+
+        if not self.budget_remaining:
+            self.__stats.denied += 1
+            return False
+
+        self.__spent.append(monotonic())
+        self.__stats.hedged += 1
+        self.__stats.extra_credits += 1
+        return True
+
+    def refund(self) -> None:
+        """Give back the credit of a hedge that was not sent after all."""
+
+        if self.__spent:
+            self.__spent.pop()
+        self.__stats.hedged -= 1
+        self.__stats.extra_credits -= 1
+
+    def settle(self, *, hedge_won: bool, cancelled: int) -> None:
+        """Record the outcome of a hedged request."""
+
+        self.__stats.won += hedge_won and 1 or 0
+        self.__stats.cancelled += cancelled
+
+    @property
+    def budget_remaining(self) -> int:
+        """Extra credits left in the window ending now."""
+
+        expired_before = monotonic() - self.__budget_window
+        while self.__spent and self.__spent[0] <= expired_before:
+            self.__spent.popleft()
+        return max(0, self.__max_extra_credits - len(self.__spent))
+
+    @property
+    def stats(self) -> HedgeStats:
+        return self.__stats
@@ -0,0 +1,207 @@
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field
+from time import perf_counter
+from types import SimpleNamespace
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+from aiohttp import TraceConfig
+
+
+# Upper bounds in seconds, the last bucket counts everything above them.
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+PHASES = (
+    'queued',
+    'dns',
+    'connect',
+    'ttfb',
+    'body',
+    'decode',
+    'mapping'
+)
+# HTTP status recorded for requests that failed before a response arrived.
+NO_RESPONSE = 0
+
+
+class Histogram:
+    """Fixed-bucket histogram, observing a value is a bisection and two additions."""
+
+    __slots__ = ('bounds', 'counts', 'count', 'total')
+
+    def __init__(self, bounds: Tuple[float, ...]=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the `q` quantile, None when empty or above the last bound."""
+
+        if not self.count: return None
+
+        rank, seen = q * self.count, 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            'count': self.count,
+            'sum': round(self.total, 6),
+            'buckets': dict(zip((*map(str, self.bounds), '+Inf'), self.counts))
+        }
+
+
+@dataclass(slots=True)
+class RequestTrace:
+    """Timings of a single upstream request, filled by the trace hooks and `_fetch`."""
+
+    endpoint: str
+    started: float = field(default_factory=perf_counter)
+    status: int = NO_RESPONSE
+    bytes: int = 0
+    queued: float = 0.0
+    dns: float = 0.0
+    connect: float = 0.0
+    ttfb: float = 0.0
+    body: float = 0.0
+    decode: float = 0.0
+    mapping: float = 0.0
+    reused: bool = False
+    mark: float = 0.0
+    dns_mark: float = 0.0
+    headers_at: float = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        return perf_counter() - self.started
+
+
+@dataclass
+class ClientMetrics:
+    """Per-endpoint and per-status latency histograms, phase histograms and byte counts."""
+
+    latency: Dict[Tuple[str, int], Histogram] = field(default_factory=dict)
+    phases: Dict[Tuple[str, str], Histogram] = field(default_factory=dict)
+    requests: Counter = field(default_factory=Counter)
+    bytes: Counter = field(default_factory=Counter)
+    reused: Counter = field(default_factory=Counter)
+
+    def record(self, trace: RequestTrace, elapsed: float) -> None:
+        key = (trace.endpoint, trace.status)
+        histogram = self.latency.get(key)
+        if histogram is None:
+            histogram = self.latency[key] = Histogram()
+        histogram.observe(elapsed)
+
+        self.requests[key] += 1
+        self.bytes[trace.endpoint] += trace.bytes
+        self.reused[trace.endpoint] += trace.reused
+
+        for phase in PHASES:
+            value = getattr(trace, phase)
+            if not value: continue
+
+            histogram = self.phases.get((trace.endpoint, phase))
+            if histogram is None:
+                histogram = self.phases[(trace.endpoint, phase)] = Histogram()
+            histogram.observe(value)
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            'latency': { f'{endpoint}:{status}': histogram.snapshot()
+                         for (endpoint, status), histogram in self.latency.items() },
+            'phases': { f'{endpoint}:{phase}': histogram.snapshot()
+                        for (endpoint, phase), histogram in self.phases.items() },
+            'bytes': dict(self.bytes),
+            'reused_connections': dict(self.reused)
+        }
+
+
+def _trace(context: SimpleNamespace) -> Optional[RequestTrace]:
+    """_trace"""
+
+    trace = context.trace_request_ctx
+    return isinstance(trace, RequestTrace) and trace or None
+
+async def _on_queued_start(session, context, params):
+    if trace := _trace(context): trace.mark = perf_counter()
+
+async def _on_queued_end(session, context, params):
+    if trace := _trace(context): trace.queued += perf_counter() - trace.mark
+
+async def _on_connection_create_start(session, context, params):
+    if trace := _trace(context): trace.mark = perf_counter()
+
+async def _on_connection_create_end(session, context, params):
+    # Name resolution happens while the connection is created, it is reported on its own.
+    if trace := _trace(context): trace.connect += perf_counter() - trace.mark - trace.dns
+
+async def _on_connection_reuseconn(session, context, params):
+    if trace := _trace(context): trace.reused = True
+
+async def _on_dns_start(session, context, params):
+    if trace := _trace(context): trace.dns_mark = perf_counter()
+
+async def _on_dns_end(session, context, params):
+    if trace := _trace(context): trace.dns += perf_counter() - trace.dns_mark
+
+async def _on_request_end(session, context, params):
+    if trace := _trace(context):
+        trace.headers_at = perf_counter()
+        trace.ttfb = trace.headers_at - trace.started - trace.queued - trace.dns - trace.connect
+        trace.status = params.response.status
+
+
+class ClientInstrumentation:
+    """
+    Collects request lifecycle timings of `SecurityTrailsClient` into `ClientMetrics`:
+    waiting for a pooled connection, DNS, connect (TCP and TLS handshakes together, aiohttp does not
+    tell them apart), time to first byte, body download, decoding and mapping.
+    Listeners receive every finished `RequestTrace` with its total latency.
+    """
+
+    def __init__(self):
+        self.__metrics = ClientMetrics()
+        self.__listeners: List[Callable[[RequestTrace, float], None]] = []
+        self.__trace_config = TraceConfig()
+        self.__trace_config.on_connection_queued_start.append(_on_queued_start)
+        self.__trace_config.on_connection_queued_end.append(_on_queued_end)
+        self.__trace_config.on_connection_create_start.append(_on_connection_create_start)
+        self.__trace_config.on_connection_create_end.append(_on_connection_create_end)
+        self.__trace_config.on_connection_reuseconn.append(_on_connection_reuseconn)
+        self.__trace_config.on_dns_resolvehost_start.append(_on_dns_start)
+        self.__trace_config.on_dns_resolvehost_end.append(_on_dns_end)
+        self.__trace_config.on_request_end.append(_on_request_end)
+        self.__trace_config.freeze()
+
+    def add_listener(self, listener: Callable[[RequestTrace, float], None]) -> None:
+        self.__listeners.append(listener)
+
+    def trace(self, endpoint: str) -> RequestTrace:
+        return RequestTrace(endpoint)
+
+    def record(self, trace: RequestTrace) -> None:
+        elapsed = trace.elapsed
+        self.__metrics.record(trace, elapsed)
+        for listener in self.__listeners:
+            listener(trace, elapsed)
+
+    @property
+    def trace_config(self) -> TraceConfig:
+        return self.__trace_config
+
+    @property
+    def metrics(self) -> ClientMetrics:
+        return self.__metrics
@@ -0,0 +1,132 @@
+import asyncio as aio
+
+from time import monotonic
+from dataclasses import dataclass
+from contextlib import asynccontextmanager
+
+from typing import AsyncIterator, Dict, Hashable
+
+
+# Waits shorter than this are scheduling noise, not pacing.
+DELAY_THRESHOLD = 0.001
+
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens per second holding at most `burst` tokens."""
+
+    def __init__(self, *, rate: float, burst: int):
+        if rate <= 0: raise ValueError(':rate should be greater then zero.')
+        if burst <= 0: raise ValueError(':burst should be greater then zero.')
+
+        self.__rate = rate
+        self.__burst = burst
+        self.__tokens = float(burst)
+        self.__updated = monotonic()
+        self.__lock = aio.Lock()
+
+    async def acquire(self) -> float:
+        """Wait for a single token, returns the time spent waiting."""
+
+        started = monotonic()
+        async with self.__lock:
+            self.__refill()
+            while self.__tokens < 1:
+                await aio.sleep((1 - self.__tokens) / self.__rate)
+                self.__refill()
+            self.__tokens -= 1
+        return monotonic() - started
+
+    def __refill(self) -> None:
+        now = monotonic()
+        self.__tokens = min(self.__burst, self.__tokens + (now - self.__updated) * self.__rate)
+        self.__updated = now
+
+
+@dataclass
+class LimiterStats:
+    """LimiterStats"""
+
+    acquired: int = 0
+    delayed: int = 0
+    waited_total: float = 0.0
+    waited_max: float = 0.0
+
+
+class _KeyState:
+    """_KeyState"""
+
+    def __init__(self, *, rate: float, burst: int, max_in_flight: int):
+        self.bucket = TokenBucket(rate=rate, burst=burst)
+        self.in_flight = aio.Semaphore(max_in_flight)
+        self.active = 0
+        self.last_used = monotonic()
+
+
+class KeyRateLimiter:
+    """
+    Paces upstream requests per key: a token bucket bounds the request rate and burst,
+    a semaphore bounds requests in flight. Callers await a slot instead of hitting 429.
+    """
+
+    def __init__(self, *,
+        rate: float,
+        burst: int,
+        max_in_flight: int,
+        idle_timeout: float=600
+    ):
+        if max_in_flight <= 0: raise ValueError(':max_in_flight should be greater then zero.')
+
+        self.__rate = rate
+        self.__burst = burst
+        self.__max_in_flight = max_in_flight
+        self.__idle_timeout = idle_timeout
+        self.__states: Dict[Hashable, _KeyState] = {}
+        self.__stats = LimiterStats()
+
+    @asynccontextmanager
+    async def slot(self, key: Hashable) -> AsyncIterator[float]:
+        """Hold a request slot for `key`, yields the time spent waiting for it."""
+
+        state = self.__state(key)
+        state.active += 1
+        started = monotonic()
+        try:
+            async with state.in_flight:
+                await state.bucket.acquire()
+                waited = monotonic() - started
+                self.__record(waited)
+                yield waited
+        finally:
+            state.active -= 1
+            state.last_used = monotonic()
+
+    @property
+    def stats(self) -> LimiterStats:
+        return self.__stats
+
+    def __state(self, key: Hashable) -> _KeyState:
+        state = self.__states.get(key)
+        if state is not None: return state
+
+        self.__prune()
+        state = self.__states[key] = _KeyState(rate=self.__rate, burst=self.__burst,
+                                               max_in_flight=self.__max_in_flight)
+        return state
+
+    def __prune(self) -> None:
+        threshold = monotonic() - self.__idle_timeout
+        idle = [
+            key
+            for key, state in self.__states.items()
+            if not state.active and state.last_used < threshold
+        ]
+        for key in idle:
+            del self.__states[key]
+
+    def __record(self, waited: float) -> None:
+        self.__stats.acquired += 1
+        if waited < DELAY_THRESHOLD: return
+
+        self.__stats.delayed += 1
+        self.__stats.waited_total += waited
+        self.__stats.waited_max = max(self.__stats.waited_max, waited)
@@ -1,16 +1,12 @@
 import logging
 
-from typing import Optional, Any, Callable, Tuple
+from itertools import chain
+
+from typing import Optional, Any, Callable, Tuple, Sequence
 
 from .types.records import (
     BaseRecordInfo,
     HistoryRecordInfo,
-    ARecord,
-    AAAARecord,
-    MXRecord,
-    NSRecord,
-    SOARecord,
-    TXTRecord,
     TRecord,
     RecordType
 )
@@ -21,6 +17,14 @@ from .types.data import (
     DnsHistoryData,
     DnsRecordsInfo
 )
+from .types.search import (
+    DomainSearchRecord,
+    DomainSearchPage
+)
+from .decoders import (
+    JSON_DECODER,
+    RECORD_BUILDERS
+)
 
 
 logger = logging.getLogger(__name__)
@@ -28,15 +32,6 @@ logger = logging.getLogger(__name__)
 
 InputDataT = dict[str, Any]
 
-TYPE_BY_ENUM = {
-    RecordType.A: ARecord,
-    RecordType.AAAA: AAAARecord,
-    RecordType.MX: MXRecord,
-    RecordType.NS: NSRecord,
-    RecordType.SOA: SOARecord,
-    RecordType.TXT: TXTRecord
-}
-
 def _init_base_record(data: InputDataT, mapper: Callable[[InputDataT], Tuple[TRecord, ...]]):
     """_init_base_record"""
 
@@ -81,21 +76,22 @@ def usage_mapper(data: InputDataT) -> Optional[ApiKeyUsage]:
         logger.exception('Failed to map `usage` data.')
     return None
 
-def domain_mapper(data: InputDataT) -> Optional[DomainData]:
+def domain_mapper(data: InputDataT, *, decoder: str=JSON_DECODER) -> Optional[DomainData]:
     """domain_mapper"""
 
     try:
         dns = data['current_dns']
+        builders = RECORD_BUILDERS[decoder]
         mapped = DomainData(
             hostname=data['hostname'],
             alexa_rank=data['alexa_rank'],
             records=DnsRecordsInfo(
-                A=_init_base_record(dns['a'], _map_record(ARecord.from_response)),
-                AAAA=_init_base_record(dns['aaaa'], _map_record(AAAARecord.from_response)),
-                MX=_init_base_record(dns['mx'], _map_record(MXRecord.from_response)),
-                NS=_init_base_record(dns['ns'], _map_record(NSRecord.from_response)),
-                SOA=_init_base_record(dns['soa'], _map_record(SOARecord.from_response)),
-                TXT=_init_base_record(dns['txt'], _map_record(TXTRecord.from_response))
+                A=_init_base_record(dns['a'], _map_record(builders[RecordType.A])),
+                AAAA=_init_base_record(dns['aaaa'], _map_record(builders[RecordType.AAAA])),
+                MX=_init_base_record(dns['mx'], _map_record(builders[RecordType.MX])),
+                NS=_init_base_record(dns['ns'], _map_record(builders[RecordType.NS])),
+                SOA=_init_base_record(dns['soa'], _map_record(builders[RecordType.SOA])),
+                TXT=_init_base_record(dns['txt'], _map_record(builders[RecordType.TXT]))
         )
     )
         return mapped
@@ -119,21 +115,62 @@ def subdomains_mapper(data: InputDataT) -> Optional[SubDomainData]:
         logger.exception('Failed to map `subdomains` data.')
     return None
 
-def history_dns_mapper(data: InputDataT, *, type: RecordType) -> Optional[DnsHistoryData]:
+def history_dns_mapper(
+    data: InputDataT | Sequence[InputDataT], *,
+    type: RecordType,
+    stop_before: Optional[str]=None,
+    decoder: str=JSON_DECODER
+) -> Optional[DnsHistoryData]:
     """history_dns_mapper"""
 
+    pages = isinstance(data, dict) and (data,) or data
     try:
-        record_mapper = TYPE_BY_ENUM[type].from_response
-        records = tuple((
-            _init_history_record(record, _map_record(record_mapper))
-            for record in data['records']
-        ))
+        record_mapper = _map_record(RECORD_BUILDERS[decoder][type])
+        records = chain.from_iterable((page['records'] for page in pages))
+        if stop_before is not None:
+            records = (
+                record
+                for record in records
+                if (record.get('last_seen') or stop_before) >= stop_before
+            )
 
         mapped = DnsHistoryData(
             type=type,
-            records=records
+            records=tuple((
+                _init_history_record(record, record_mapper)
+                for record in records
+            ))
         )
         return mapped
     except Exception as exp:
         logger.exception('Failed to map `history_dns` data.')
-    return None
\ No newline at end of file
+    return None
+
+def _search_record(data: InputDataT) -> DomainSearchRecord:
+    """_search_record"""
+
+    return DomainSearchRecord(
+        hostname=data['hostname'],
+        alexa_rank=data.get('alexa_rank'),
+        host_provider=tuple(data.get('host_provider') or ()),
+        mail_provider=tuple(data.get('mail_provider') or ()),
+        company_name=(data.get('computed') or {}).get('company_name')
+    )
+
+def domain_search_mapper(data: InputDataT, *, page: int=1) -> Optional[DomainSearchPage]:
+    """domain_search_mapper"""
+
+    try:
+        meta = data.get('meta') or {}
+        records = tuple((_search_record(record) for record in data['records']))
+        mapped = DomainSearchPage(
+            records=records,
+            record_count=data.get('record_count', len(records)),
+            page=meta.get('page', page),
+            total_pages=meta.get('total_pages') or meta.get('max_page') or page,
+            scroll_id=meta.get('scroll_id')
+        )
+        return mapped
+    except Exception as exp:
+        logger.exception('Failed to map `domain_search` data.')
+    return None
@@ -0,0 +1,27 @@
+import random
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Capped exponential backoff with jitter for throttled (`RATE_LIMITED`) responses.
+    A `Retry-After` longer than `max_delay` is not waited for, the response is returned as is.
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 10.0
+    jitter: float = 0.5
+
+    def delay(self, attempt: int, retry_after: Optional[float]=None) -> Optional[float]:
+        """Delay before retry number `attempt` (zero based), `None` when it should not be retried."""
+
+        if attempt >= self.max_attempts: return None
+        if retry_after is not None and retry_after > self.max_delay: return None
+
+        backoff = min(self.max_delay, self.base_delay * 2 ** attempt)
+        backoff -= backoff * self.jitter * random.random()
+        return min(self.max_delay, max(backoff, retry_after or 0))
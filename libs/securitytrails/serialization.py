@@ -0,0 +1,155 @@
+from json import dumps, loads
+from dataclasses import fields
+
+from typing import Any, Optional, Callable
+
+from .types.records import (
+    BaseRecordInfo,
+    HistoryRecordInfo,
+    ARecord,
+    AAAARecord,
+    MXRecord,
+    NSRecord,
+    SOARecord,
+    TXTRecord,
+    RecordType
+)
+from .types.data import (
+    DomainData,
+    SubDomainData,
+    DnsHistoryData,
+    DnsRecordsInfo
+)
+from .types.response import BaseStatus, BaseResponse
+from .decoders import TYPE_BY_ENUM
+
+
+# Compact positional form: dataclasses become JSON arrays in field order, absent values are `null`.
+# `DnsRecordsInfo` fields are stored in this order.
+CURRENT_RECORDS = (
+    ('A', ARecord),
+    ('AAAA', AAAARecord),
+    ('MX', MXRecord),
+    ('NS', NSRecord),
+    ('SOA', SOARecord),
+    ('TXT', TXTRecord)
+)
+FIELDS_BY_TYPE = {
+    record_type: tuple((field.name for field in fields(record_type)))
+    for record_type in TYPE_BY_ENUM.values()
+}
+
+def _record_fields(record) -> list:
+    """_record_fields"""
+
+    return [getattr(record, name) for name in FIELDS_BY_TYPE[type(record)]]
+
+def _dump_base_record(info: Optional[BaseRecordInfo]) -> Optional[list]:
+    """_dump_base_record"""
+
+    if info is None: return None
+    return [info.first_seen, [_record_fields(value) for value in info.values]]
+
+def _load_base_record(data: Optional[list], record_type) -> Optional[BaseRecordInfo]:
+    """_load_base_record"""
+
+    if data is None: return None
+
+    first_seen, values = data
+    return BaseRecordInfo(
+        first_seen=first_seen,
+        values=tuple((record_type(*value) for value in values))
+    )
+
+def _dump_history_record(info: HistoryRecordInfo) -> list:
+    """_dump_history_record"""
+
+    return [
+        info.first_seen,
+        info.last_seen,
+        list(info.organizations),
+        [_record_fields(value) for value in info.values]
+    ]
+
+def _load_history_record(data: list, record_type) -> HistoryRecordInfo:
+    """_load_history_record"""
+
+    first_seen, last_seen, organizations, values = data
+    return HistoryRecordInfo(
+        first_seen=first_seen,
+        last_seen=last_seen,
+        organizations=tuple(organizations),
+        values=tuple((record_type(*value) for value in values))
+    )
+
+def dump_domain(data: DomainData) -> list:
+    """dump_domain"""
+
+    return [
+        data.hostname,
+        data.alexa_rank,
+        [_dump_base_record(getattr(data.records, name)) for name, _ in CURRENT_RECORDS]
+    ]
+
+def load_domain(data: list) -> DomainData:
+    """load_domain"""
+
+    hostname, alexa_rank, records = data
+    return DomainData(
+        hostname=hostname,
+        alexa_rank=alexa_rank,
+        records=DnsRecordsInfo(**{
+            name: _load_base_record(record, record_type)
+            for (name, record_type), record in zip(CURRENT_RECORDS, records)
+        })
+    )
+
+def dump_subdomains(data: SubDomainData) -> list:
+    """dump_subdomains"""
+
+    return [data.count, list(data.subdomains)]
+
+def load_subdomains(data: list) -> SubDomainData:
+    """load_subdomains"""
+
+    count, subdomains = data
+    return SubDomainData(count=count, subdomains=tuple(subdomains))
+
+def dump_history_dns(data: DnsHistoryData) -> list:
+    """dump_history_dns"""
+
+    return [data.type.value, [_dump_history_record(record) for record in data.records]]
+
+def load_history_dns(data: list) -> DnsHistoryData:
+    """load_history_dns"""
+
+    type_value, records = data
+    record_enum = RecordType(type_value)
+    record_type = TYPE_BY_ENUM[record_enum]
+    return DnsHistoryData(
+        type=record_enum,
+        records=tuple((_load_history_record(record, record_type) for record in records))
+    )
+
+SERIALIZERS: dict[str, tuple[Callable[[Any], list], Callable[[list], Any]]] = {
+    'base_domain': (dump_domain, load_domain),
+    'subdomain_list': (dump_subdomains, load_subdomains),
+    'history_dns': (dump_history_dns, load_history_dns)
+}
+
+def dump_response(endpoint: str, response: BaseResponse) -> str:
+    """Serialize a cacheable response of `endpoint` (see `CACHEABLE_STATUSES`) into its compact form."""
+
+    dump, _ = SERIALIZERS[endpoint]
+    payload = response.response is not None and dump(response.response) or None
+    return dumps([response.status.name, payload], separators=(',', ':'))
+
+def load_response(endpoint: str, raw: str) -> BaseResponse:
+    """load_response"""
+
+    _, load = SERIALIZERS[endpoint]
+    status_name, payload = loads(raw)
+    return BaseResponse(
+        status=BaseStatus[status_name],
+        response=payload is not None and load(payload) or None
+    )
@@ -0,0 +1,56 @@
+import asyncio as aio
+
+from typing import (
+    Generic,
+    TypeVar,
+    Hashable,
+    Callable,
+    Awaitable,
+    Dict
+)
+
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class SingleFlight(Generic[K, V]):
+    """
+    Collapses concurrent calls sharing a key into one in-flight call whose result every caller receives.
+    The call runs as its own task, so a cancelled caller does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self.__calls: Dict[K, aio.Task] = {}
+        self.__collapsed = 0
+
+    async def do(self, key: K, factory: Callable[[], Awaitable[V]]) -> V:
+        """Await the in-flight call for `key`, starting it with `factory` if there is none."""
+
+        task = self.__calls.get(key)
+        if task is None:
+            task = aio.ensure_future(factory())
+            self.__calls[key] = task
+            task.add_done_callback(lambda done: self.__completed(key, done))
+        else:
+            self.__collapsed += 1
+
+        return await aio.shield(task)
+
+    @property
+    def collapsed(self) -> int:
+        """Number of calls served by another caller's in-flight request."""
+
+        return self.__collapsed
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.__calls)
+
+    def __completed(self, key: K, task: aio.Task) -> None:
+        if self.__calls.get(key) is task:
+            del self.__calls[key]
+
+        # Retrieve the exception so it is not reported when every caller was cancelled.
+        if not task.cancelled():
+            task.exception()
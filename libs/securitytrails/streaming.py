@@ -0,0 +1,109 @@
+import codecs
+
+from json import loads
+
+from typing import List, Optional
+
+
+WHITESPACE = ' \t\r\n'
+
+
+def _string_end(buffer: str, start: int) -> int:
+    """Index of the quote closing a JSON string whose content starts at `start`, -1 when not buffered yet."""
+
+    end = buffer.find('"', start)
+    while end != -1:
+        backslashes = 0
+        while buffer[end - 1 - backslashes] == '\\':
+            backslashes += 1
+        if backslashes % 2 == 0:
+            return end
+        end = buffer.find('"', end + 1)
+    return -1
+
+def _unescape(raw: str) -> str:
+    """_unescape"""
+
+    return '\\' in raw and loads(f'"{raw}"') or raw
+
+
+class JsonArrayStreamParser:
+    """
+    Incrementally extracts the string items of one top-level array (e.g. `subdomains`)
+    from a JSON object fed in arbitrary byte chunks, without buffering the whole document.
+    """
+
+    def __init__(self, key: str):
+        self.__key = key
+        self.__decoder = codecs.getincrementaldecoder('utf-8')()
+        self.__buffer = ''
+        self.__depth = 0
+        self.__expecting_key = False
+        self.__last_key: Optional[str] = None
+        self.__in_array = False
+        self.__done = False
+
+    def feed(self, data: bytes) -> List[str]:
+        """Feed the next body chunk, returns the array items completed by it."""
+
+        if self.__done: return []
+
+        self.__buffer += self.__decoder.decode(data)
+        items: List[str] = []
+        position = self.__in_array and self.__scan_array(0, items) or self.__scan_object(0, items)
+        self.__buffer = self.__buffer[position:]
+        return items
+
+    @property
+    def done(self) -> bool:
+        return self.__done
+
+    def __scan_object(self, position: int, items: List[str]) -> int:
+        buffer = self.__buffer
+        length = len(buffer)
+        while position < length:
+            char = buffer[position]
+            if char == '"':
+                end = _string_end(buffer, position + 1)
+                if end == -1: return position
+                if self.__depth == 1 and self.__expecting_key:
+                    self.__last_key = _unescape(buffer[position + 1:end])
+                    self.__expecting_key = False
+                position = end + 1
+                continue
+
+            if char == '{':
+                self.__depth += 1
+                self.__expecting_key = self.__depth == 1
+            elif char == '[':
+                self.__depth += 1
+                if self.__depth == 2 and self.__last_key == self.__key:
+                    self.__in_array = True
+                    return self.__scan_array(position + 1, items)
+            elif char in '}]':
+                self.__depth -= 1
+            elif char == ',' and self.__depth == 1:
+                self.__expecting_key = True
+                self.__last_key = None
+            position += 1
+        return position
+
+    def __scan_array(self, position: int, items: List[str]) -> int:
+        buffer = self.__buffer
+        length = len(buffer)
+        while position < length:
+            char = buffer[position]
+            if char in WHITESPACE or char == ',':
+                position += 1
+            elif char == '"':
+                end = _string_end(buffer, position + 1)
+                if end == -1: return position
+                items.append(_unescape(buffer[position + 1:end]))
+                position = end + 1
+            elif char == ']':
+                self.__in_array = False
+                self.__done = True
+                return length
+            else:
+                raise ValueError(f'Unexpected `{char}` in `{self.__key}` array, only strings are supported.')
+        return position
@@ -14,7 +14,7 @@ from .records import (
 )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ApiKeyUsage:
     """ApiKeyUsage"""
 
@@ -22,7 +22,7 @@ class ApiKeyUsage:
     monthly_available: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DnsRecordsInfo:
     """DnsRecordsInfo"""
 
@@ -34,7 +34,7 @@ class DnsRecordsInfo:
     TXT: Optional[BaseRecordInfo[TXTRecord]] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DomainData:
     """DomainData"""
 
@@ -43,7 +43,7 @@ class DomainData:
     alexa_rank: Optional[int] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SubDomainData:
     """SubDomainData"""
 
@@ -51,7 +51,7 @@ class SubDomainData:
     subdomains: tuple[str]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DnsHistoryData:
     """DnsHistoryData"""
 
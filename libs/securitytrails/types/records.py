@@ -30,7 +30,7 @@ def _require_fields(data, *fields):
     }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ARecord:
     """ARecord"""
 
@@ -43,7 +43,7 @@ class ARecord:
         return cls(**_require_fields(data, 'ip', 'ip_count', 'ip_organization'))
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AAAARecord:
     """AAAARecord"""
 
@@ -56,7 +56,7 @@ class AAAARecord:
         return cls(**_require_fields(data, 'ipv6', 'ipv6_count', 'ipv6_organization'))
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MXRecord:
     """MXRecord"""
 
@@ -70,7 +70,7 @@ class MXRecord:
         return cls(**_require_fields(data, 'priority', 'host', 'host_count', 'hostname_organization'))
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NSRecord:
     """NSRecord"""
 
@@ -83,7 +83,7 @@ class NSRecord:
         return cls(**_require_fields(data, 'nameserver', 'nameserver_count', 'nameserver_organization'))
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SOARecord:
     """SOARecord"""
 
@@ -96,7 +96,7 @@ class SOARecord:
         return cls(**_require_fields(data, 'ttl', 'email', 'email_count'))
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TXTRecord:
     """TXTRecord"""
 
@@ -110,7 +110,7 @@ class TXTRecord:
 TRecord = TypeVar('TRecord', ARecord, AAAARecord, MXRecord, NSRecord, SOARecord, TXTRecord)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BaseRecordInfo(Generic[TRecord]):
     """RecordInfo"""
 
@@ -118,7 +118,7 @@ class BaseRecordInfo(Generic[TRecord]):
     values: Tuple[TRecord, ...]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HistoryRecordInfo(BaseRecordInfo):
     """HistoryRecordInfo"""
 
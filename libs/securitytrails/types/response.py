@@ -14,7 +14,6 @@ from .data import (
 ResponseT = TypeVar('ResponseT', ApiKeyUsage, DomainData, SubDomainData, DnsHistoryData)
 
 
-@dataclass(frozen=True)
 class BaseStatus(Enum):
     """BaseStatus"""
 
@@ -23,12 +22,41 @@ class BaseStatus(Enum):
     UNAUTHORIZED = auto()
     INVALID_DOMAIN = auto()
     API_KEY_EXHAUSTED = auto()
+    RATE_LIMITED = auto()
+    TOO_LARGE = auto()
+    # Some pages of a paginated response failed, the data holds the pages read before the first failure.
+    PARTIAL = auto()
     UNDEFINED = auto()
 
 
+@dataclass(frozen=True)
+class RateLimitInfo:
+    """Rate limit state parsed from `Retry-After` and `X-RateLimit-*` headers."""
+
+    retry_after: Optional[float] = None
+    limit_second: Optional[int] = None
+    remaining_second: Optional[int] = None
+    limit_month: Optional[int] = None
+    remaining_month: Optional[int] = None
+
+    @property
+    def is_quota_exhausted(self) -> bool:
+        return self.remaining_month is not None and self.remaining_month <= 0
+
+
 @dataclass(frozen=True)
 class BaseResponse(Generic[ResponseT]):
     """BaseResponse"""
 
     status: BaseStatus
-    response: Optional[ResponseT] = None
\ No newline at end of file
+    response: Optional[ResponseT] = None
+    waited: float = 0.0
+    rate_limit: Optional[RateLimitInfo] = None
+
+
+class StatusError(Exception):
+    """Raised by streaming calls which cannot return a `BaseResponse` for a failed request."""
+
+    def __init__(self, response: BaseResponse):
+        super().__init__(f'SecurityTrails request failed: {response.status.name}.')
+        self.response = response
\ No newline at end of file
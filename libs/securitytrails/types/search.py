@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from typing import Tuple, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class DomainSearchRecord:
+    """DomainSearchRecord"""
+
+    hostname: str
+    alexa_rank: Optional[int] = None
+    host_provider: Tuple[str, ...] = ()
+    mail_provider: Tuple[str, ...] = ()
+    company_name: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class DomainSearchPage:
+    """One page of a domain search or scroll, `scroll_id` continues a scroll."""
+
+    records: Tuple[DomainSearchRecord, ...]
+    record_count: int
+    page: int
+    total_pages: int
+    scroll_id: Optional[str] = None
+
+    @property
+    def is_last(self) -> bool:
+        return not self.records or self.page >= self.total_pages
@@ -0,0 +1,51 @@
+from hashlib import blake2b
+from math import ceil, exp, log
+
+
+class BloomFilter:
+    """
+    Bloom filter sized for `capacity` items at `error_rate` false positives, items can not be removed.
+    The `k` bit positions come from two halves of a single blake2b digest (double hashing).
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        if capacity <= 0: raise ValueError(':capacity should be greater then zero.')
+        if not 0 < error_rate < 1: raise ValueError(':error_rate should lie in (0, 1).')
+
+        self.__capacity = capacity
+        self.__size = max(8, ceil(-capacity * log(error_rate) / log(2) ** 2))
+        self.__hashes = max(1, round(self.__size / capacity * log(2)))
+        self.__bits = bytearray(ceil(self.__size / 8))
+        self.__count = 0
+
+    def add(self, item: str) -> None:
+        for position in self.__positions(item):
+            self.__bits[position >> 3] |= 1 << (position & 7)
+        self.__count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all((
+            self.__bits[position >> 3] & (1 << (position & 7))
+            for position in self.__positions(item)
+        ))
+
+    @property
+    def count(self) -> int:
+        """Items added, duplicates included."""
+
+        return self.__count
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    @property
+    def expected_error_rate(self) -> float:
+        """False positive rate expected at the current count."""
+
+        return (1 - exp(-self.__hashes * self.__count / self.__size)) ** self.__hashes
+
+    def __positions(self, item: str):
+        digest = blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return ((first + index * second) % self.__size for index in range(self.__hashes))
\ No newline at end of file
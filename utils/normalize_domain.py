@@ -0,0 +1,6 @@
+def normalize_domain(domain: str) -> str:
+    """Lower-case the domain, strip surrounding whitespace and the trailing root dot."""
+
+    if not isinstance(domain, str): return domain
+
+    return domain.strip().lower().rstrip('.')